@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
 
-from cv2.typing import MatLike
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
 
 
 class NotifyPoolItem(NamedTuple):
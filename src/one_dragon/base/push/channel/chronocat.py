@@ -4,17 +4,21 @@ Chronocat 推送渠道
 提供通过 Chronocat 发送 QQ 个人和群消息的功能，支持多用户和多群组推送。
 """
 
+from __future__ import annotations
+
 import json
 import re
-from typing import List
+from typing import TYPE_CHECKING, List
 
 import requests
-from cv2.typing import MatLike
 
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import PushChannelConfigField, FieldTypeEnum
 from one_dragon.utils.log_utils import log
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class Chronocat(PushChannel):
     """Chronocat 推送渠道实现类"""
@@ -1,14 +1,19 @@
+from __future__ import annotations
+
 import base64
 import hashlib
 import hmac
 import time
+from typing import TYPE_CHECKING
 
 import requests
-from cv2.typing import MatLike
 
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import PushChannelConfigField, FieldTypeEnum
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class DingDingBot(PushChannel):
 
@@ -4,15 +4,20 @@ Discord 机器人推送渠道
 提供通过 Discord 机器人发送文本和图片消息的功能，支持私聊推送。
 """
 
+from __future__ import annotations
+
 import json
+from typing import TYPE_CHECKING
 
 import requests
-from cv2.typing import MatLike
 
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import PushChannelConfigField, FieldTypeEnum
 from one_dragon.utils.log_utils import log
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class Discord(PushChannel):
     """Discord 机器人推送渠道实现类"""
@@ -1,7 +1,12 @@
-from cv2.typing import MatLike
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
 from one_dragon.base.push.push_channel import PushChannel
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class FakePushChannel(PushChannel):
 
@@ -1,15 +1,20 @@
+from __future__ import annotations
+
 import base64
 import hashlib
 import hmac
 import time
+from typing import TYPE_CHECKING
 
 import requests
-from cv2.typing import MatLike
 
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import PushChannelConfigField, FieldTypeEnum
 from one_dragon.utils.log_utils import log
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 def gen_sign(timestamp: int, secret: str):
     # 拼接timestamp和secret
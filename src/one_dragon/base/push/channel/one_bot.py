@@ -1,8 +1,9 @@
+from __future__ import annotations
+
 import json
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import requests
-from cv2.typing import MatLike
 
 from one_dragon.base.operation.notify_pool import NotifyPoolItem
 from one_dragon.base.push.push_channel import PushChannel
@@ -12,6 +13,9 @@ from one_dragon.base.push.push_channel_config import (
 )
 from one_dragon.utils.log_utils import log
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class OneBot(PushChannel):
 
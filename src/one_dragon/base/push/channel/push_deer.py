@@ -4,13 +4,19 @@ PushDeer 推送渠道
 提供通过 PushDeer 服务发送消息的功能，支持自定义服务地址。
 """
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import requests
-from cv2.typing import MatLike
 
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import PushChannelConfigField, FieldTypeEnum
 from one_dragon.utils.log_utils import log
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class PushDeer(PushChannel):
     """PushDeer 推送渠道实现类"""
@@ -4,13 +4,19 @@ Qmsg 酱推送渠道
 提供通过 Qmsg 酱服务发送消息的功能，支持个人消息和群消息。
 """
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import requests
-from cv2.typing import MatLike
 
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import PushChannelConfigField, FieldTypeEnum
 from one_dragon.utils.log_utils import log
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class QMsg(PushChannel):
     """Qmsg 酱推送渠道实现类"""
@@ -1,7 +1,9 @@
+from __future__ import annotations
+
 import re
+from typing import TYPE_CHECKING
 
 import requests
-from cv2.typing import MatLike
 
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import (
@@ -9,6 +11,9 @@ from one_dragon.base.push.push_channel_config import (
     PushChannelConfigField,
 )
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class ServerChan(PushChannel):
 
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import smtplib
 import html
 from email.header import Header
@@ -5,14 +7,17 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
 from email.utils import formataddr
+from typing import TYPE_CHECKING
 
-from cv2.typing import MatLike
 
 from one_dragon.base.operation.notify_pool import NotifyPoolItem
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import PushChannelConfigField, FieldTypeEnum
 from one_dragon.utils.log_utils import log
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class Smtp(PushChannel):
     """SMTP邮件推送渠道"""
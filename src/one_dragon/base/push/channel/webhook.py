@@ -1,16 +1,21 @@
+from __future__ import annotations
+
 import base64
 import datetime
 import json
 import time
 import urllib.parse
+from typing import TYPE_CHECKING
 
 import requests
-from cv2.typing import MatLike
 
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import PushChannelConfigField, FieldTypeEnum
 from one_dragon.utils.log_utils import log
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class Webhook(PushChannel):
     """通用Webhook推送渠道"""
@@ -5,18 +5,21 @@
 需要配置 CorpID, CorpSecret, AgentId，并支持图片上传。
 """
 
+from __future__ import annotations
+
 import json
 import time
 import requests
 import threading
-from typing import Optional, Tuple
-
-from cv2.typing import MatLike
+from typing import TYPE_CHECKING, Optional, Tuple
 
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import PushChannelConfigField, FieldTypeEnum
 from one_dragon.utils.log_utils import log
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class WorkWeixinApp(PushChannel):
     """企业微信应用推送渠道实现类"""
@@ -1,9 +1,15 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import requests
-from cv2.typing import MatLike
 
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import PushChannelConfigField, FieldTypeEnum
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class WxPusher(PushChannel):
     """WxPusher推送渠道"""
@@ -1,13 +1,16 @@
+from __future__ import annotations
+
 import base64
 from abc import ABC, abstractmethod
 from io import BytesIO
-
-import cv2
-from cv2.typing import MatLike
+from typing import TYPE_CHECKING
 
 from one_dragon.base.operation.notify_pool import NotifyPoolItem
 from one_dragon.base.push.push_channel_config import PushChannelConfigField
 
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
 
 class PushChannel(ABC):
 
@@ -98,6 +101,8 @@ class PushChannel(ABC):
         Returns:
             BytesIO: 图片数据 统一jpeg格式
         """
+        # 只有实际推送图片时才需要 cv2，延迟导入以缩短启动时间
+        import cv2
         bgr_image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
         retval, buffer = cv2.imencode('.jpg', bgr_image)
 
@@ -1,38 +1,11 @@
 from __future__ import annotations
 
+import importlib
 import threading
-import time
 from concurrent.futures import ThreadPoolExecutor
-from functools import cached_property
 from typing import TYPE_CHECKING
 
-from cv2.typing import MatLike
-
 from one_dragon.base.operation.notify_pool import NotifyPoolItem
-from one_dragon.base.push.channel.ai_botk import AiBotK
-from one_dragon.base.push.channel.bark import Bark
-from one_dragon.base.push.channel.chronocat import Chronocat
-from one_dragon.base.push.channel.dingding import DingDingBot
-from one_dragon.base.push.channel.discord import Discord
-from one_dragon.base.push.channel.fake import FakePushChannel
-from one_dragon.base.push.channel.feishu import FeiShu
-from one_dragon.base.push.channel.gotify import Gotify
-from one_dragon.base.push.channel.i_got import IGot
-from one_dragon.base.push.channel.ntfy import Ntfy
-from one_dragon.base.push.channel.one_bot import OneBot
-from one_dragon.base.push.channel.push_deer import PushDeer
-from one_dragon.base.push.channel.push_me import PushMe
-from one_dragon.base.push.channel.push_plus import PushPlus
-from one_dragon.base.push.channel.q_msg import QMsg
-from one_dragon.base.push.channel.server_chan import ServerChan
-from one_dragon.base.push.channel.smtp import Smtp
-from one_dragon.base.push.channel.synology_chat import SynologyChat
-from one_dragon.base.push.channel.telegram import Telegram
-from one_dragon.base.push.channel.we_plus_bot import WePlusBot
-from one_dragon.base.push.channel.webhook import Webhook
-from one_dragon.base.push.channel.work_weixin_app import WorkWeixinApp
-from one_dragon.base.push.channel.work_weixin_bot import WorkWeixinBot
-from one_dragon.base.push.channel.wx_pusher import WxPusher
 from one_dragon.base.push.push_channel import PushChannel
 from one_dragon.base.push.push_channel_config import PushChannelConfigField
 from one_dragon.base.push.push_config import PushConfig, PushProxy
@@ -40,9 +13,42 @@ from one_dragon.utils import thread_utils
 from one_dragon.utils.log_utils import log
 
 if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
     from one_dragon.base.operation.one_dragon_context import OneDragonContext
 
 
+# 推送渠道注册表 (渠道ID, 模块名, 类名)，顺序即界面展示顺序。
+# 渠道模块在首次需要时才导入: 推送时只导入已填写配置的渠道，配置界面才会导入全部渠道。
+_CHANNEL_REGISTRY: list[tuple[str, str, str]] = [
+    ('SMTP', 'smtp', 'Smtp'),
+    ('WEBHOOK', 'webhook', 'Webhook'),
+    ('DD_BOT', 'dingding', 'DingDingBot'),
+    ('FS', 'feishu', 'FeiShu'),
+    ('QYWX', 'work_weixin_bot', 'WorkWeixinBot'),
+    ('QYWX_APP', 'work_weixin_app', 'WorkWeixinApp'),
+    ('ONEBOT', 'one_bot', 'OneBot'),
+    ('BARK', 'bark', 'Bark'),
+    ('SERVERCHAN', 'server_chan', 'ServerChan'),
+    ('PUSH_PLUS', 'push_plus', 'PushPlus'),
+    ('DISCORD', 'discord', 'Discord'),
+    ('TG', 'telegram', 'Telegram'),
+    ('NTFY', 'ntfy', 'Ntfy'),
+    ('FAKE', 'fake', 'FakePushChannel'),
+    ('GOTIFY', 'gotify', 'Gotify'),
+    ('AIBOTK', 'ai_botk', 'AiBotK'),
+    ('WXPUSHER', 'wx_pusher', 'WxPusher'),
+    ('WE_PLUS_BOT', 'we_plus_bot', 'WePlusBot'),
+    ('QMSG', 'q_msg', 'QMsg'),
+    ('PUSHME', 'push_me', 'PushMe'),
+    ('CHRONOCAT', 'chronocat', 'Chronocat'),
+    ('DEER', 'push_deer', 'PushDeer'),
+    ('IGOT', 'i_got', 'IGot'),
+    ('SYNOLOGY_CHAT', 'synology_chat', 'SynologyChat'),
+]
+_CHANNEL_MODULE_PACKAGE = 'one_dragon.base.push.channel'
+
+
 class PushService:
 
     def __init__(self, ctx: OneDragonContext):
@@ -52,77 +58,106 @@ class PushService:
             thread_name_prefix="one_dragon_push_service", max_workers=1
         )
 
-        self._init_lock = threading.Lock()
+        self._init_lock = threading.RLock()
         self._inited: bool = False
-        self.channels: list[PushChannel] = []
+        self._channel_fields_generated: bool = False
+        self._push_config: PushConfig | None = None
         self._id_2_channels: dict[str, PushChannel] = {}
         self._id_2_channel_schemas: dict[str, list[PushChannelConfigField]] = {}
 
-    def init_push_channels(self) -> None:
+    @property
+    def channels(self) -> list[PushChannel]:
+        """
+        所有推送渠道 按界面展示顺序 首次访问时导入全部渠道模块
         """
-        初始化推送渠道 由上层决定什么时候初始化
+        self.init_push_channels()
+        return [self._id_2_channels[channel_id] for channel_id, _, _ in _CHANNEL_REGISTRY]
+
+    def init_push_channels(self) -> None:
         """
-        if not self._init_lock.acquire(blocking=False):
-            return
+        加载所有推送渠道 由上层决定什么时候初始化
 
-        try:
+        推送本身不依赖这个方法，只会按需加载已填写配置的渠道
+        """
+        with self._init_lock:
             if self._inited:
                 return
 
-            self._add_channel(Smtp())
-            self._add_channel(Webhook())
-            self._add_channel(DingDingBot())
-            self._add_channel(FeiShu())
-            self._add_channel(WorkWeixinBot())
-            self._add_channel(WorkWeixinApp())
-            self._add_channel(OneBot())
-            self._add_channel(Bark())
-            self._add_channel(ServerChan())
-            self._add_channel(PushPlus())
-            self._add_channel(Discord())
-            self._add_channel(Telegram())
-            self._add_channel(Ntfy())
-            self._add_channel(FakePushChannel())
-            self._add_channel(Gotify())
-            self._add_channel(AiBotK())
-            self._add_channel(WxPusher())
-            self._add_channel(WePlusBot())
-            self._add_channel(QMsg())
-            self._add_channel(PushMe())
-            self._add_channel(Chronocat())
-            self._add_channel(PushDeer())
-            self._add_channel(IGot())
-            self._add_channel(SynologyChat())
+            for channel_id, _, _ in _CHANNEL_REGISTRY:
+                self._load_channel(channel_id)
 
             self._inited = True
-        finally:
-            self._init_lock.release()
 
-    def _add_channel(self, channel: PushChannel) -> None:
+    def _load_channel(self, channel_id: str) -> PushChannel | None:
         """
-        添加一个推送渠道
+        导入并创建一个推送渠道 已创建时直接返回
+
         Args:
-            channel: 推送渠道
+            channel_id: 推送渠道ID
 
+        Returns:
+            PushChannel: 推送渠道 渠道ID不存在时返回None
         """
-        self.channels.append(channel)
-        self._id_2_channels[channel.channel_id] = channel
-        self._id_2_channel_schemas[channel.channel_id] = channel.config_schema
+        with self._init_lock:
+            channel = self._id_2_channels.get(channel_id)
+            if channel is not None:
+                return channel
 
-    @cached_property
-    def push_config(self) -> PushConfig:
-        self.init_push_channels()
-        start_time = time.time()
-        while not self._inited:
-            time.sleep(1)
-            if time.time() - start_time > 5:
-                raise Exception('推送服务初始化超时')
+            for registry_id, module_name, class_name in _CHANNEL_REGISTRY:
+                if registry_id != channel_id:
+                    continue
+                module = importlib.import_module(f'{_CHANNEL_MODULE_PACKAGE}.{module_name}')
+                channel = getattr(module, class_name)()
+                self._id_2_channels[channel_id] = channel
+                self._id_2_channel_schemas[channel_id] = channel.config_schema
+                return channel
+
+            return None
 
-        config = PushConfig()
-        config.generate_channel_fields(self._id_2_channel_schemas)
+    def _get_raw_push_config(self) -> PushConfig:
+        """
+        Returns:
+            未生成渠道配置字段的推送配置 读取配置值时不需要加载渠道
+        """
+        with self._init_lock:
+            if self._push_config is None:
+                self._push_config = PushConfig()
+            return self._push_config
 
+    @property
+    def push_config(self) -> PushConfig:
+        """
+        推送配置 首次访问时加载所有渠道并生成各渠道的配置字段（供配置界面使用）
+        """
+        config = self._get_raw_push_config()
+        with self._init_lock:
+            if not self._channel_fields_generated:
+                self.init_push_channels()
+                config.generate_channel_fields(self._id_2_channel_schemas)
+                self._channel_fields_generated = True
         return config
 
+    def _get_configured_channels(self) -> list[PushChannel]:
+        """
+        获取已填写配置的推送渠道
+
+        只根据配置文件中是否存在该渠道的非空配置项判断，只导入这些渠道的模块。
+        所有渠道在仅有默认值时都无法通过配置校验，因此不会遗漏可用渠道。
+
+        Returns:
+            list[PushChannel]: 按界面展示顺序排列的渠道
+        """
+        data = self._get_raw_push_config().data
+        channels: list[PushChannel] = []
+        for channel_id, _, _ in _CHANNEL_REGISTRY:
+            prefix = f'{channel_id.lower()}_'
+            if not any(key.startswith(prefix) and value for key, value in data.items()):
+                continue
+            channel = self._load_channel(channel_id)
+            if channel is not None:
+                channels.append(channel)
+        return channels
+
     def push(
         self,
         title: str,
@@ -142,14 +177,15 @@ class PushService:
         Returns:
             tuple[bool, str]: 是否成功、错误信息
         """
-        if not self.push_config.send_image:
+        if not self._get_raw_push_config().send_image:
             image = None
 
         any_ok: bool = False
         err_msg: str = ''
         if channel_id is None:
             any_push = False
-            for channel_id, channel in self._id_2_channels.items():
+            for channel in self._get_configured_channels():
+                channel_id = channel.channel_id
                 channel_config = self.get_channel_config(channel_id)
                 ok, msg = channel.validate_config(channel_config)
                 if not ok:
@@ -175,7 +211,7 @@ class PushService:
             if not any_push:
                 return False, '没有可用的推送渠道'
         else:
-            channel = self._id_2_channels.get(channel_id)
+            channel = self._load_channel(channel_id)
             if channel is None:
                 return False, f'推送渠道不存在: {channel_id}'
             channel_config = self.get_channel_config(channel_id)
@@ -204,10 +240,10 @@ class PushService:
         """
         config: dict[str, str] = {}
 
-        if channel_id not in self._id_2_channel_schemas:
+        if self._load_channel(channel_id) is None:
             return config
 
-        push_config = self.push_config
+        push_config = self._get_raw_push_config()
         fields = self._id_2_channel_schemas[channel_id]
         for field in fields:
             value = push_config.get_channel_config_value(
@@ -261,14 +297,15 @@ class PushService:
         Returns:
             tuple[bool, str]: 是否成功、错误信息
         """
-        if not self.push_config.send_image:
+        if not self._get_raw_push_config().send_image:
             items = [NotifyPoolItem(content=item.content) for item in items]
 
         any_ok: bool = False
         err_msg: str = ''
         if channel_id is None:
             any_push = False
-            for cid, channel in self._id_2_channels.items():
+            for channel in self._get_configured_channels():
+                cid = channel.channel_id
                 channel_config = self.get_channel_config(cid)
                 ok, msg = channel.validate_config(channel_config)
                 if not ok:
@@ -293,7 +330,7 @@ class PushService:
             if not any_push:
                 return False, '没有可用的推送渠道'
         else:
-            channel = self._id_2_channels.get(channel_id)
+            channel = self._load_channel(channel_id)
             if channel is None:
                 return False, f'推送渠道不存在: {channel_id}'
             channel_config = self.get_channel_config(channel_id)
@@ -336,7 +373,7 @@ class PushService:
         Returns:
             获取配置使用的代理地址
         """
-        config = self.push_config
+        config = self._get_raw_push_config()
         if (config.proxy == PushProxy.PERSONAL.value.value
             and self.ctx.env_config.is_personal_proxy):
             return self.ctx.env_config.personal_proxy
@@ -0,0 +1,40 @@
+import threading
+
+from one_dragon.base.config.yaml_config import YamlConfig
+from one_dragon.utils import os_utils
+from script_chainer.config.script_config import ScriptConfig
+
+
+class ScriptChainRecord(YamlConfig):
+    """脚本链中每个脚本最近一次成功完成的游戏日，用于每个游戏日只运行一次的脚本。
+
+    以 ScriptConfig.run_key 为键，值为完成时的游戏日 yyyyMMdd。
+    """
+
+    def __init__(self, chain_name: str, is_mock: bool = False):
+        YamlConfig.__init__(
+            self,
+            chain_name,
+            sub_dir=['script_chain_record'],
+            is_mock=is_mock,
+        )
+        # 并行调度时多个运行组可能同时写入
+        self._lock = threading.Lock()
+
+    def get_done_dt(self, script_config: ScriptConfig) -> str | None:
+        """获取脚本最近一次成功完成的游戏日，没有记录时返回 None。"""
+        return self.get('done_dt', {}).get(script_config.run_key)
+
+    def is_done_today(self, script_config: ScriptConfig) -> bool:
+        """脚本在当前游戏日是否已经成功完成。"""
+        done_dt = self.get_done_dt(script_config)
+        if not done_dt:
+            return False
+        return os_utils.dt_day_diff(script_config.game_dt, done_dt) <= 0
+
+    def record_done(self, script_config: ScriptConfig) -> None:
+        """记录脚本在当前游戏日已成功完成。"""
+        with self._lock:
+            done_dt = dict(self.get('done_dt', {}))
+            done_dt[script_config.run_key] = script_config.game_dt
+            self.update('done_dt', done_dt)
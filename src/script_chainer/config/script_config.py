@@ -1,3 +1,4 @@
+import re
 from contextlib import suppress
 from dataclasses import asdict, dataclass, field, fields
 from enum import Enum
@@ -5,6 +6,7 @@ from pathlib import Path
 
 from one_dragon.base.config.config_item import ConfigItem, get_config_item_from_enum
 from one_dragon.base.config.yaml_config import YamlConfig
+from one_dragon.utils import os_utils
 
 
 class CheckDoneMethods(Enum):
@@ -12,6 +14,26 @@ class CheckDoneMethods(Enum):
     GAME_CLOSED = ConfigItem(label='游戏被关闭', value='game_closed', desc='游戏被关闭时 认为任务完成')
     SCRIPT_CLOSED = ConfigItem(label='脚本被关闭', value='script_closed', desc='脚本被关闭时 认为任务完成')
     GAME_OR_SCRIPT_CLOSED = ConfigItem(label='游戏或脚本被关闭', value='game_or_script_closed', desc='游戏或脚本被关闭时 认为任务完成')
+    STDOUT_MATCHED = ConfigItem(label='匹配到完成日志', value='stdout_matched', desc='脚本输出匹配完成日志正则时 认为任务完成')
+    PROCESS_IDLE = ConfigItem(label='进程空闲', value='process_idle', desc='脚本或游戏持续空闲时 认为任务完成')
+
+
+class IdleTargets(Enum):
+
+    SCRIPT = ConfigItem(label='脚本', value='script', desc='脚本进程树空闲')
+    GAME = ConfigItem(label='游戏', value='game', desc='游戏进程空闲')
+    BOTH = ConfigItem(label='脚本和游戏', value='both', desc='脚本进程树和游戏进程都空闲')
+
+
+class FailureClasses(Enum):
+
+    LAUNCH_FAILED = ConfigItem(label='启动失败', value='launch_failed', desc='脚本进程启动失败或启动器异常退出')
+    TARGET_NOT_FOUND = ConfigItem(label='未找到脚本进程', value='target_not_found', desc='启动器退出后未出现脚本进程')
+    NO_LOG_TIMEOUT = ConfigItem(label='无日志超时', value='no_log_timeout', desc='超过设定秒数无日志输出')
+    RUN_TIMEOUT = ConfigItem(label='运行超时', value='run_timeout', desc='超过运行超时时间仍未完成，选择后运行超时视为失败（否则视为运行结束）')
+    SCRIPT_FAILED = ConfigItem(label='运行失败', value='script_failed', desc='未满足完成条件就结束，或 Python 脚本执行失败')
+    RESOURCE_LIMIT = ConfigItem(label='资源超限', value='resource_limit', desc='进程树内存、句柄数或线程数超过上限')
+    PREFLIGHT_FAILED = ConfigItem(label='启动条件未满足', value='preflight_failed', desc='启动前等待内存、磁盘、CPU 或进程条件超时')
 
 
 class ScriptProcessName(Enum):
@@ -46,6 +68,35 @@ class AttachDirection:
     NONE = ''
     PRE = 'pre'
     POST = 'post'
+    # 伴随: 挂靠到上方脚本，在其运行期间同时运行，被挂靠脚本结束时自动停止
+    SIDECAR = 'sidecar'
+
+
+@dataclass
+class TransitionGateConfig:
+    """运行组之间的切换条件。
+
+    启用后，上一个运行组结束后满足以下全部条件即开始下一个运行组，最长等待 max_wait_seconds:
+        - 上一个运行组配置了结束后关闭的游戏/脚本进程均已退出。
+        - 系统 CPU 占用连续 cpu_stable_seconds 秒不高于 max_cpu_percent。
+        - 可用内存不低于 min_free_memory_mb。
+    未启用时固定等待 fallback_wait_seconds 秒。
+    """
+
+    enabled: bool = False
+    max_cpu_percent: int = 30
+    cpu_stable_seconds: int = 5
+    min_free_memory_mb: int = 2048
+    max_wait_seconds: int = 120
+    fallback_wait_seconds: int = 10
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> 'TransitionGateConfig':
+        valid = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (data or {}).items() if k in valid})
 
 
 @dataclass
@@ -57,6 +108,8 @@ class ScriptConfig:
     script_process_name: str = ''
     game_process_name: str = ''
     run_timeout_seconds: int = 3600
+    # 按运行历史中的耗时 p99 加余量推算超时时间（不超过 run_timeout_seconds）
+    learn_run_timeout: bool = False
     check_done: str = ''
     kill_script_after_done: bool = True
     kill_game_after_done: bool = True
@@ -68,6 +121,51 @@ class ScriptConfig:
     attach_direction: str = AttachDirection.NONE
     no_log_timeout_seconds: int = 0
     no_log_max_retries: int = 3
+    # 按历史输出间隔的 p99.5 乘以 no_log_adaptive_factor 推算无日志超时时间（不超过 no_log_timeout_seconds）
+    no_log_adaptive: bool = False
+    no_log_adaptive_factor: int = 3
+    # 失败重试: 需要重试的失败类型（无日志超时固定按 no_log_max_retries 重试）和最大重试次数，
+    # 首次重试前等待的秒数（之后每次翻倍并加随机抖动，不超过 retry_backoff_max_seconds），重试前是否关闭游戏。
+    # 默认立即重试且不关闭游戏，与没有重试策略时的无日志超时重试一致
+    retry_failures: list[str] = field(default_factory=list)
+    retry_max_retries: int = 2
+    retry_backoff_seconds: int = 0
+    retry_backoff_max_seconds: int = 300
+    retry_kill_game: bool = False
+    # 完成方式为匹配到完成日志时使用: 完成日志正则，匹配后再等待的秒数
+    done_pattern: str = ''
+    done_pattern_delay_seconds: int = 0
+    # 完成方式为进程空闲时使用: 检查对象、CPU 占用阈值（%）、IO 速率阈值（KB/s）、需要持续空闲的秒数
+    idle_target: str = IdleTargets.SCRIPT.value.value
+    idle_max_cpu_percent: int = 5
+    idle_max_io_kbps: int = 200
+    idle_window_seconds: int = 120
+    # 在上一个运行组结束后立即启动，启动器初始化与组间等待并行（仅按顺序运行时生效）
+    prewarm_launch: bool = False
+    # 脚本输出按次压缩归档（不再写入 runner 日志），可按时间范围查找。默认关闭，输出照常写入 runner 日志
+    archive_output: bool = False
+    # 资源占用采样间隔（秒），0 表示不采样
+    telemetry_interval_seconds: int = 5
+    # 进程树资源上限: 内存（MB）、句柄数（Linux 为文件描述符数）、线程数，0 表示不限制。
+    # 超限时先请求脚本自行退出再结束进程树，之后最多重新运行 resource_limit_max_retries 次
+    max_rss_mb: int = 0
+    max_handles: int = 0
+    max_threads: int = 0
+    resource_limit_max_retries: int = 2
+    # 启动前检查: 可用内存（MB）、脚本所在磁盘剩余空间（MB）、系统 CPU 占用上限（%），0 表示不检查；
+    # 不能在运行的进程名称。条件不满足时最多等待 preflight_max_wait_seconds 秒，仍不满足则启动失败
+    preflight_min_free_memory_mb: int = 0
+    preflight_min_free_disk_mb: int = 0
+    preflight_max_cpu_percent: int = 0
+    preflight_blocking_processes: list[str] = field(default_factory=list)
+    preflight_max_wait_seconds: int = 60
+    # 每个游戏日只运行一次: 游戏日在 UTC+day_utc_offset 的 day_reset_hour 点切换
+    once_per_day: bool = False
+    day_reset_hour: int = 4
+    day_utc_offset: int = 8
+    # 并行调度: 依赖的脚本名称（需在这些脚本成功完成后运行，依赖失败时跳过）和占用的命名资源锁
+    after: list[str] = field(default_factory=list)
+    resource_locks: list[str] = field(default_factory=list)
 
     # 不参与序列化的元数据
     idx: int = field(default=0, repr=False, compare=False)
@@ -112,6 +210,48 @@ class ScriptConfig:
             return Path(self.script_path).name
         return '(未设置)'
 
+    @property
+    def is_sidecar(self) -> bool:
+        """是否为伴随脚本。"""
+        return self.script_type == ScriptType.PYTHON and self.attach_direction == AttachDirection.SIDECAR
+
+    @property
+    def is_attached_upward(self) -> bool:
+        """是否挂靠到上方脚本（后置或伴随）。"""
+        return self.script_type == ScriptType.PYTHON and self.attach_direction in (
+            AttachDirection.POST,
+            AttachDirection.SIDECAR,
+        )
+
+    @property
+    def resource_limits_enabled(self) -> bool:
+        """是否设置了进程树资源上限。"""
+        return self.max_rss_mb > 0 or self.max_handles > 0 or self.max_threads > 0
+
+    @property
+    def preflight_enabled(self) -> bool:
+        """是否设置了启动前检查。"""
+        return (
+            self.preflight_min_free_memory_mb > 0
+            or self.preflight_min_free_disk_mb > 0
+            or self.preflight_max_cpu_percent > 0
+            or len(self.preflight_blocking_processes) > 0
+        )
+
+    @property
+    def run_key(self) -> str:
+        """运行标识，用于在运行日志中识别同一个脚本（不依赖其在脚本链中的下标）。"""
+        return f'{self.script_display_name}|{self.script_path}|{self.script_arguments}'
+
+    @property
+    def game_dt(self) -> str:
+        """当前游戏日 yyyyMMdd，按 day_utc_offset 时区的 day_reset_hour 点切换。"""
+        offset_hours = self.day_utc_offset - self.day_reset_hour
+        # 时区偏移需要在 ±24 小时以内，超出时先换算到前一天
+        if offset_hours <= -24:
+            return os_utils.add_dt_offset(os_utils.get_dt(offset_hours + 24), -1)
+        return os_utils.get_dt(offset_hours)
+
     @property
     def game_display_name(self) -> str:
         game_process_enum = [i for i in GameProcessName if i.value.value == self.game_process_name]
@@ -156,6 +296,40 @@ class ScriptConfig:
             return '脚本进程名称为空'
         elif self.run_timeout_seconds <= 0:
             return '运行超时时间必须大于0'
+        elif self.check_done == CheckDoneMethods.PROCESS_IDLE.value.value:
+            if get_config_item_from_enum(IdleTargets, self.idle_target) is None:
+                return f'空闲检查对象非法 {self.idle_target}'
+            if self.idle_target != IdleTargets.SCRIPT.value.value and not self.game_process_name:
+                return '游戏进程名称为空'
+            if self.idle_window_seconds <= 0:
+                return '空闲持续时间必须大于0'
+        elif self.check_done == CheckDoneMethods.STDOUT_MATCHED.value.value:
+            if not self.done_pattern:
+                return '完成日志正则为空'
+            try:
+                re.compile(self.done_pattern)
+            except re.error as e:
+                return f'完成日志正则不合法 {e}'
+
+        for failure_class in self.retry_failures:
+            if get_config_item_from_enum(FailureClasses, failure_class) is None:
+                return f'重试失败类型非法 {failure_class}'
+        if self.retry_backoff_seconds < 0 or self.retry_backoff_max_seconds < 0:
+            return '重试等待时间不能小于0'
+        if self.no_log_adaptive and self.no_log_adaptive_factor <= 0:
+            return '自适应无日志超时倍数必须大于0'
+        if self.max_rss_mb < 0 or self.max_handles < 0 or self.max_threads < 0:
+            return '资源上限不能小于0'
+        if self.resource_limit_max_retries < 0:
+            return '资源超限重试次数不能小于0'
+        if (
+            self.preflight_min_free_memory_mb < 0
+            or self.preflight_min_free_disk_mb < 0
+            or self.preflight_max_wait_seconds < 0
+        ):
+            return '启动条件不能小于0'
+        if not 0 <= self.preflight_max_cpu_percent <= 100:
+            return '启动条件 CPU 占用需在0~100之间'
 
 
 class ScriptChainConfig(YamlConfig):
@@ -172,6 +346,13 @@ class ScriptChainConfig(YamlConfig):
             ScriptConfig.from_dict(i)
             for i in self.get('script_list', [])
         ]
+        # 最大并行运行组数量，1 表示按顺序逐个运行
+        self.max_parallel: int = self.get('max_parallel', 1)
+        # 预先启动的 Python 脚本工作进程数量，0 表示在 runner 进程内执行 Python 脚本
+        self.python_worker_pool_size: int = self.get('python_worker_pool_size', 1)
+        self.transition_gate: TransitionGateConfig = TransitionGateConfig.from_dict(
+            self.get('transition_gate', {})
+        )
         self.init_idx()
 
     def _get_script_chain_dir(self) -> Path:
@@ -254,7 +435,10 @@ class ScriptChainConfig(YamlConfig):
 
     def save(self):
         self.data = {
-            'script_list': [i.to_dict() for i in self.script_list]
+            'script_list': [i.to_dict() for i in self.script_list],
+            'max_parallel': self.max_parallel,
+            'python_worker_pool_size': self.python_worker_pool_size,
+            'transition_gate': self.transition_gate.to_dict(),
         }
         YamlConfig.save(self)
 
@@ -317,7 +501,7 @@ class ScriptChainConfig(YamlConfig):
         """判断第 idx 个脚本是否挂靠到前一个脚本。
 
         满足以下任一条件即视为挂靠：
-        - 当前脚本是 Python 且 attach_direction == POST
+        - 当前脚本是 Python 且 attach_direction == POST 或 SIDECAR
         - 前一个脚本是 Python 且 attach_direction == PRE
         """
         if idx <= 0 or idx >= len(self.script_list):
@@ -325,8 +509,7 @@ class ScriptChainConfig(YamlConfig):
         cur = self.script_list[idx]
         prev = self.script_list[idx - 1]
         return (
-            (cur.script_type == ScriptType.PYTHON
-             and cur.attach_direction == AttachDirection.POST)
+            cur.is_attached_upward
             or (prev.script_type == ScriptType.PYTHON
                 and prev.attach_direction == AttachDirection.PRE)
         )
@@ -336,7 +519,7 @@ class ScriptChainConfig(YamlConfig):
 
         满足以下任一条件即视为有挂靠：
         - 当前脚本是 Python 且 attach_direction == PRE
-        - 下一个脚本是 Python 且 attach_direction == POST
+        - 下一个脚本是 Python 且 attach_direction == POST 或 SIDECAR
         """
         if idx < 0 or idx >= len(self.script_list) - 1:
             return False
@@ -345,8 +528,7 @@ class ScriptChainConfig(YamlConfig):
         return (
             (cur.script_type == ScriptType.PYTHON
              and cur.attach_direction == AttachDirection.PRE)
-            or (nxt.script_type == ScriptType.PYTHON
-                and nxt.attach_direction == AttachDirection.POST)
+            or nxt.is_attached_upward
         )
 
     def compute_attach_targets(self) -> list['ScriptConfig | None']:
@@ -359,22 +541,22 @@ class ScriptChainConfig(YamlConfig):
         n = len(self.script_list)
         targets: list[ScriptConfig | None] = [None] * n
 
-        # POST（后置）：目标在前方，正向扫描时记录最近的非 POST 脚本
+        # POST（后置）/ SIDECAR（伴随）：目标在前方，正向扫描时记录最近的非 POST/SIDECAR 脚本
         post_target: ScriptConfig | None = None
         for i in range(n):
             sc = self.script_list[i]
-            if sc.script_type == ScriptType.PYTHON and sc.attach_direction == AttachDirection.POST:
+            if sc.is_attached_upward:
                 targets[i] = post_target
             else:
                 post_target = sc
 
-        # PRE（前置）：目标在后方，逆向扫描时记录最近的非 PRE 脚本
+        # PRE（前置）：目标在后方，逆向扫描时记录最近的非 PRE 脚本，跳过伴随脚本
         pre_target: ScriptConfig | None = None
         for i in range(n - 1, -1, -1):
             sc = self.script_list[i]
             if sc.script_type == ScriptType.PYTHON and sc.attach_direction == AttachDirection.PRE:
                 targets[i] = pre_target
-            else:
+            elif not sc.is_sidecar:
                 pre_target = sc
 
         return targets
@@ -24,12 +24,19 @@ class ScriptChainerContext:
         self.notify_config: NotifyConfig = NotifyConfig(None, {})
         self._init_lock = threading.Lock()
 
-    def init(self) -> None:
+    def init(self, load_all_push_channels: bool = True) -> None:
+        """初始化上下文。
+
+        Args:
+            load_all_push_channels: 是否预先加载全部推送渠道。配置界面需要展示所有渠道；
+                runner 只需推送，推送时会按需加载已填写配置的渠道，可以跳过以缩短启动时间。
+        """
         if not self._init_lock.acquire(blocking=False):
             return
 
         try:
-            self.push_service.init_push_channels()
+            if load_all_push_channels:
+                self.push_service.init_push_channels()
         except Exception:
             log.error('初始化出错', exc_info=True)
         finally:
@@ -49,6 +56,9 @@ class ScriptChainerContext:
     def script_chain_config_dir(self) -> str:
         return os_utils.get_path_under_work_dir('config', 'script_chain')
 
+    def script_chain_record_dir(self) -> str:
+        return os_utils.get_path_under_work_dir('config', 'script_chain_record')
+
     def add_script_chain_config(self) -> ScriptChainConfig:
         """新增一个脚本链配置并返回。
 
@@ -70,7 +80,7 @@ class ScriptChainerContext:
         raise RuntimeError('脚本链数量已达上限(99)')
 
     def remove_script_chain_config(self, config: ScriptChainConfig) -> None:
-        """删除脚本链配置。
+        """删除脚本链配置及其完成记录。
 
         Args:
             config: 要删除的配置。
@@ -79,8 +89,13 @@ class ScriptChainerContext:
         if os.path.exists(file_path):
             os.remove(file_path)
 
+        # 不删除的话，之后新建的同名脚本链会沿用旧记录跳过脚本
+        record_path = os.path.join(self.script_chain_record_dir(), f'{config.module_name}.yml')
+        if os.path.exists(record_path):
+            os.remove(record_path)
+
     def rename_script_chain_config(self, old_config: ScriptChainConfig, new_module_name: str) -> ScriptChainConfig:
-        """重命名脚本链配置。
+        """重命名脚本链配置，完成记录随之重命名。
 
         Args:
             old_config: 原配置。
@@ -102,12 +117,25 @@ class ScriptChainerContext:
         # 创建新配置
         new_config = ScriptChainConfig(module_name=new_module_name)
         new_config.script_list = old_config.script_list.copy()
+        new_config.max_parallel = old_config.max_parallel
+        new_config.python_worker_pool_size = old_config.python_worker_pool_size
+        new_config.transition_gate = old_config.transition_gate
         new_config.save()
 
         # 删除旧配置文件
         if os.path.exists(old_file_path):
             os.remove(old_file_path)
 
+        # 完成记录按脚本链名称保存，需要一起改名，否则每天只运行一次的脚本会在改名后再次运行
+        record_dir = self.script_chain_record_dir()
+        old_record_path = os.path.join(record_dir, f'{old_config.module_name}.yml')
+        new_record_path = os.path.join(record_dir, f'{new_module_name}.yml')
+        if os.path.exists(old_record_path):
+            os.replace(old_record_path, new_record_path)
+        elif os.path.exists(new_record_path):
+            # 之前删除的同名脚本链遗留的记录
+            os.remove(new_record_path)
+
         return new_config
 
     def after_app_shutdown(self) -> None:
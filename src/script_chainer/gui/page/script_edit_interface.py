@@ -30,7 +30,9 @@ from one_dragon_qt.widgets.setting_card.value_display_editable_combo_box_setting
 from one_dragon_qt.widgets.vertical_scroll_interface import VerticalScrollInterface
 from script_chainer.config.script_config import (
     CheckDoneMethods,
+    FailureClasses,
     GameProcessName,
+    IdleTargets,
     ScriptConfig,
     ScriptProcessName,
 )
@@ -98,10 +100,32 @@ class ScriptEditInterface(VerticalScrollInterface):
         self.run_timeout_seconds_opt = TextSettingCard(
             icon=FluentIcon.HISTORY,
             title='运行超时（秒）',
-            content='超时后自动进行下一个脚本'
+            content='超时后自动进行下一个脚本，在失败重试中选择运行超时时视为失败并重试'
         )
         content_widget.add_widget(self.run_timeout_seconds_opt)
 
+        self.learn_run_timeout_switch = SwitchButton()
+        self.learn_run_timeout_switch.setOnText('')
+        self.learn_run_timeout_switch.setOffText('')
+        self.learn_run_timeout_opt = MultiPushSettingCard(
+            icon=FluentIcon.HISTORY,
+            title='按历史耗时调整超时',
+            content='成功运行 5 次后，按历史耗时推算更短的超时时间',
+            btn_list=[self.learn_run_timeout_switch],
+        )
+        content_widget.add_widget(self.learn_run_timeout_opt)
+
+        self.prewarm_launch_switch = SwitchButton()
+        self.prewarm_launch_switch.setOnText('')
+        self.prewarm_launch_switch.setOffText('')
+        self.prewarm_launch_opt = MultiPushSettingCard(
+            icon=FluentIcon.SEND,
+            title='提前启动',
+            content='上一个运行组结束后立即启动，启动器初始化与组间等待并行（仅按顺序运行时生效）',
+            btn_list=[self.prewarm_launch_switch],
+        )
+        content_widget.add_widget(self.prewarm_launch_opt)
+
         self.check_done_opt = ComboBoxSettingCard(
             icon=FluentIcon.COMPLETED,
             title='检查完成方式',
@@ -109,6 +133,69 @@ class ScriptEditInterface(VerticalScrollInterface):
         )
         content_widget.add_widget(self.check_done_opt)
 
+        self.done_pattern_opt = TextSettingCard(
+            icon=FluentIcon.SEARCH,
+            title='完成日志正则',
+            content='检查完成方式为匹配到完成日志时 脚本输出匹配该正则即认为完成',
+        )
+        self.done_pattern_opt.line_edit.setMinimumWidth(200)
+        content_widget.add_widget(self.done_pattern_opt)
+
+        self.done_pattern_delay_input = SpinBox()
+        self.done_pattern_delay_input.setRange(0, 3600)
+        self.done_pattern_delay_input.setSingleStep(1)
+        self.done_pattern_delay_input.setFixedWidth(140)
+        self.done_pattern_delay_opt = MultiPushSettingCard(
+            icon=FluentIcon.STOP_WATCH,
+            title='匹配后等待（秒）',
+            content='匹配到完成日志后再等待的时间',
+            btn_list=[self.done_pattern_delay_input],
+        )
+        content_widget.add_widget(self.done_pattern_delay_opt)
+
+        self.idle_target_opt = ComboBoxSettingCard(
+            icon=FluentIcon.PAUSE,
+            title='空闲检查对象',
+            content='检查完成方式为进程空闲时 检查哪些进程',
+            options_enum=IdleTargets,
+        )
+        content_widget.add_widget(self.idle_target_opt)
+
+        self.idle_max_cpu_input = SpinBox()
+        self.idle_max_cpu_input.setRange(0, 1000)
+        self.idle_max_cpu_input.setFixedWidth(120)
+        self.idle_max_io_input = SpinBox()
+        self.idle_max_io_input.setRange(0, 1024 * 1024)
+        self.idle_max_io_input.setFixedWidth(120)
+        self.idle_window_input = SpinBox()
+        self.idle_window_input.setRange(1, 3600)
+        self.idle_window_input.setFixedWidth(120)
+        self.idle_threshold_opt = MultiPushSettingCard(
+            icon=FluentIcon.SPEED_OFF,
+            title='空闲阈值',
+            content='CPU（%） / IO（KB/s） 均不高于阈值并持续设定秒数时认为空闲',
+            btn_list=[self.idle_max_cpu_input, self.idle_max_io_input, self.idle_window_input],
+        )
+        content_widget.add_widget(self.idle_threshold_opt)
+
+        self.day_reset_hour_input = SpinBox()
+        self.day_reset_hour_input.setRange(0, 23)
+        self.day_reset_hour_input.setFixedWidth(120)
+        self.day_utc_offset_input = SpinBox()
+        self.day_utc_offset_input.setRange(-12, 14)
+        self.day_utc_offset_input.setFixedWidth(120)
+        self.once_per_day_switch = SwitchButton()
+        self.once_per_day_switch.setOnText('')
+        self.once_per_day_switch.setOffText('')
+        self.once_per_day_switch.checkedChanged.connect(self._on_once_per_day_toggled)
+        self.once_per_day_opt = MultiPushSettingCard(
+            icon=FluentIcon.CALENDAR,
+            title='每个游戏日只运行一次',
+            content='本游戏日已成功完成时跳过，按 刷新小时 / UTC 时区 切换游戏日',
+            btn_list=[self.day_reset_hour_input, self.day_utc_offset_input, self.once_per_day_switch],
+        )
+        content_widget.add_widget(self.once_per_day_opt)
+
         kill_script_switch_widget, self.kill_script_after_done_switch = self._create_switch_option('脚本')
         kill_game_switch_widget, self.kill_game_after_done_switch = self._create_switch_option('游戏')
         self.kill_after_done_opt = MultiPushSettingCard(
@@ -191,6 +278,164 @@ class ScriptEditInterface(VerticalScrollInterface):
         )
         content_widget.add_widget(self.no_log_max_retries_opt)
 
+        self.no_log_adaptive_factor_input = SpinBox()
+        self.no_log_adaptive_factor_input.setRange(1, 100)
+        self.no_log_adaptive_factor_input.setSingleStep(1)
+        self.no_log_adaptive_factor_input.setFixedWidth(140)
+
+        self.no_log_adaptive_switch = SwitchButton()
+        self.no_log_adaptive_switch.setOnText('')
+        self.no_log_adaptive_switch.setOffText('')
+
+        self.no_log_adaptive_opt = MultiPushSettingCard(
+            icon=FluentIcon.HISTORY,
+            title='自适应无日志超时（倍数）',
+            content='按历史输出间隔 p99.5 乘以倍数判定未响应，不超过上面设定的秒数',
+            btn_list=[self.no_log_adaptive_factor_input, self.no_log_adaptive_switch],
+        )
+        content_widget.add_widget(self.no_log_adaptive_opt)
+
+        # 无日志超时由上面的配置控制，这里只列出其它失败类型
+        self.retry_failure_switches: dict[str, SwitchButton] = {}
+        for failure in FailureClasses:
+            # 无日志超时和资源超限在各自的设置中配置重试次数
+            if failure in (FailureClasses.NO_LOG_TIMEOUT, FailureClasses.RESOURCE_LIMIT):
+                continue
+            switch = SwitchButton()
+            switch.setOnText(failure.value.label)
+            switch.setOffText(failure.value.label)
+            switch.setToolTip(failure.value.desc)
+            self.retry_failure_switches[failure.value.value] = switch
+        self.retry_failures_opt = MultiPushSettingCard(
+            icon=FluentIcon.SYNC,
+            title='失败重试',
+            content='选择需要自动重试的失败类型',
+            btn_list=list(self.retry_failure_switches.values()),
+        )
+        content_widget.add_widget(self.retry_failures_opt)
+
+        self.retry_max_retries_input = SpinBox()
+        self.retry_max_retries_input.setRange(1, 99)
+        self.retry_max_retries_input.setFixedWidth(120)
+        self.retry_backoff_input = SpinBox()
+        self.retry_backoff_input.setRange(0, 3600)
+        self.retry_backoff_input.setFixedWidth(120)
+        self.retry_backoff_max_input = SpinBox()
+        self.retry_backoff_max_input.setRange(0, 86400)
+        self.retry_backoff_max_input.setFixedWidth(120)
+        self.retry_kill_game_switch = SwitchButton()
+        self.retry_kill_game_switch.setOnText('关闭游戏')
+        self.retry_kill_game_switch.setOffText('关闭游戏')
+        self.retry_policy_opt = MultiPushSettingCard(
+            icon=FluentIcon.SYNC,
+            title='重试次数与等待（秒）',
+            content='最大重试次数、首次等待、最长等待，等待时间每次翻倍；重试前是否关闭游戏',
+            btn_list=[
+                self.retry_max_retries_input,
+                self.retry_backoff_input,
+                self.retry_backoff_max_input,
+                self.retry_kill_game_switch,
+            ],
+        )
+        content_widget.add_widget(self.retry_policy_opt)
+
+        self.telemetry_interval_input = SpinBox()
+        self.telemetry_interval_input.setRange(0, 600)
+        self.telemetry_interval_input.setSingleStep(1)
+        self.telemetry_interval_input.setFixedWidth(140)
+
+        self.telemetry_interval_opt = MultiPushSettingCard(
+            icon=FluentIcon.SPEED_HIGH,
+            title='资源采样间隔（秒）',
+            content='记录脚本进程树的 CPU、内存和 IO 占用，0 表示不采样',
+            btn_list=[self.telemetry_interval_input],
+        )
+        content_widget.add_widget(self.telemetry_interval_opt)
+
+        self.max_rss_mb_input = SpinBox()
+        self.max_rss_mb_input.setRange(0, 1048576)
+        self.max_rss_mb_input.setSingleStep(256)
+        self.max_rss_mb_input.setFixedWidth(140)
+        self.max_rss_mb_input.setToolTip('内存（MB）')
+        self.max_handles_input = SpinBox()
+        self.max_handles_input.setRange(0, 1000000)
+        self.max_handles_input.setSingleStep(100)
+        self.max_handles_input.setFixedWidth(140)
+        self.max_handles_input.setToolTip('句柄数')
+        self.max_threads_input = SpinBox()
+        self.max_threads_input.setRange(0, 100000)
+        self.max_threads_input.setSingleStep(10)
+        self.max_threads_input.setFixedWidth(140)
+        self.max_threads_input.setToolTip('线程数')
+        self.resource_limit_max_retries_input = SpinBox()
+        self.resource_limit_max_retries_input.setRange(0, 99)
+        self.resource_limit_max_retries_input.setFixedWidth(120)
+        self.resource_limit_max_retries_input.setToolTip('最大重试次数')
+        self.resource_limits_opt = MultiPushSettingCard(
+            icon=FluentIcon.SPEED_MEDIUM,
+            title='资源上限',
+            content='进程树内存（MB）、句柄数、线程数，0 表示不限制；超出时关闭脚本并重新运行，最多重试指定次数',
+            btn_list=[
+                self.max_rss_mb_input,
+                self.max_handles_input,
+                self.max_threads_input,
+                self.resource_limit_max_retries_input,
+            ],
+        )
+        content_widget.add_widget(self.resource_limits_opt)
+
+        self.preflight_memory_input = SpinBox()
+        self.preflight_memory_input.setRange(0, 1048576)
+        self.preflight_memory_input.setSingleStep(256)
+        self.preflight_memory_input.setFixedWidth(140)
+        self.preflight_memory_input.setToolTip('可用内存（MB）')
+        self.preflight_disk_input = SpinBox()
+        self.preflight_disk_input.setRange(0, 10485760)
+        self.preflight_disk_input.setSingleStep(1024)
+        self.preflight_disk_input.setFixedWidth(140)
+        self.preflight_disk_input.setToolTip('磁盘剩余空间（MB）')
+        self.preflight_cpu_input = SpinBox()
+        self.preflight_cpu_input.setRange(0, 100)
+        self.preflight_cpu_input.setSingleStep(5)
+        self.preflight_cpu_input.setFixedWidth(120)
+        self.preflight_cpu_input.setToolTip('CPU 占用上限（%）')
+        self.preflight_wait_input = SpinBox()
+        self.preflight_wait_input.setRange(0, 3600)
+        self.preflight_wait_input.setSingleStep(10)
+        self.preflight_wait_input.setFixedWidth(120)
+        self.preflight_wait_input.setToolTip('最长等待（秒）')
+        self.preflight_opt = MultiPushSettingCard(
+            icon=FluentIcon.CHECKBOX,
+            title='启动条件',
+            content='可用内存（MB）、脚本所在磁盘剩余空间（MB）、CPU 占用上限（%）、最长等待（秒），0 表示不检查',
+            btn_list=[
+                self.preflight_memory_input,
+                self.preflight_disk_input,
+                self.preflight_cpu_input,
+                self.preflight_wait_input,
+            ],
+        )
+        content_widget.add_widget(self.preflight_opt)
+
+        self.preflight_blocking_processes_opt = TextSettingCard(
+            icon=FluentIcon.CANCEL,
+            title='启动前不能运行的进程',
+            content='多个进程名称用英文逗号分隔，等待超时仍在运行则不启动脚本',
+        )
+        self.preflight_blocking_processes_opt.line_edit.setMinimumWidth(200)
+        content_widget.add_widget(self.preflight_blocking_processes_opt)
+
+        self.archive_output_switch = SwitchButton()
+        self.archive_output_switch.setOnText('')
+        self.archive_output_switch.setOffText('')
+        self.archive_output_opt = MultiPushSettingCard(
+            icon=FluentIcon.SAVE,
+            title='归档脚本输出',
+            content='每次运行的输出单独压缩保存 7 天，不再写入 runner 日志',
+            btn_list=[self.archive_output_switch],
+        )
+        content_widget.add_widget(self.archive_output_opt)
+
         self.init_by_config(self.config)
         return content_widget
 
@@ -224,8 +469,23 @@ class ScriptEditInterface(VerticalScrollInterface):
         self.script_process_name_opt.setValue(config.script_process_name, emit_signal=False)
         self.game_process_name_opt.setValue(config.game_process_name, emit_signal=False)
         self.run_timeout_seconds_opt.setValue(str(config.run_timeout_seconds), emit_signal=False)
+        self.learn_run_timeout_switch.setChecked(config.learn_run_timeout)
+        self.prewarm_launch_switch.setChecked(config.prewarm_launch)
         self.check_done_opt.setValue(config.check_done, emit_signal=False)
+        self.done_pattern_opt.setValue(config.done_pattern, emit_signal=False)
+        self.done_pattern_delay_input.setValue(config.done_pattern_delay_seconds)
+        self.idle_target_opt.setValue(config.idle_target, emit_signal=False)
+        self.idle_max_cpu_input.setValue(config.idle_max_cpu_percent)
+        self.idle_max_io_input.setValue(config.idle_max_io_kbps)
+        self.idle_window_input.setValue(config.idle_window_seconds)
         self.kill_script_after_done_switch.setChecked(config.kill_script_after_done)
+        self.once_per_day_switch.blockSignals(True)
+        self.once_per_day_switch.setChecked(config.once_per_day)
+        self.once_per_day_switch.blockSignals(False)
+        self.day_reset_hour_input.setValue(config.day_reset_hour)
+        self.day_utc_offset_input.setValue(config.day_utc_offset)
+        self.day_reset_hour_input.setEnabled(config.once_per_day)
+        self.day_utc_offset_input.setEnabled(config.once_per_day)
         self.kill_game_after_done_switch.setChecked(config.kill_game_after_done)
         self.script_arguments_opt.setValue(config.script_arguments, emit_signal=False)
         self.notify_start_switch.setChecked(config.notify_start)
@@ -254,6 +514,39 @@ class ScriptEditInterface(VerticalScrollInterface):
         self.no_log_max_retries_input.setValue(max(1, config.no_log_max_retries))
         self.no_log_max_retries_input.blockSignals(False)
         self.no_log_max_retries_input.setEnabled(no_log_enabled)
+        self.no_log_adaptive_switch.setChecked(config.no_log_adaptive)
+        self.no_log_adaptive_switch.setEnabled(no_log_enabled)
+        self.no_log_adaptive_factor_input.setValue(max(1, config.no_log_adaptive_factor))
+        self.no_log_adaptive_factor_input.setEnabled(no_log_enabled)
+
+        for failure_class, switch in self.retry_failure_switches.items():
+            switch.setChecked(failure_class in config.retry_failures)
+        self.retry_max_retries_input.setValue(max(1, config.retry_max_retries))
+        self.retry_backoff_input.setValue(config.retry_backoff_seconds)
+        self.retry_backoff_max_input.setValue(config.retry_backoff_max_seconds)
+        self.retry_kill_game_switch.setChecked(config.retry_kill_game)
+
+        self.telemetry_interval_input.blockSignals(True)
+        self.telemetry_interval_input.setValue(max(0, config.telemetry_interval_seconds))
+        self.telemetry_interval_input.blockSignals(False)
+        self.max_rss_mb_input.setValue(max(0, config.max_rss_mb))
+        self.max_handles_input.setValue(max(0, config.max_handles))
+        self.max_threads_input.setValue(max(0, config.max_threads))
+        self.resource_limit_max_retries_input.setValue(max(0, config.resource_limit_max_retries))
+        self.preflight_memory_input.setValue(max(0, config.preflight_min_free_memory_mb))
+        self.preflight_disk_input.setValue(max(0, config.preflight_min_free_disk_mb))
+        self.preflight_cpu_input.setValue(max(0, config.preflight_max_cpu_percent))
+        self.preflight_wait_input.setValue(max(0, config.preflight_max_wait_seconds))
+        self.preflight_blocking_processes_opt.setValue(
+            ', '.join(config.preflight_blocking_processes),
+            emit_signal=False,
+        )
+        self.archive_output_switch.setChecked(config.archive_output)
+
+    def _on_once_per_day_toggled(self, checked: bool) -> None:
+        """每个游戏日只运行一次开关切换时启用/禁用刷新时间输入框"""
+        self.day_reset_hour_input.setEnabled(checked)
+        self.day_utc_offset_input.setEnabled(checked)
 
     def _on_notify_log_toggled(self, checked: bool) -> None:
         """日志推送开关切换时启用/禁用间隔输入框"""
@@ -263,6 +556,8 @@ class ScriptEditInterface(VerticalScrollInterface):
         """静默超时重启开关切换时启用/禁用相关输入框"""
         self.no_log_timeout_input.setEnabled(checked)
         self.no_log_max_retries_input.setEnabled(checked)
+        self.no_log_adaptive_switch.setEnabled(checked)
+        self.no_log_adaptive_factor_input.setEnabled(checked)
 
     def on_script_path_clicked(self) -> None:
         file_path, _ = QFileDialog.getOpenFileName(self, gt('选择你的脚本'))
@@ -284,9 +579,20 @@ class ScriptEditInterface(VerticalScrollInterface):
         config.script_process_name = self._get_editable_combo_value(self.script_process_name_opt)
         config.game_process_name = self._get_editable_combo_value(self.game_process_name_opt)
         config.run_timeout_seconds = int(self.run_timeout_seconds_opt.getValue())
+        config.learn_run_timeout = self.learn_run_timeout_switch.isChecked()
+        config.prewarm_launch = self.prewarm_launch_switch.isChecked()
         config.check_done = str(self.check_done_opt.getValue())
+        config.done_pattern = self.done_pattern_opt.getValue()
+        config.done_pattern_delay_seconds = self.done_pattern_delay_input.value()
+        config.idle_target = str(self.idle_target_opt.getValue())
+        config.idle_max_cpu_percent = self.idle_max_cpu_input.value()
+        config.idle_max_io_kbps = self.idle_max_io_input.value()
+        config.idle_window_seconds = self.idle_window_input.value()
         config.kill_script_after_done = self.kill_script_after_done_switch.isChecked()
         config.kill_game_after_done = self.kill_game_after_done_switch.isChecked()
+        config.once_per_day = self.once_per_day_switch.isChecked()
+        config.day_reset_hour = self.day_reset_hour_input.value()
+        config.day_utc_offset = self.day_utc_offset_input.value()
         config.script_arguments = self.script_arguments_opt.getValue()
         config.notify_start = self.notify_start_switch.isChecked()
         config.notify_done = self.notify_done_switch.isChecked()
@@ -302,6 +608,32 @@ class ScriptEditInterface(VerticalScrollInterface):
         else:
             config.no_log_timeout_seconds = 0
         config.no_log_max_retries = self.no_log_max_retries_input.value()
+        config.no_log_adaptive = self.no_log_adaptive_switch.isChecked()
+        config.no_log_adaptive_factor = self.no_log_adaptive_factor_input.value()
+        config.retry_failures = [
+            failure_class
+            for failure_class, switch in self.retry_failure_switches.items()
+            if switch.isChecked()
+        ]
+        config.retry_max_retries = self.retry_max_retries_input.value()
+        config.retry_backoff_seconds = self.retry_backoff_input.value()
+        config.retry_backoff_max_seconds = self.retry_backoff_max_input.value()
+        config.retry_kill_game = self.retry_kill_game_switch.isChecked()
+        config.telemetry_interval_seconds = self.telemetry_interval_input.value()
+        config.max_rss_mb = self.max_rss_mb_input.value()
+        config.max_handles = self.max_handles_input.value()
+        config.max_threads = self.max_threads_input.value()
+        config.resource_limit_max_retries = self.resource_limit_max_retries_input.value()
+        config.preflight_min_free_memory_mb = self.preflight_memory_input.value()
+        config.preflight_min_free_disk_mb = self.preflight_disk_input.value()
+        config.preflight_max_cpu_percent = self.preflight_cpu_input.value()
+        config.preflight_max_wait_seconds = self.preflight_wait_input.value()
+        config.preflight_blocking_processes = [
+            i.strip()
+            for i in self.preflight_blocking_processes_opt.getValue().split(',')
+            if i.strip()
+        ]
+        config.archive_output = self.archive_output_switch.isChecked()
 
         return config
 
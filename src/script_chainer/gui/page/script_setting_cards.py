@@ -188,7 +188,7 @@ class ScriptSettingCard(ScriptCardMixin, DraggableListItem):
 class PythonScriptSettingCard(ScriptCardMixin, DraggableListItem):
     """Python 脚本卡片，可拖拽排序，与普通脚本卡片同级。
 
-    支持通过 ↑/↓ 按钮挂靠到相邻脚本，作为前置/后置脚本。
+    支持通过 ↑/↓ 按钮挂靠到相邻脚本，作为前置/后置脚本；也可以作为上方脚本的伴随脚本，在其运行期间同时运行。
     挂靠后卡片间距缩小，表示依附关系。
     """
 
@@ -211,6 +211,10 @@ class PythonScriptSettingCard(ScriptCardMixin, DraggableListItem):
         self.attach_down_btn.setToolTip('挂靠到下方脚本（作为其前置脚本）')
         self.attach_down_btn.clicked.connect(self._on_attach_down)
 
+        self.attach_sidecar_btn = TransparentToolButton(FluentIcon.SYNC, None)
+        self.attach_sidecar_btn.setToolTip('作为上方脚本的伴随脚本（在其运行期间同时运行）')
+        self.attach_sidecar_btn.clicked.connect(self._on_attach_sidecar)
+
         self.run_btn = TransparentToolButton(FluentIcon.PLAY, None)
         self.run_btn.setToolTip('调试运行')
         self.run_btn.clicked.connect(self.on_run_clicked)
@@ -222,6 +226,7 @@ class PythonScriptSettingCard(ScriptCardMixin, DraggableListItem):
             btn_list=[
                 self.attach_up_btn,
                 self.attach_down_btn,
+                self.attach_sidecar_btn,
                 self.run_btn,
                 self.edit_btn,
                 self.delete_btn,
@@ -241,12 +246,14 @@ class PythonScriptSettingCard(ScriptCardMixin, DraggableListItem):
 
         self._post_tag = TagLabel('↑ 后置', color='#E08020')
         self._pre_tag = TagLabel('↓ 前置', color='#E08020')
+        self._sidecar_tag = TagLabel('↑ 伴随', color='#E08020')
         self._external_tag = TagLabel('外部')
 
         rename_idx = self._title_row.indexOf(self._rename_btn)
         self._title_row.insertWidget(rename_idx, self._external_tag)
         self._title_row.insertWidget(rename_idx, self._pre_tag)
         self._title_row.insertWidget(rename_idx, self._post_tag)
+        self._title_row.insertWidget(rename_idx, self._sidecar_tag)
 
         self._update_display()
 
@@ -292,6 +299,19 @@ class PythonScriptSettingCard(ScriptCardMixin, DraggableListItem):
         self.value_changed.emit(self.config)
         self.attach_changed.emit()
 
+    def _on_attach_sidecar(self) -> None:
+        """切换伴随上方脚本"""
+        if self.config.attach_direction == AttachDirection.SIDECAR:
+            self.config.attach_direction = AttachDirection.NONE
+        else:
+            if self.index <= 0:
+                show_warning(self.window(), '无法挂靠', '上方没有可伴随的脚本')
+                return
+            self.config.attach_direction = AttachDirection.SIDECAR
+        self._update_display()
+        self.value_changed.emit(self.config)
+        self.attach_changed.emit()
+
     def on_run_clicked(self) -> None:
         """调试运行当前 Python 脚本。"""
         path = self.config.script_path
@@ -340,6 +360,7 @@ class PythonScriptSettingCard(ScriptCardMixin, DraggableListItem):
         self.enable_switch.setChecked(self.config.enabled)
         self._post_tag.setVisible(self.config.attach_direction == AttachDirection.POST)
         self._pre_tag.setVisible(self.config.attach_direction == AttachDirection.PRE)
+        self._sidecar_tag.setVisible(self.config.attach_direction == AttachDirection.SIDECAR)
         is_external = self._is_external_script()
         self._external_tag.setVisible(is_external)
         self.edit_btn.setIcon(FluentIcon.FOLDER.icon() if is_external else FluentIcon.EDIT.icon())
@@ -38,6 +38,7 @@ from script_chainer.gui.page.script_setting_utils import (
 from script_chainer.utils.process_utils import launch_in_terminal
 from script_chainer.utils.runner_utils import (
     build_runner_command,
+    start_chain_in_daemon,
 )
 
 
@@ -201,7 +202,7 @@ class ScriptSettingRootInterface(VerticalScrollInterface):
         self.update_chain_display()
 
     def on_run_chain_clicked(self) -> None:
-        """拉起独立 runner 运行当前脚本链。"""
+        """运行当前脚本链。守护进程在运行时直接交给守护进程，否则拉起独立 runner。"""
         if self.chosen_config is None or self._runner_launch_in_progress:
             return
 
@@ -209,6 +210,9 @@ class ScriptSettingRootInterface(VerticalScrollInterface):
         self.run_chain_btn.setEnabled(False)
         chain_name = self.chosen_config.module_name
         try:
+            if start_chain_in_daemon(chain_name):
+                show_success(self.window(), '运行全部', f'已在守护进程中启动脚本链 {chain_name}')
+                return
             cmd, cwd = build_runner_command(chain_name)
             launch_in_terminal(
                 command=cmd,
@@ -385,7 +389,7 @@ class ScriptSettingRootInterface(VerticalScrollInterface):
                 prev.attach_direction = AttachDirection.NONE
         if idx < len(script_list) - 1:
             nxt = script_list[idx + 1]
-            if nxt.script_type == ScriptType.PYTHON and nxt.attach_direction == AttachDirection.POST:
+            if nxt.is_attached_upward:
                 nxt.attach_direction = AttachDirection.NONE
 
         self.chosen_config.delete_one(idx)
@@ -0,0 +1,310 @@
+"""
+runner 守护进程本地通信
+
+守护进程在 127.0.0.1 上监听 TCP 端口，使用 JSON Lines 协议，每个请求/响应/事件为一行 JSON。
+连接信息（端口、令牌、PID）写入信息文件，客户端读取后连接，每个请求都需要携带令牌。
+信息文件只有当前用户可以读写。
+
+请求: {"token": ..., "cmd": ..., 其它参数}
+响应: {"ok": true, ...} 或 {"ok": false, "error": ...}
+事件: 发送 subscribe 请求后，服务端在该连接上持续推送 {"event": ..., ...}
+
+推送事件只放入订阅方各自的有界队列，由每个订阅方的发送线程写入连接，推送方从不阻塞在网络上。
+订阅方停止读取（例如终端暂停、进程被挂起）导致队列满时，断开该订阅方。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import secrets
+import socket
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import suppress
+from pathlib import Path
+
+from one_dragon.utils.log_utils import log
+
+DAEMON_HOST = '127.0.0.1'
+CMD_SUBSCRIBE = 'subscribe'
+# 每个订阅方最多积压的事件数
+SUBSCRIBER_MAX_PENDING = 4096
+
+
+class DaemonUnavailableError(Exception):
+    """守护进程未运行或无法连接。"""
+
+
+class DaemonServer:
+    """守护进程通信服务端。
+
+    请求在连接线程中交给 handler 处理，handler 需自行保证线程安全。
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[dict], dict],
+        info_file: str,
+        port: int = 0,
+        subscriber_max_pending: int = SUBSCRIBER_MAX_PENDING,
+    ):
+        """
+        Args:
+            handler: 请求处理函数，返回响应字典（不需要包含 ok 字段）。抛出 ValueError 时返回错误响应。
+            info_file: 连接信息文件路径。
+            port: 监听端口，0 表示由系统分配。
+            subscriber_max_pending: 每个订阅方最多积压的事件数，超过时断开该订阅方。
+        """
+        self._handler = handler
+        self._info_file: Path = Path(info_file)
+        self._port: int = port
+        self._token: str = secrets.token_hex(16)
+        self._sock: socket.socket | None = None
+        self._closed = threading.Event()
+        self._subscriber_max_pending: int = subscriber_max_pending
+        self._subscribers: list[_Subscriber] = []
+        self._subscribers_lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self._sock.getsockname()[1] if self._sock is not None else self._port
+
+    def start(self) -> None:
+        """开始监听并写入连接信息文件。
+
+        Raises:
+            OSError: 端口被占用等原因无法监听时抛出。
+        """
+        self._sock = socket.create_server((DAEMON_HOST, self._port))
+        self._write_info_file(json.dumps({'port': self.port, 'token': self._token, 'pid': os.getpid()}))
+        threading.Thread(target=self._accept_loop, name='runner_daemon_accept', daemon=True).start()
+
+    def broadcast(self, event: dict) -> None:
+        """向所有订阅方推送事件，不会阻塞。积压过多的订阅方会被断开。"""
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            if not subscriber.offer(event):
+                log.warning('订阅方未及时读取事件 断开连接')
+                self._remove_subscriber(subscriber)
+
+    def close(self) -> None:
+        """停止监听，断开所有连接并删除连接信息文件。"""
+        self._closed.set()
+        if self._sock is not None:
+            with suppress(OSError):
+                self._sock.close()
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+        for subscriber in subscribers:
+            subscriber.close()
+        with suppress(OSError):
+            self._info_file.unlink()
+
+    def _write_info_file(self, content: str) -> None:
+        """写入连接信息文件，权限为 0o600，令牌不能被其它用户读取。"""
+        self._info_file.parent.mkdir(parents=True, exist_ok=True)
+        # 已存在的文件（上次异常退出遗留）可能权限更宽，删除后重新创建
+        self._info_file.unlink(missing_ok=True)
+        fd = os.open(self._info_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with open(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def _remove_subscriber(self, subscriber: _Subscriber) -> None:
+        with self._subscribers_lock, suppress(ValueError):
+            self._subscribers.remove(subscriber)
+        subscriber.close()
+
+    def _accept_loop(self) -> None:
+        while not self._closed.is_set():
+            try:
+                sock, _ = self._sock.accept()
+            except OSError:
+                break
+            threading.Thread(
+                target=self._serve_connection,
+                args=(_Connection(sock),),
+                name='runner_daemon_connection',
+                daemon=True,
+            ).start()
+
+    def _serve_connection(self, conn: _Connection) -> None:
+        subscriber: _Subscriber | None = None
+        try:
+            for request in conn.read_messages():
+                if request.get('token') != self._token:
+                    conn.send({'ok': False, 'error': '令牌无效'})
+                    break
+                cmd = request.get('cmd')
+                if cmd == CMD_SUBSCRIBE:
+                    if subscriber is None:
+                        conn.send({'ok': True})
+                        subscriber = _Subscriber(conn, self._subscriber_max_pending)
+                        with self._subscribers_lock:
+                            self._subscribers.append(subscriber)
+                    continue
+                try:
+                    response = {'ok': True, **self._handler(request)}
+                except ValueError as e:
+                    response = {'ok': False, 'error': str(e)}
+                except Exception as e:
+                    log.error('守护进程处理请求失败 %s', cmd, exc_info=True)
+                    response = {'ok': False, 'error': str(e)}
+                conn.send(response)
+        finally:
+            if subscriber is not None:
+                self._remove_subscriber(subscriber)
+            conn.close()
+
+
+class _Subscriber:
+    """一个订阅方: 事件放入有界队列，由独立的发送线程写入连接。"""
+
+    def __init__(self, conn: _Connection, max_pending: int):
+        self._conn = conn
+        # 关闭时放入 None
+        self._queue: queue.Queue[dict | None] = queue.Queue(maxsize=max(1, max_pending))
+        self._closed = threading.Event()
+        threading.Thread(target=self._send_loop, name='runner_daemon_subscriber', daemon=True).start()
+
+    def offer(self, event: dict) -> bool:
+        """放入一个事件，队列已满时返回 False。"""
+        if self._closed.is_set():
+            return True
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            return False
+
+    def close(self) -> None:
+        """停止发送并关闭连接，阻塞在发送上的线程会因连接关闭而返回。"""
+        self._closed.set()
+        with suppress(queue.Full):
+            self._queue.put_nowait(None)
+        self._conn.close()
+
+    def _send_loop(self) -> None:
+        while not self._closed.is_set():
+            event = self._queue.get()
+            if event is None or not self._conn.send(event):
+                break
+        # 发送失败时关闭连接，连接线程随之结束并移除该订阅方
+        self._conn.close()
+
+
+class _Connection:
+    """一个 JSON Lines 连接，发送加锁以便事件推送与响应交错时不会混行。"""
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._file = sock.makefile('r', encoding='utf-8', newline='\n')
+        self._send_lock = threading.Lock()
+
+    def read_messages(self) -> Iterator[dict]:
+        """逐行读取消息，连接关闭时结束。非法行被忽略。"""
+        with suppress(OSError, ValueError):
+            for line in self._file:
+                with suppress(ValueError):
+                    message = json.loads(line)
+                    if isinstance(message, dict):
+                        yield message
+
+    def send(self, message: dict) -> bool:
+        """发送一条消息，返回是否发送成功。"""
+        data = (json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._send_lock:
+            try:
+                self._sock.sendall(data)
+                return True
+            except OSError:
+                return False
+
+    def settimeout(self, timeout: float | None) -> None:
+        self._sock.settimeout(timeout)
+
+    def close(self) -> None:
+        with suppress(OSError):
+            self._sock.shutdown(socket.SHUT_RDWR)
+        with suppress(OSError):
+            self._sock.close()
+
+
+class DaemonClient:
+    """守护进程通信客户端。"""
+
+    def __init__(self, info_file: str, timeout: float = 5):
+        """
+        Args:
+            info_file: 连接信息文件路径。
+            timeout: 连接和等待响应的超时时间（秒）。
+        """
+        self._info_file: Path = Path(info_file)
+        self.timeout: float = timeout
+
+    def request(self, cmd: str, **params) -> dict:
+        """发送一个请求并等待响应。
+
+        Returns:
+            响应字典。
+
+        Raises:
+            DaemonUnavailableError: 守护进程未运行或无法连接时抛出。
+        """
+        conn, token = self._connect()
+        try:
+            if not conn.send({**params, 'token': token, 'cmd': cmd}):
+                raise DaemonUnavailableError('发送请求失败')
+            for response in conn.read_messages():
+                return response
+            raise DaemonUnavailableError('守护进程已断开连接')
+        finally:
+            conn.close()
+
+    def subscribe(self) -> Iterator[dict]:
+        """订阅事件流。
+
+        返回前已确认订阅成功，之后发生的事件都不会遗漏。
+
+        Returns:
+            事件迭代器，守护进程退出或连接断开时结束。
+
+        Raises:
+            DaemonUnavailableError: 守护进程未运行或无法连接时抛出。
+        """
+        conn, token = self._connect()
+        try:
+            if not conn.send({'token': token, 'cmd': CMD_SUBSCRIBE}):
+                raise DaemonUnavailableError('发送请求失败')
+            messages = conn.read_messages()
+            ack = next(messages, None)
+            if ack is None or not ack.get('ok'):
+                raise DaemonUnavailableError(ack.get('error') if ack else '守护进程已断开连接')
+            conn.settimeout(None)
+        except BaseException:
+            conn.close()
+            raise
+        return self._iter_events(conn, messages)
+
+    @staticmethod
+    def _iter_events(conn: _Connection, messages: Iterator[dict]) -> Iterator[dict]:
+        try:
+            yield from messages
+        finally:
+            conn.close()
+
+    def _connect(self) -> tuple[_Connection, str]:
+        try:
+            info = json.loads(self._info_file.read_text(encoding='utf-8'))
+            port = int(info['port'])
+            token = str(info['token'])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise DaemonUnavailableError('守护进程未运行') from e
+        try:
+            sock = socket.create_connection((DAEMON_HOST, port), timeout=self.timeout)
+        except OSError as e:
+            raise DaemonUnavailableError(f'无法连接守护进程: {e}') from e
+        return _Connection(sock), token
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+
+from script_chainer.services.resource_sampler import ProcessRole, ProcessTreeSampler
+
+
+class IdleDetector:
+    """判断若干组进程是否持续空闲。
+
+    每组进程独立采样，CPU 占用合计与 IO 速率（读写字节合计）都不高于阈值时认为该组空闲，
+    所有组都空闲并持续 window_seconds 秒时认为整体空闲。
+    有新进程出现或任一组缺少比较基准时视为有活动，重新计时。
+    """
+
+    def __init__(
+        self,
+        max_cpu_percent: float,
+        max_io_kbps: float,
+        window_seconds: float,
+    ):
+        """
+        Args:
+            max_cpu_percent: CPU 占用阈值（%，多核时可超过 100）。
+            max_io_kbps: IO 速率阈值（KB/s）。
+            window_seconds: 需要持续空闲的时间（秒）。
+        """
+        self.max_cpu_percent: float = max_cpu_percent
+        self.max_io_kbps: float = max_io_kbps
+        self.window_seconds: float = window_seconds
+        self._samplers: dict[str, ProcessTreeSampler] = {}
+        # 每组上一次采样的时间与各进程累计 IO 字节数
+        self._last_io: dict[str, tuple[float, dict[int, int]]] = {}
+        self._idle_since: float | None = None
+
+    @property
+    def sample_interval(self) -> float:
+        """建议的采样间隔（秒），窗口内至少采样约 6 次，且间隔在 1~5 秒之间。"""
+        return min(max(self.window_seconds / 6, 1), 5)
+
+    @property
+    def idle_seconds(self) -> float:
+        """当前已持续空闲的时间（秒）。"""
+        if self._idle_since is None:
+            return 0
+        return time.monotonic() - self._idle_since
+
+    def reset(self) -> None:
+        """重新计时，并丢弃已有的比较基准。"""
+        self._samplers.clear()
+        self._last_io.clear()
+        self._idle_since = None
+
+    def check(self, groups: dict[str, Iterable[int]]) -> bool:
+        """采样一次并返回是否已持续空闲 window_seconds 秒。
+
+        Args:
+            groups: 组名到该组当前进程 PID 的映射，组名用于在多次调用之间保持比较基准。
+        """
+        # 每组都要采样以更新比较基准，不能短路
+        busy = [self._is_busy(name, pids) for name, pids in groups.items()]
+        now = time.monotonic()
+        if any(busy):
+            self._idle_since = None
+            return False
+        if self._idle_since is None:
+            self._idle_since = now
+        return now - self._idle_since >= self.window_seconds
+
+    def _is_busy(self, name: str, pids: Iterable[int]) -> bool:
+        sampler = self._samplers.setdefault(name, ProcessTreeSampler())
+        samples, new_pids = sampler.sample(dict.fromkeys(pids, ProcessRole.TARGET))
+        now = time.monotonic()
+
+        io_bytes = {i.pid: i.read_bytes + i.write_bytes for i in samples}
+        last = self._last_io.get(name)
+        self._last_io[name] = (now, io_bytes)
+        if last is None or len(new_pids) > 0:
+            return True
+
+        last_time, last_io_bytes = last
+        elapsed = max(now - last_time, 1e-3)
+        io_delta = sum(max(0, value - last_io_bytes.get(pid, value)) for pid, value in io_bytes.items())
+        cpu_percent = sum(i.cpu_percent for i in samples)
+        return cpu_percent > self.max_cpu_percent or io_delta / 1024 / elapsed > self.max_io_kbps
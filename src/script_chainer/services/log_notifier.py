@@ -43,6 +43,13 @@ class LogNotifier:
         with self._lock:
             self._pool.add(cleaned)
 
+    def add_many(self, contents: list[str]) -> None:
+        """线程安全地向通知池添加多行日志，只获取一次锁。"""
+        cleaned = [_TIMESTAMP_RE.sub('', i) for i in contents]
+        with self._lock:
+            for i in cleaned:
+                self._pool.add(i)
+
     def start(self) -> None:
         """启动定时推送。"""
         if self._timer is not None:
@@ -0,0 +1,315 @@
+"""
+脚本输出归档
+
+每次运行脚本的输出单独写入一个压缩文件，并附带一个很小的索引文件，
+按时间范围查找或查看最后若干行时只需解压相关的块。
+
+压缩文件 (*.log.gz):
+    由多个独立的 gzip 成员依次拼接而成，每个成员为一个块，最多 block_lines 行。
+    整个文件仍是合法的 gzip 文件，可以直接用 gzip -dc / zcat 查看。
+    每行格式为 "时间戳(秒，3 位小数)\\t内容\\n"。
+
+索引文件 (*.log.gz.idx):
+    每个块写完后追加一行 "首行时间戳\\t块在压缩文件中的字节偏移\\t首行行号\\t行数\\n"。
+    进程被强制结束时最后一个块可能没有索引，读取时从最后一个有索引的块开始顺序读到文件末尾。
+    块开始后超过 block_seconds 仍未结束的由写入器的刷新线程结束，脚本停止输出后最后几行也会及时写入文件。
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import threading
+import time
+import zlib
+from collections import deque
+from collections.abc import Iterator
+from contextlib import ExitStack, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, TextIO
+
+from one_dragon.utils.log_utils import log
+
+ARCHIVE_SUFFIX = '.log.gz'
+INDEX_SUFFIX = '.idx'
+
+
+@dataclass
+class ArchiveBlock:
+    """索引中的一个块。"""
+
+    first_time: float
+    offset: int
+    first_line: int
+    line_count: int
+
+
+@dataclass
+class ArchiveLine:
+    """归档中的一行输出。"""
+
+    timestamp: float
+    text: str
+
+
+class OutputArchiveWriter:
+    """把一次脚本运行的输出写入压缩归档，线程安全。
+
+    写入失败只记录一次日志并停止归档，不影响脚本运行。
+    每个写入器有一个常驻的刷新线程，等待当前块的截止时间并结束超时的块，关闭时退出。
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        block_lines: int = 1000,
+        block_seconds: float = 10,
+        compress_level: int = 6,
+    ):
+        """
+        Args:
+            file_path: 压缩文件路径，索引文件为同名加 .idx。
+            block_lines: 每个块最多的行数。
+            block_seconds: 块最长持续时间（秒），超过该时间则结束当前块（没有新的写入时由刷新线程结束），
+                使运行中的输出可以及时查看。
+            compress_level: zlib 压缩级别。
+        """
+        self.file_path: Path = Path(file_path)
+        self.index_path: Path = Path(f'{file_path}{INDEX_SUFFIX}')
+        self.block_lines: int = max(1, block_lines)
+        self.block_seconds: float = block_seconds
+        self.compress_level: int = compress_level
+        self._lock = threading.Lock()
+        self._files = ExitStack()
+        self._file: BinaryIO | None = None
+        self._index_file: TextIO | None = None
+        self._compressor = None
+        self._block: ArchiveBlock | None = None
+        self._line_count: int = 0
+        self._closed: bool = False
+        # 当前块需要结束的时间（monotonic），没有未结束的块时为 None
+        self._flush_deadline: float | None = None
+        self._flush_cond = threading.Condition(self._lock)
+        self._flusher: threading.Thread | None = None
+
+    def write_lines(self, lines: list[str], timestamp: float | None = None) -> None:
+        """写入一批输出行。
+
+        Args:
+            lines: 输出行，不含换行。
+            timestamp: 这批输出的时间戳，默认为当前时间。
+        """
+        if not lines:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._write_lines(lines, timestamp)
+            except OSError:
+                self._on_write_error()
+
+    def close(self) -> None:
+        """结束当前块并关闭文件，之后的写入会被忽略。"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush_cond.notify_all()
+            try:
+                self._finish_block()
+            except OSError:
+                log.error('写入脚本输出归档失败 %s', self.file_path, exc_info=True)
+            self._close_files()
+
+    def _write_lines(self, lines: list[str], timestamp: float) -> None:
+        if self._file is None:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self._files.enter_context(self.file_path.open('ab'))
+            self._index_file = self._files.enter_context(self.index_path.open('a', encoding='utf-8'))
+
+        prefix = f'{timestamp:.3f}\t'
+        start = 0
+        while start < len(lines):
+            if self._block is None:
+                self._block = ArchiveBlock(
+                    first_time=timestamp,
+                    offset=self._file.tell(),
+                    first_line=self._line_count,
+                    line_count=0,
+                )
+                # wbits=31 生成带 gzip 头尾的独立成员
+                self._compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, 31)
+                self._schedule_flush()
+            count = min(len(lines) - start, self.block_lines - self._block.line_count)
+            data = ''.join(f'{prefix}{i}\n' for i in lines[start:start + count])
+            self._file.write(self._compressor.compress(data.encode('utf-8')))
+            self._block.line_count += count
+            self._line_count += count
+            start += count
+            if self._block.line_count >= self.block_lines:
+                self._finish_block()
+
+        if self._flush_deadline is not None and time.monotonic() >= self._flush_deadline:
+            self._finish_block()
+
+    def _finish_block(self) -> None:
+        if self._block is None or self._file is None or self._index_file is None:
+            return
+        self._file.write(self._compressor.flush())
+        self._file.flush()
+        block = self._block
+        self._index_file.write(f'{block.first_time:.3f}\t{block.offset}\t{block.first_line}\t{block.line_count}\n')
+        self._index_file.flush()
+        self._block = None
+        self._compressor = None
+        self._flush_deadline = None
+
+    def _schedule_flush(self) -> None:
+        """新块开始时设置截止时间，调用方需持有锁。刷新线程在第一个块开始时启动。"""
+        self._flush_deadline = time.monotonic() + self.block_seconds
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name='output_archive_flush', daemon=True)
+            self._flusher.start()
+        else:
+            self._flush_cond.notify()
+
+    def _flush_loop(self) -> None:
+        """刷新线程: 等待当前块的截止时间，到期仍未结束时结束该块。"""
+        with self._lock:
+            while not self._closed:
+                if self._flush_deadline is None:
+                    self._flush_cond.wait()
+                    continue
+                remaining = self._flush_deadline - time.monotonic()
+                if remaining > 0:
+                    self._flush_cond.wait(remaining)
+                    continue
+                try:
+                    self._finish_block()
+                except OSError:
+                    self._on_write_error()
+
+    def _on_write_error(self) -> None:
+        """写入失败时记录日志并停止归档，调用方需持有锁。"""
+        log.error('写入脚本输出归档失败 %s', self.file_path, exc_info=True)
+        self._close_files()
+        self._closed = True
+        self._flush_cond.notify_all()
+
+    def _close_files(self) -> None:
+        with suppress(OSError):
+            self._files.close()
+        self._file = None
+        self._index_file = None
+
+
+def read_index(file_path: str) -> list[ArchiveBlock]:
+    """读取归档的索引，索引不存在时返回空列表。"""
+    blocks: list[ArchiveBlock] = []
+    index_path = Path(f'{file_path}{INDEX_SUFFIX}')
+    if not index_path.exists():
+        return blocks
+    with open(index_path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) != 4:
+                # 进程在写入过程中被终止时，最后一行可能不完整
+                continue
+            with suppress(ValueError):
+                blocks.append(ArchiveBlock(float(parts[0]), int(parts[1]), int(parts[2]), int(parts[3])))
+    return blocks
+
+
+def _iter_from_offset(file_path: str, offset: int) -> Iterator[ArchiveLine]:
+    """从指定偏移的块开始顺序读取到文件末尾。最后一个块不完整时读到可解压的部分为止。"""
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        with gzip.GzipFile(fileobj=f, mode='rb') as gz:
+            reader = io.TextIOWrapper(gz, encoding='utf-8', errors='replace', newline='\n')
+            try:
+                for line in reader:
+                    timestamp, sep, text = line.rstrip('\n').partition('\t')
+                    if not sep:
+                        continue
+                    with suppress(ValueError):
+                        yield ArchiveLine(float(timestamp), text)
+            except (EOFError, OSError, zlib.error):
+                return
+
+
+def iter_lines(
+    file_path: str,
+    start_time: float | None = None,
+    end_time: float | None = None,
+) -> Iterator[ArchiveLine]:
+    """按时间范围读取归档中的输出行。
+
+    通过索引定位到包含 start_time 的块开始解压，读到 end_time 之后的第一行即停止。
+
+    Args:
+        file_path: 压缩文件路径。
+        start_time: 起始时间戳（含），None 表示从头开始。
+        end_time: 结束时间戳（含），None 表示读到末尾。
+    """
+    offset = 0
+    if start_time is not None:
+        # 上一个块的末尾可能与下一个块的首行时间相同，从首行时间早于 start_time 的最后一个块开始
+        for block in read_index(file_path):
+            if block.first_time >= start_time:
+                break
+            offset = block.offset
+    for line in _iter_from_offset(file_path, offset):
+        if end_time is not None and line.timestamp > end_time:
+            return
+        if start_time is None or line.timestamp >= start_time:
+            yield line
+
+
+def tail_lines(file_path: str, count: int) -> list[ArchiveLine]:
+    """读取归档最后 count 行，只解压末尾的若干块。"""
+    if count <= 0:
+        return []
+    blocks = read_index(file_path)
+    # 从包含最后 count 行的块开始读到文件末尾（包括未写入索引的块），只保留最后 count 行
+    offset = 0
+    lines_after = 0
+    for block in reversed(blocks):
+        offset = block.offset
+        lines_after += block.line_count
+        if lines_after >= count:
+            break
+    else:
+        offset = 0
+    return list(deque(_iter_from_offset(file_path, offset), maxlen=count))
+
+
+def list_archives(archive_dir: str, name_filter: str | None = None) -> list[Path]:
+    """列出归档文件，按修改时间从新到旧排序。
+
+    Args:
+        archive_dir: 归档目录，包含按日期划分的子目录。
+        name_filter: 只返回文件名包含该内容的归档（不区分大小写）。
+    """
+    files = [
+        i for i in Path(archive_dir).glob(f'*/*{ARCHIVE_SUFFIX}')
+        if name_filter is None or name_filter.lower() in i.name.lower()
+    ]
+    return sorted(files, key=lambda i: i.stat().st_mtime, reverse=True)
+
+
+def clear_outdated_files(archive_dir: str, keep_days: int = 7) -> None:
+    """删除超过 keep_days 天的归档及其索引，并删除空的日期目录。"""
+    deadline = time.time() - keep_days * 24 * 3600
+    for file_path in Path(archive_dir).glob(f'*/*{ARCHIVE_SUFFIX}'):
+        with suppress(OSError):
+            if file_path.stat().st_mtime < deadline:
+                Path(f'{file_path}{INDEX_SUFFIX}').unlink(missing_ok=True)
+                file_path.unlink()
+    for date_dir in Path(archive_dir).glob('*'):
+        with suppress(OSError):
+            if date_dir.is_dir() and not any(date_dir.iterdir()):
+                date_dir.rmdir()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import math
+
+# 自适应无日志超时: 至少需要的输出间隔样本数、使用的分位、超时时间下限
+ADAPTIVE_MIN_SAMPLES = 100
+ADAPTIVE_PERCENTILE = 99.5
+ADAPTIVE_MIN_TIMEOUT_SECONDS = 30
+
+
+class GapHistogram:
+    """脚本输出间隔（秒）的流式直方图。
+
+    桶按对数划分: 第 0 个桶为 [0, MIN_GAP)，之后每个桶的上界是上一个的 GROWTH 倍，
+    最后一个桶包含所有更长的间隔。桶数量固定，添加样本不会改变列表大小，
+    读取方可以在输出线程写入的同时复制计数。
+    """
+
+    BUCKET_COUNT = 64
+    MIN_GAP = 0.1
+    GROWTH = 1.25
+
+    def __init__(self, counts: list[int] | None = None):
+        self.counts: list[int] = [0] * self.BUCKET_COUNT
+        if counts is not None:
+            for i, count in enumerate(counts[:self.BUCKET_COUNT]):
+                self.counts[i] = max(0, int(count))
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    @classmethod
+    def get_bucket(cls, gap: float) -> int:
+        if gap < cls.MIN_GAP:
+            return 0
+        bucket = int(math.log(gap / cls.MIN_GAP, cls.GROWTH)) + 1
+        return min(bucket, cls.BUCKET_COUNT - 1)
+
+    @classmethod
+    def get_upper_bound(cls, bucket: int) -> float:
+        """桶的上界（秒）。"""
+        return cls.MIN_GAP * cls.GROWTH ** bucket
+
+    def add(self, gap: float) -> None:
+        self.counts[self.get_bucket(gap)] += 1
+
+    def merge(self, other: GapHistogram, max_total: int = 100000) -> None:
+        """合并另一个直方图。合并后样本数超过 max_total 时所有计数减半，使较早的运行逐渐失去权重。"""
+        for i, count in enumerate(list(other.counts)):
+            self.counts[i] += count
+        while self.total > max_total:
+            self.counts = [i // 2 for i in self.counts]
+
+    def percentile(self, q: float) -> float | None:
+        """分位数，取所在桶的上界。没有样本时返回 None。
+
+        Args:
+            q: 分位，取值 0~100。
+        """
+        total = self.total
+        if total == 0:
+            return None
+        target = total * q / 100
+        cumulative = 0
+        for bucket, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return self.get_upper_bound(bucket)
+        return self.get_upper_bound(self.BUCKET_COUNT - 1)
+
+    def to_json(self) -> str:
+        return json.dumps(self.counts)
+
+    @classmethod
+    def from_json(cls, text: str) -> GapHistogram:
+        """从 JSON 反序列化，内容不合法时返回空直方图。"""
+        try:
+            counts = json.loads(text)
+        except ValueError:
+            return cls()
+        return cls(counts if isinstance(counts, list) else None)
+
+
+def get_stall_timeout(histogram: GapHistogram, factor: float, max_timeout_seconds: int) -> int | None:
+    """按输出间隔的高分位推算无日志超时时间: 分位数乘以 factor，
+    不低于 ADAPTIVE_MIN_TIMEOUT_SECONDS，不超过 max_timeout_seconds。
+
+    Returns:
+        推算的超时时间（秒），样本不足 ADAPTIVE_MIN_SAMPLES 时返回 None。
+    """
+    if histogram.total < ADAPTIVE_MIN_SAMPLES:
+        return None
+    gap = histogram.percentile(ADAPTIVE_PERCENTILE)
+    if gap is None:
+        return None
+    timeout = max(ADAPTIVE_MIN_TIMEOUT_SECONDS, math.ceil(gap * factor))
+    return min(max_timeout_seconds, timeout)
@@ -0,0 +1,158 @@
+"""
+子进程输出的批量读取与分发
+
+读线程每次从管道读取当前可用的全部字节（最多 read_size），按换行切分出完整的行并解码，
+整批放入有界队列；分发线程一次取出队列中积压的所有批次，合并后调用一次回调。
+输出越密集，每次回调处理的行越多，单行的分发开销越低。
+
+队列满时的策略: 反压，不丢弃。
+    读线程阻塞在入队上，不再读取管道，子进程写满管道缓冲后会阻塞在写操作上，
+    直到回调追上。完成日志匹配和无日志超时都依赖完整的输出，因此不丢弃任何一行。
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable
+from contextlib import suppress
+from typing import BinaryIO
+
+from one_dragon.utils.encoding_utils import decode_bytes, get_console_encoding
+
+# 没有换行的超长输出按该长度强制切分为一行，避免缓冲区无限增长
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class LineSplitter:
+    """将分块读取的字节流切分为文本行。
+
+    换行符 0x0A 在 UTF-8 和 GBK 等多字节编码中都不会作为后续字节出现，
+    因此可以先按字节切分再解码。完整的行整块按 UTF-8 解码，失败时再逐行自动检测编码，
+    与逐行读取时使用 decode_bytes 的结果一致。
+    """
+
+    def __init__(self, encoding: str | None = None):
+        """
+        Args:
+            encoding: UTF-8 解码失败时使用的编码，默认为控制台编码。
+        """
+        self.encoding: str = encoding or get_console_encoding()
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[str]:
+        """追加读取到的字节，返回其中完整的行（不含行尾的换行和回车）。"""
+        self._buffer += data
+        end = self._buffer.rfind(b'\n')
+        if end < 0:
+            if len(self._buffer) < MAX_LINE_BYTES:
+                return []
+            return self.close()
+        complete = bytes(self._buffer[:end])
+        del self._buffer[:end + 1]
+        return self._decode_lines(complete)
+
+    def close(self) -> list[str]:
+        """返回缓冲区中剩余的不完整行，没有时返回空列表。"""
+        if not self._buffer:
+            return []
+        rest = bytes(self._buffer)
+        self._buffer.clear()
+        return self._decode_lines(rest)
+
+    def _decode_lines(self, data: bytes) -> list[str]:
+        try:
+            return [i.rstrip('\r') for i in data.decode('utf-8').split('\n')]
+        except UnicodeDecodeError:
+            return [decode_bytes(i, self.encoding).rstrip('\r') for i in data.split(b'\n')]
+
+
+class OutputPipeline:
+    """在两个守护线程中读取子进程输出，并按批回调。
+
+    回调异常只会丢弃该批次，不影响后续输出的读取。
+    """
+
+    def __init__(
+        self,
+        pipe: BinaryIO,
+        batch_callback: Callable[[list[str]], None],
+        encoding: str | None = None,
+        read_size: int = 64 * 1024,
+        max_pending_batches: int = 64,
+        max_batch_lines: int = 4096,
+    ):
+        """
+        Args:
+            pipe: 子进程输出管道，读取结束后由本对象关闭。
+            batch_callback: 输出回调，每次传入按顺序排列的一批行。
+            encoding: UTF-8 解码失败时使用的编码，默认为控制台编码。
+            read_size: 每次最多从管道读取的字节数。
+            max_pending_batches: 队列中最多积压的批次数，超过时读线程阻塞（反压）。
+            max_batch_lines: 分发时合并批次的行数上限。
+        """
+        self._pipe = pipe
+        self._callback = batch_callback
+        self._splitter = LineSplitter(encoding)
+        self._read_size: int = read_size
+        self._max_batch_lines: int = max_batch_lines
+        # 读取结束时放入 None
+        self._queue: queue.Queue[list[str] | None] = queue.Queue(maxsize=max(1, max_pending_batches))
+        self._reader: threading.Thread | None = None
+        self._dispatcher: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._reader = threading.Thread(target=self._read, name='output_reader', daemon=True)
+        self._dispatcher = threading.Thread(target=self._dispatch, name='output_dispatcher', daemon=True)
+        self._dispatcher.start()
+        self._reader.start()
+
+    def is_alive(self) -> bool:
+        return any(i is not None and i.is_alive() for i in (self._reader, self._dispatcher))
+
+    def join(self, timeout: float | None = None) -> None:
+        """等待输出全部分发完成，超时后直接返回。"""
+        for thread in (self._reader, self._dispatcher):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def _read(self) -> None:
+        read = getattr(self._pipe, 'read1', self._pipe.read)
+        try:
+            while True:
+                data = read(self._read_size)
+                if not data:
+                    break
+                lines = self._splitter.feed(data)
+                if lines:
+                    self._queue.put(lines)
+        except (OSError, ValueError):
+            pass
+        finally:
+            rest = self._splitter.close()
+            if rest:
+                self._queue.put(rest)
+            self._queue.put(None)
+            with suppress(OSError):
+                self._pipe.close()
+
+    def _dispatch(self) -> None:
+        finished = False
+        while not finished:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            # 合并已积压的批次，一次回调处理
+            while len(batch) < self._max_batch_lines:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    finished = True
+                    break
+                batch.extend(more)
+            try:
+                self._callback(batch)
+            except Exception:
+                continue
@@ -40,7 +40,6 @@ import ctypes
 import ctypes.wintypes
 import subprocess
 import sys
-import threading
 import time
 from collections.abc import Callable
 from contextlib import suppress
@@ -50,7 +49,13 @@ from pathlib import Path
 import psutil
 
 from one_dragon.utils.encoding_utils import decode_bytes, get_console_encoding
-from script_chainer.utils.process_utils import graceful_kill_popen, graceful_kill_psutil
+from script_chainer.services.output_pipeline import OutputPipeline
+from script_chainer.services.process_table import get_process_table
+from script_chainer.utils.process_utils import (
+    graceful_kill_popen,
+    graceful_kill_psutil,
+    request_close,
+)
 
 # Windows 下隐藏控制台窗口的标志
 CREATION_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
@@ -132,22 +137,29 @@ def match_process(proc: psutil.Process, target: ProcessInfo) -> bool:
     return True
 
 
-def find_process_by_info(target: ProcessInfo) -> psutil.Process | None:
+def find_process_by_info(target: ProcessInfo, max_age: float | None = None) -> psutil.Process | None:
     """根据 ProcessInfo 查找第一个匹配的进程。
 
+    查询基于共享的进程表快照，同一监控周期内的多次查询只扫描一次进程表。
+
     Args:
         target: 目标进程匹配条件。
+        max_age: 可接受的最大快照年龄（秒），None 表示使用快照的 TTL，0 表示强制刷新。
 
     Returns:
         匹配的进程对象，未找到返回 None。
     """
-    for proc in psutil.process_iter(['pid', 'name']):
-        try:
-            if match_process(proc, target):
-                return proc
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            continue
-    return None
+    entry = get_process_table().find(target, max_age=max_age)
+    if entry is None:
+        return None
+    return entry.to_process()
+
+
+def normalize_process_name(process_name: str) -> str:
+    """规范化进程名称，Windows 下补全 .exe 后缀。"""
+    if sys.platform == 'win32' and not process_name.endswith('.exe'):
+        return f'{process_name}.exe'
+    return process_name
 
 
 def is_process_existed(process_name: str | None) -> bool:
@@ -161,9 +173,7 @@ def is_process_existed(process_name: str | None) -> bool:
     """
     if not process_name:
         return False
-    if sys.platform == 'win32' and not process_name.endswith('.exe'):
-        process_name = f'{process_name}.exe'
-    return find_process_by_info(ProcessInfo(name=process_name)) is not None
+    return len(get_process_table().get_pids_by_name(normalize_process_name(process_name))) > 0
 
 
 class ProcessManager:
@@ -183,7 +193,7 @@ class ProcessManager:
     def __init__(self):
         self.process: subprocess.Popen | None = None
         self.target_process: psutil.Process | None = None
-        self._stdout_thread: threading.Thread | None = None
+        self._stdout_pipeline: OutputPipeline | None = None
 
     @property
     def main_pid(self) -> int | None:
@@ -212,7 +222,7 @@ class ProcessManager:
         cwd: str | None = None,
         target_process: ProcessInfo | None = None,
         search_timeout: float = 60,
-        stdout_callback: Callable[[str], None] | None = None,
+        stdout_callback: Callable[[list[str]], None] | None = None,
     ) -> bool:
         """启动子进程。
 
@@ -222,7 +232,7 @@ class ProcessManager:
             cwd: 工作目录，默认为 program 所在目录。
             target_process: 目标进程信息（用于追踪 launcher 启动的子进程）。
             search_timeout: 搜索目标进程的超时时间（秒）。
-            stdout_callback: 子进程输出回调，每行调用一次。为 None 时不捕获输出。
+            stdout_callback: 子进程输出回调，每次传入按顺序排列的一批输出行。为 None 时不捕获输出。
 
         Returns:
             是否成功启动并追踪到进程。
@@ -255,14 +265,10 @@ class ProcessManager:
         if job is not None:
             self._assign_to_job(job, self.process._handle)  # ty:ignore[unresolved-attribute]
 
-        # 启动 stdout 读取守护线程
+        # 启动 stdout 批量读取与分发
         if stdout_callback is not None and self.process.stdout is not None:
-            self._stdout_thread = threading.Thread(
-                target=self._read_stdout,
-                args=(self.process.stdout, stdout_callback),
-                daemon=True,
-            )
-            self._stdout_thread.start()
+            self._stdout_pipeline = OutputPipeline(self.process.stdout, stdout_callback)
+            self._stdout_pipeline.start()
 
         # 若指定了目标进程，则搜索并追踪；失败时回收已启动资源
         if target_process is not None:
@@ -286,6 +292,7 @@ class ProcessManager:
         """搜索并追踪目标进程。
 
         优先从已启动子进程的进程树中搜索，找不到时再进行全局搜索。
+        每轮轮询只刷新一次共享进程表快照，两种搜索都基于同一份快照完成。
 
         Args:
             target: 目标进程信息。
@@ -302,17 +309,35 @@ class ProcessManager:
                 rc = self.process.returncode
                 if rc != 0:
                     raise LauncherExitError(rc)
+            table = get_process_table()
+            table.refresh()
             # 优先从已启动进程的子进程树中搜索
             found = self._search_in_children(target)
             if found is None:
                 # fallback: 全局搜索
-                found = find_process_by_info(target)
+                entry = table.find(target)
+                found = entry.to_process() if entry is not None else None
             if found is not None:
                 self.target_process = found
                 return True
             time.sleep(poll_interval)
         return False
 
+    def attach_target(self, pid: int) -> bool:
+        """将指定 PID 设为追踪的目标进程（用于启动器退出后目标进程才出现的场景）。
+
+        Args:
+            pid: 目标进程 ID。
+
+        Returns:
+            是否成功追踪。
+        """
+        try:
+            self.target_process = psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+        return True
+
     def _search_in_children(self, target: ProcessInfo) -> psutil.Process | None:
         """从已启动子进程的后代中搜索匹配的目标进程。
 
@@ -324,15 +349,10 @@ class ProcessManager:
         """
         if self.process is None:
             return None
-        try:
-            parent = psutil.Process(self.process.pid)
-            for child in parent.children(recursive=True):
-                with suppress(psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    if match_process(child, target):
-                        return child
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
-        return None
+        entry = get_process_table().find(target, root_pid=self.process.pid)
+        if entry is None:
+            return None
+        return entry.to_process()
 
     def is_running(self) -> bool:
         """检查被管理的进程是否仍在运行。"""
@@ -357,6 +377,32 @@ class ProcessManager:
         self._kill_direct(graceful_timeout)
         self.clear()
 
+    def stop(self, graceful_timeout: float = 10) -> None:
+        """请求被管理的进程自行退出，超时后按 kill() 终止进程树。
+
+        只向目标进程和直接启动的进程发送关闭请求，由它们自行结束子进程、保存状态；
+        在 graceful_timeout 秒内整个进程树都退出则不再强制终止。没有进程接受关闭请求时直接终止。
+
+        Args:
+            graceful_timeout: 等待进程自行退出的时间（秒）。
+        """
+        roots: list[psutil.Process] = []
+        if self.target_process is not None:
+            roots.append(self.target_process)
+        if self.process is not None and self.process.poll() is None:
+            with suppress(psutil.NoSuchProcess, psutil.AccessDenied):
+                roots.append(psutil.Process(self.process.pid))
+        roots = list({i.pid: i for i in roots}.values())
+
+        procs = list(roots)
+        for root in roots:
+            with suppress(psutil.NoSuchProcess, psutil.AccessDenied):
+                procs.extend(root.children(recursive=True))
+        requested = [request_close(i) for i in roots]
+        if any(requested):
+            psutil.wait_procs(list({i.pid: i for i in procs}.values()), timeout=graceful_timeout)
+        self.kill()
+
     def _kill_target(self, graceful_timeout: float = 3) -> None:
         """终止追踪的目标进程（psutil.Process）。"""
         if self.target_process is not None:
@@ -392,13 +438,13 @@ class ProcessManager:
 
     def clear(self) -> None:
         """清空跟踪的进程信息。"""
-        if self._stdout_thread is not None and self._stdout_thread.is_alive():
+        if self._stdout_pipeline is not None and self._stdout_pipeline.is_alive():
             # 尽力等待 stdout 线程退出；因为是守护线程且此时管道已关闭，
             # 线程通常会在超时前结束。即使超时，守护线程也不会泄漏。
-            self._stdout_thread.join(timeout=1.0)
+            self._stdout_pipeline.join(timeout=1.0)
         self.process = None
         self.target_process = None
-        self._stdout_thread = None
+        self._stdout_pipeline = None
 
     # ------------------------------------------------------------------
     # Windows Job Object — 父进程退出时自动清理所有子进程
@@ -495,6 +541,21 @@ class ProcessManager:
 
         return job
 
+    @classmethod
+    def add_to_job(cls, proc_handle: int) -> bool:
+        """将不是通过 open_process 启动的进程加入 Job Object，runner 退出时一并终止。
+
+        Args:
+            proc_handle: 进程句柄。
+
+        Returns:
+            是否加入成功，非 Windows 平台返回 False。
+        """
+        job = cls._get_job()
+        if job is None:
+            return False
+        return cls._assign_to_job(job, proc_handle)
+
     @staticmethod
     def _assign_to_job(job_handle: int, proc_handle: int) -> bool:
         """将进程加入 Job Object。
@@ -507,23 +568,6 @@ class ProcessManager:
             ctypes.windll.kernel32.AssignProcessToJobObject(job_handle, proc_handle)
         )
 
-    @staticmethod
-    def _read_stdout(pipe, callback: Callable[[str], None]) -> None:
-        """持续读取子进程 stdout 并逐行回调（守护线程入口）。"""
-        console_enc = get_console_encoding()
-        try:
-            for raw_line in iter(pipe.readline, b""):
-                line = decode_bytes(raw_line, console_enc).rstrip("\r\n")
-                try:
-                    callback(line)
-                except Exception:
-                    continue
-        except (OSError, ValueError):
-            pass
-        finally:
-            with suppress(OSError):
-                pipe.close()
-
     @staticmethod
     def run_process(
         command: list[str],
@@ -0,0 +1,189 @@
+"""
+进程表快照
+
+一次批量 psutil.process_iter 读取所有需要的进程属性，并建立
+名称 → PID、父 PID → 子 PID 索引。同一个监控周期内的多次查询
+（游戏进程、脚本进程、子进程树）共享同一份快照，快照在 TTL 内复用。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import psutil
+
+if TYPE_CHECKING:
+    from script_chainer.services.process_manager import ProcessInfo
+
+# 批量读取的进程属性
+PROCESS_TABLE_ATTRS = ['pid', 'name', 'exe', 'cmdline', 'ppid', 'create_time']
+
+
+@dataclass
+class ProcessEntry:
+    """快照中的一个进程。
+
+    无权限读取的属性为 None。
+    """
+
+    pid: int
+    name: str | None = None
+    exe: str | None = None
+    cmdline: list[str] | None = None
+    ppid: int | None = None
+    create_time: float | None = None
+
+    def matches(self, target: ProcessInfo) -> bool:
+        """检查是否与目标进程信息匹配，语义与 match_process 一致。"""
+        if target.pid is not None and self.pid != target.pid:
+            return False
+        if target.name is not None and self.name != target.name:
+            return False
+        if target.exe is not None and (self.exe is None or Path(self.exe) != Path(target.exe)):
+            return False
+        return target.cmdline is None or self.cmdline == target.cmdline
+
+    def to_process(self) -> psutil.Process | None:
+        """转换为 psutil.Process，PID 已被复用或进程已退出时返回 None。"""
+        try:
+            proc = psutil.Process(self.pid)
+            if self.create_time is not None and proc.create_time() != self.create_time:
+                return None
+            return proc
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+
+class ProcessTable:
+    """带 TTL 的进程表快照服务。
+
+    Attributes:
+        ttl: 快照有效期（秒），过期后下一次查询会触发刷新。
+    """
+
+    def __init__(self, ttl: float = 1.0):
+        self.ttl: float = ttl
+        self._lock = threading.Lock()
+        self._refresh_time: float | None = None
+        self._entries: dict[int, ProcessEntry] = {}
+        self._name_index: dict[str, list[int]] = {}
+        self._children_index: dict[int, list[int]] = {}
+
+    def refresh(self) -> None:
+        """立即重新读取进程表。"""
+        entries: dict[int, ProcessEntry] = {}
+        name_index: dict[str, list[int]] = {}
+        children_index: dict[int, list[int]] = {}
+        for proc in psutil.process_iter(PROCESS_TABLE_ATTRS):
+            info = proc.info
+            entry = ProcessEntry(
+                pid=proc.pid,
+                name=info.get('name'),
+                exe=info.get('exe'),
+                cmdline=info.get('cmdline'),
+                ppid=info.get('ppid'),
+                create_time=info.get('create_time'),
+            )
+            entries[entry.pid] = entry
+            if entry.name:
+                name_index.setdefault(entry.name, []).append(entry.pid)
+            if entry.ppid is not None and entry.ppid != entry.pid:
+                children_index.setdefault(entry.ppid, []).append(entry.pid)
+
+        with self._lock:
+            self._entries = entries
+            self._name_index = name_index
+            self._children_index = children_index
+            self._refresh_time = time.monotonic()
+
+    def ensure_fresh(self, max_age: float | None = None) -> None:
+        """快照超过有效期时刷新。
+
+        Args:
+            max_age: 本次查询可接受的最大快照年龄（秒），None 表示使用 ttl。
+        """
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            refresh_time = self._refresh_time
+        if refresh_time is None or time.monotonic() - refresh_time > max_age:
+            self.refresh()
+
+    def get(self, pid: int, max_age: float | None = None) -> ProcessEntry | None:
+        """按 PID 获取进程。"""
+        self.ensure_fresh(max_age)
+        with self._lock:
+            return self._entries.get(pid)
+
+    def get_pids_by_name(self, name: str, max_age: float | None = None) -> list[int]:
+        """按进程名称获取所有 PID。"""
+        self.ensure_fresh(max_age)
+        with self._lock:
+            return list(self._name_index.get(name, ()))
+
+    def get_children(self, pid: int, recursive: bool = False, max_age: float | None = None) -> list[int]:
+        """获取子进程 PID，recursive 为 True 时按广度优先返回所有后代。"""
+        self.ensure_fresh(max_age)
+        with self._lock:
+            if not recursive:
+                return list(self._children_index.get(pid, ()))
+            return self._get_descendants(pid)
+
+    def find(
+        self,
+        target: ProcessInfo,
+        root_pid: int | None = None,
+        max_age: float | None = None,
+    ) -> ProcessEntry | None:
+        """查找第一个匹配的进程。
+
+        Args:
+            target: 目标进程匹配条件。
+            root_pid: 仅在该进程的后代中查找，None 表示全局查找。
+            max_age: 本次查询可接受的最大快照年龄（秒），None 表示使用 ttl。
+
+        Returns:
+            匹配的进程，未找到返回 None。
+        """
+        self.ensure_fresh(max_age)
+        with self._lock:
+            if root_pid is not None:
+                candidates = self._get_descendants(root_pid)
+            elif target.pid is not None:
+                candidates = [target.pid]
+            elif target.name is not None:
+                candidates = self._name_index.get(target.name, [])
+            else:
+                candidates = list(self._entries)
+
+            for pid in candidates:
+                entry = self._entries.get(pid)
+                if entry is not None and entry.matches(target):
+                    return entry
+        return None
+
+    def _get_descendants(self, pid: int) -> list[int]:
+        """按广度优先返回所有后代 PID（调用方需持有锁）。"""
+        result: list[int] = []
+        queue = deque(self._children_index.get(pid, ()))
+        visited = set(queue)
+        while queue:
+            child = queue.popleft()
+            result.append(child)
+            for grandchild in self._children_index.get(child, ()):
+                if grandchild not in visited:
+                    visited.add(grandchild)
+                    queue.append(grandchild)
+        return result
+
+
+_shared_table = ProcessTable()
+
+
+def get_process_table() -> ProcessTable:
+    """获取进程内共享的进程表快照。"""
+    return _shared_table
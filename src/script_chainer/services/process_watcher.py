@@ -0,0 +1,266 @@
+"""
+进程生命周期监听
+
+用事件通知代替 runner 中每秒一次的全量进程扫描:
+- 进程退出: 每个被追踪的 PID 由一个守护线程阻塞等待。Linux 使用 pidfd，
+  其它平台使用 psutil.Process.wait（Windows 下底层为 WaitForSingleObject）。
+- 进程出现: 后台线程对进程表做差分，只读取新出现 PID 的进程名。
+任一事件发生时都会唤醒 wait_changed 的等待方。
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import sys
+import threading
+import time
+from contextlib import suppress
+
+import psutil
+
+from script_chainer.services.process_manager import normalize_process_name
+from script_chainer.services.process_table import get_process_table
+
+
+def wait_pid_exit(
+    pid: int,
+    timeout: float | None = None,
+    cancel_event: threading.Event | None = None,
+    step: float = 0.5,
+) -> bool:
+    """阻塞等待指定 PID 退出。
+
+    Args:
+        pid: 进程 ID。
+        timeout: 超时时间（秒），None 表示一直等待。
+        cancel_event: 可选的取消事件，被设置后尽快返回。
+        step: 检查取消事件的间隔（秒）。
+
+    Returns:
+        进程是否已退出。超时或被取消时返回 False。
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def _next_wait() -> float | None:
+        """返回下一次阻塞等待的时长，已超时或已取消时返回 None。"""
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        if deadline is None:
+            return step
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        return min(step, remaining)
+
+    pidfd = _open_pidfd(pid)
+    if pidfd == -1:
+        return True
+    if pidfd is not None:
+        try:
+            while (wait := _next_wait()) is not None:
+                readable, _, _ = select.select([pidfd], [], [], wait)
+                if readable:
+                    return True
+            return False
+        finally:
+            os.close(pidfd)
+
+    try:
+        proc = psutil.Process(pid)
+    except psutil.NoSuchProcess:
+        return True
+
+    while (wait := _next_wait()) is not None:
+        try:
+            proc.wait(timeout=wait)
+            return True
+        except psutil.TimeoutExpired:
+            continue
+        except psutil.NoSuchProcess:
+            return True
+        except psutil.AccessDenied:
+            # 无法打开进程句柄时退化为存活检查
+            if not proc.is_running():
+                return True
+            time.sleep(wait)
+    return False
+
+
+def _open_pidfd(pid: int) -> int | None:
+    """在 Linux 上打开 pidfd。
+
+    Returns:
+        pidfd；进程已不存在时返回 -1；平台不支持时返回 None。
+    """
+    if not sys.platform.startswith('linux') or not hasattr(os, 'pidfd_open'):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except ProcessLookupError:
+        return -1
+    except OSError:
+        return None
+
+
+class ProcessWatcher:
+    """按进程名追踪进程的出现与退出。
+
+    Attributes:
+        scan_interval: 进程表差分扫描的间隔（秒）。
+    """
+
+    def __init__(
+        self,
+        scan_interval: float = 1.0,
+        cancel_event: threading.Event | None = None,
+    ):
+        """
+        Args:
+            scan_interval: 进程表差分扫描的间隔（秒）。
+            cancel_event: 可选的外部取消事件（如 runner 退出），被设置后 wait_changed 立即返回。
+        """
+        self.scan_interval: float = scan_interval
+        self._cancel_event: threading.Event | None = cancel_event
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._closed = threading.Event()
+        self._name_pids: dict[str, set[int]] = {}
+        self._waiting_pids: set[int] = set()
+        self._known_pids: set[int] = set()
+        self._scan_thread: threading.Thread | None = None
+
+    def watch_name(self, process_name: str | None, known_pid: int | None = None) -> None:
+        """开始追踪指定名称的进程。
+
+        注册时从共享进程表快照中找出已存在的同名进程（同一时刻注册的多个名称共享一次扫描），
+        之后由后台差分线程发现新进程。
+
+        Args:
+            process_name: 进程名称，为空时忽略。
+            known_pid: 调用方已知的同名进程 PID（如 ProcessManager 追踪到的进程），可省去一次扫描匹配。
+        """
+        if not process_name:
+            return
+        name = normalize_process_name(process_name)
+        with self._lock:
+            if name in self._name_pids:
+                return
+            self._name_pids[name] = set()
+
+        self._ensure_scan_thread()
+        matched = get_process_table().get_pids_by_name(name)
+        if known_pid is not None and known_pid not in matched:
+            matched.append(known_pid)
+        for pid in matched:
+            self._add_pid(name, pid)
+
+    def is_alive(self, process_name: str | None) -> bool:
+        """指定名称的进程当前是否存在（需先 watch_name）。"""
+        if not process_name:
+            return False
+        with self._lock:
+            return bool(self._name_pids.get(normalize_process_name(process_name)))
+
+    def get_pids(self, process_name: str | None) -> list[int]:
+        """获取指定名称当前存活的进程 PID（需先 watch_name）。"""
+        if not process_name:
+            return []
+        with self._lock:
+            return sorted(self._name_pids.get(normalize_process_name(process_name), ()))
+
+    def wait_changed(self, timeout: float, step: float = 0.1) -> bool:
+        """阻塞等待任一追踪进程出现或退出。
+
+        Args:
+            timeout: 最长等待时间（秒）。
+            step: 检查外部取消事件的间隔（秒）。
+
+        Returns:
+            是否发生了进程事件或被取消。超时返回 False。
+        """
+        deadline = time.monotonic() + max(timeout, 0)
+        while True:
+            remaining = deadline - time.monotonic()
+            if self._changed.wait(max(min(step, remaining), 0)):
+                self._changed.clear()
+                return True
+            if self._closed.is_set():
+                return True
+            if self._cancel_event is not None and self._cancel_event.is_set():
+                return True
+            if remaining <= 0:
+                return False
+
+    def notify(self) -> None:
+        """唤醒 wait_changed 的等待方，用于进程事件以外的完成条件（如匹配到完成日志）。"""
+        self._changed.set()
+
+    def close(self) -> None:
+        """停止所有后台线程。"""
+        self._closed.set()
+        self._changed.set()
+        if self._scan_thread is not None and self._scan_thread is not threading.current_thread():
+            self._scan_thread.join(timeout=self.scan_interval + 1)
+
+    def __enter__(self) -> ProcessWatcher:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _add_pid(self, name: str, pid: int) -> None:
+        """记录一个存活的同名进程，并启动其退出等待线程。"""
+        with self._lock:
+            self._name_pids[name].add(pid)
+            if pid in self._waiting_pids:
+                return
+            self._waiting_pids.add(pid)
+        threading.Thread(
+            target=self._wait_exit,
+            args=(pid,),
+            name=f'process_watcher_exit_{pid}',
+            daemon=True,
+        ).start()
+        self._changed.set()
+
+    def _wait_exit(self, pid: int) -> None:
+        """守护线程入口: 等待 PID 退出后从所有名称集合中移除。"""
+        if not wait_pid_exit(pid, cancel_event=self._closed):
+            return
+        with self._lock:
+            self._waiting_pids.discard(pid)
+            for pids in self._name_pids.values():
+                pids.discard(pid)
+        self._changed.set()
+
+    def _ensure_scan_thread(self) -> None:
+        with self._lock:
+            if self._scan_thread is not None:
+                return
+            self._known_pids = set(psutil.pids())
+            self._scan_thread = threading.Thread(
+                target=self._scan_loop,
+                name='process_watcher_scan',
+                daemon=True,
+            )
+        self._scan_thread.start()
+
+    def _scan_loop(self) -> None:
+        """守护线程入口: 周期性对进程表做差分，只检查新出现的 PID。"""
+        while not self._closed.wait(self.scan_interval):
+            try:
+                current = set(psutil.pids())
+            except Exception:
+                continue
+            new_pids = current - self._known_pids
+            self._known_pids = current
+            if not new_pids:
+                continue
+            with self._lock:
+                names = set(self._name_pids)
+            for pid in new_pids:
+                with suppress(psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    name = psutil.Process(pid).name()
+                    if name in names:
+                        self._add_pid(name, pid)
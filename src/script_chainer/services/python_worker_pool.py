@@ -0,0 +1,377 @@
+"""
+Python 脚本工作进程池
+
+Python 类型的脚本不再在 runner 进程内 exec，而是交给提前启动的工作进程执行:
+    - 工作进程启动时预先导入常用模块，收到的是 runner 编译好的代码对象，启动耗时为毫秒级。
+    - 每个工作进程只执行一个脚本，执行完即退出，脚本修改的 sys.modules / sys.path / cwd 等状态不会影响其它脚本；
+      取走一个空闲进程后在后台补充新的工作进程。
+    - 脚本的 stdout / stderr 按行通过管道传回 runner，由 runner 统一输出。
+    - 支持超时，超时或 runner 退出时强制结束工作进程及其子进程树，不影响 runner 本身。
+
+工作进程通过 multiprocessing 的 spawn 方式启动，打包为 exe 时入口需要调用 multiprocessing.freeze_support()。
+脚本中启动的子进程继承的是工作进程的控制台，其输出不经过管道。
+"""
+
+from __future__ import annotations
+
+import builtins
+import importlib
+import io
+import marshal
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+
+import psutil
+
+from one_dragon.utils.log_utils import log
+from script_chainer.services.process_manager import ProcessManager
+
+# 工作进程启动时预先导入的模块，导入失败的忽略
+PRELOAD_MODULES: tuple[str, ...] = (
+    'datetime',
+    'json',
+    'pathlib',
+    're',
+    'shutil',
+    'subprocess',
+    'time',
+    'urllib.request',
+    'psutil',
+)
+
+# 管道消息类型
+_MSG_OUTPUT = 'output'
+_MSG_EXIT = 'exit'
+
+
+@dataclass
+class PythonJob:
+    """交给工作进程执行的脚本。"""
+
+    script_path: str
+    # marshal 序列化的代码对象，代码对象本身不能通过管道传递
+    code: bytes
+
+
+@dataclass
+class PythonRunResult:
+    """脚本执行结果。"""
+
+    # 脚本的退出码，与 python 解释器一致: 正常结束为 0，未捕获异常为 1。被强制结束时为 None
+    exit_code: int | None
+    timed_out: bool = False
+    cancelled: bool = False
+
+    @property
+    def is_success(self) -> bool:
+        return self.exit_code == 0
+
+
+class _PipeWriter(io.TextIOBase):
+    """工作进程中替换 sys.stdout / sys.stderr，将完整的行通过管道发送给 runner。"""
+
+    def __init__(self, conn: Connection, lock: threading.Lock):
+        super().__init__()
+        self._conn = conn
+        self._lock = lock
+        self._buffer = ''
+
+    @property
+    def encoding(self) -> str:
+        return 'utf-8'
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        with self._lock:
+            self._buffer += s
+            end = self._buffer.rfind('\n')
+            if end >= 0:
+                lines = self._buffer[:end].split('\n')
+                self._buffer = self._buffer[end + 1:]
+                self._send(lines)
+        return len(s)
+
+    def close_buffer(self) -> None:
+        """发送最后不完整的一行。"""
+        with self._lock:
+            if self._buffer:
+                self._send([self._buffer])
+                self._buffer = ''
+
+    def _send(self, lines: list[str]) -> None:
+        with suppress(OSError, ValueError):
+            self._conn.send((_MSG_OUTPUT, [i.rstrip('\r') for i in lines]))
+
+
+def _worker_main(conn: Connection, preload_modules: tuple[str, ...]) -> None:
+    """工作进程入口: 预先导入模块，等待并执行一个脚本，发送退出码后退出。"""
+    for module_name in preload_modules:
+        with suppress(Exception):
+            importlib.import_module(module_name)
+
+    try:
+        job: PythonJob = conn.recv()
+    except (EOFError, OSError):
+        return
+
+    # stdout 与 stderr 共用一个写入方，保持输出顺序
+    writer = _PipeWriter(conn, threading.Lock())
+    sys.stdout = writer
+    sys.stderr = writer
+    exit_code = _exec_job(job)
+    writer.close_buffer()
+    with suppress(OSError, ValueError):
+        conn.send((_MSG_EXIT, exit_code))
+    conn.close()
+
+
+def _exec_job(job: PythonJob) -> int:
+    """在工作进程中执行脚本，返回退出码。"""
+    script_file = Path(job.script_path).resolve()
+    script_path = str(script_file)
+    sys.argv = [script_path]
+    sys.path.insert(0, str(script_file.parent))
+    try:
+        os.chdir(script_file.parent)
+        exec_globals = {
+            '__name__': '__main__',
+            '__file__': script_path,
+            '__package__': None,
+            '__spec__': None,
+            '__builtins__': builtins,
+        }
+        exec(marshal.loads(job.code), exec_globals)
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code)
+        return 1
+    except BaseException as e:
+        # 去掉 _exec_job 本身的栈帧，与直接运行脚本时的输出一致
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        return 1
+
+
+class _Worker:
+    """一个工作进程及其管道。"""
+
+    def __init__(self, process: BaseProcess, conn: Connection):
+        self.process: BaseProcess = process
+        self.conn: Connection = conn
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        """强制结束工作进程及其子进程树。"""
+        with suppress(psutil.Error, ValueError):
+            for child in psutil.Process(self.process.pid).children(recursive=True):
+                with suppress(psutil.Error):
+                    child.kill()
+        with suppress(Exception):
+            self.process.kill()
+            self.process.join(timeout=3)
+        self.close()
+
+    def close(self) -> None:
+        with suppress(OSError):
+            self.conn.close()
+
+
+class PythonWorkerPool:
+    """Python 脚本工作进程池，线程安全，可以同时执行多个脚本。"""
+
+    def __init__(self, size: int = 1, preload_modules: tuple[str, ...] = PRELOAD_MODULES):
+        """
+        Args:
+            size: 保持的空闲工作进程数量。同时执行的脚本超过该数量时临时启动新的工作进程。
+            preload_modules: 工作进程启动时预先导入的模块。
+        """
+        self.size: int = max(1, size)
+        self.preload_modules: tuple[str, ...] = preload_modules
+        self._mp_context = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+        self._idle: list[_Worker] = []
+        self._busy: set[_Worker] = set()
+        self._closed: bool = False
+        self._replenishing: bool = False
+
+    def start(self) -> None:
+        """在后台启动空闲工作进程，不等待启动完成。"""
+        self._replenish_async()
+
+    def run(
+        self,
+        job: PythonJob,
+        output_callback: Callable[[list[str]], None] | None = None,
+        timeout_seconds: float | None = None,
+        cancel_event: threading.Event | None = None,
+    ) -> PythonRunResult:
+        """执行一个脚本并等待结束。
+
+        Args:
+            job: 要执行的脚本。
+            output_callback: 输出回调，每次传入按顺序排列的一批输出行。
+            timeout_seconds: 超时时间（秒），超时后强制结束，None 表示不限制。
+            cancel_event: 设置后强制结束脚本。
+
+        Returns:
+            执行结果。
+        """
+        worker = self._acquire()
+        self._replenish_async()
+        try:
+            return self._run_on_worker(worker, job, output_callback, timeout_seconds, cancel_event)
+        finally:
+            with self._lock:
+                self._busy.discard(worker)
+            # 脚本留下的非守护线程会阻止工作进程退出，稍等后强制结束
+            worker.process.join(timeout=1)
+            if worker.is_alive():
+                worker.kill()
+            else:
+                worker.close()
+
+    def close(self) -> None:
+        """强制结束全部工作进程（包括正在执行的脚本），之后不能再执行脚本。"""
+        with self._lock:
+            self._closed = True
+            workers = self._idle + list(self._busy)
+            self._idle.clear()
+        for worker in workers:
+            worker.kill()
+
+    def _run_on_worker(
+        self,
+        worker: _Worker,
+        job: PythonJob,
+        output_callback: Callable[[list[str]], None] | None,
+        timeout_seconds: float | None,
+        cancel_event: threading.Event | None,
+    ) -> PythonRunResult:
+        try:
+            worker.conn.send(job)
+        except (OSError, ValueError):
+            log.error('发送 Python 脚本到工作进程失败', exc_info=True)
+            return PythonRunResult(exit_code=None)
+
+        deadline = None if timeout_seconds is None else time.monotonic() + timeout_seconds
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                worker.kill()
+                return PythonRunResult(exit_code=None, cancelled=True)
+            poll_seconds = 0.2
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    worker.kill()
+                    return PythonRunResult(exit_code=None, timed_out=True)
+                poll_seconds = min(poll_seconds, remaining)
+
+            try:
+                if not worker.conn.poll(poll_seconds):
+                    continue
+                # 一次取出管道中积压的全部输出，合并为一次回调
+                lines: list[str] = []
+                exit_code: int | None = None
+                exited = False
+                while not exited and worker.conn.poll(0):
+                    msg_type, payload = worker.conn.recv()
+                    if msg_type == _MSG_OUTPUT:
+                        lines.extend(payload)
+                    elif msg_type == _MSG_EXIT:
+                        exit_code = payload
+                        exited = True
+            except (EOFError, OSError):
+                # 工作进程在发送退出码前结束，例如脚本调用了 os._exit
+                worker.process.join(timeout=3)
+                return PythonRunResult(exit_code=worker.process.exitcode)
+
+            if lines and output_callback is not None:
+                try:
+                    output_callback(lines)
+                except Exception:
+                    log.error('Python 脚本输出回调异常', exc_info=True)
+            if exited:
+                return PythonRunResult(exit_code=exit_code)
+
+    def _acquire(self) -> _Worker:
+        """取出一个空闲工作进程，没有时立即启动一个。"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Python 工作进程池已关闭')
+            while self._idle:
+                worker = self._idle.pop(0)
+                if worker.is_alive():
+                    self._busy.add(worker)
+                    return worker
+                worker.close()
+        worker = self._spawn()
+        with self._lock:
+            self._busy.add(worker)
+        return worker
+
+    def _replenish_async(self) -> None:
+        with self._lock:
+            if self._closed or self._replenishing:
+                return
+            self._replenishing = True
+        threading.Thread(target=self._replenish, name='python_worker_pool', daemon=True).start()
+
+    def _replenish(self) -> None:
+        """补充空闲工作进程到 size 个，同一时间只有一个补充线程。"""
+        try:
+            self._replenish_until_full()
+        finally:
+            with self._lock:
+                self._replenishing = False
+
+    def _replenish_until_full(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) >= self.size:
+                    return
+            try:
+                worker = self._spawn()
+            except Exception:
+                log.error('启动 Python 工作进程失败', exc_info=True)
+                return
+            with self._lock:
+                if self._closed:
+                    closed = True
+                else:
+                    closed = False
+                    self._idle.append(worker)
+            if closed:
+                worker.kill()
+                return
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._mp_context.Pipe()
+        process = self._mp_context.Process(
+            target=_worker_main,
+            args=(child_conn, self.preload_modules),
+            name='python_worker',
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        if sys.platform == 'win32':
+            # sentinel 即进程句柄，加入 Job Object 后 runner 被强制结束时工作进程也会结束
+            ProcessManager.add_to_job(process.sentinel)
+        return _Worker(process, parent_conn)
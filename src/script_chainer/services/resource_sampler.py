@@ -0,0 +1,375 @@
+"""
+脚本资源占用采样
+
+按固定间隔采样 ProcessManager 追踪的进程树（启动器、目标进程及其所有后代）的
+CPU、内存、IO 和线程数，每个进程每次采样写入一条定长二进制记录。
+设置了资源上限时，每次采样后检查进程树合计的内存、句柄数和线程数，连续超出时回调通知。
+
+文件格式:
+    文件头: 魔数 b'SCRS' + 版本号 (uint16)
+    记录: 时间戳 (double) | PID (uint32) | 角色 (uint8) | CPU% (float32)
+          | RSS 字节 (uint64) | 累计读字节 (uint64) | 累计写字节 (uint64) | 线程数 (uint16)
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, suppress
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import BinaryIO
+
+import psutil
+
+from one_dragon.utils.log_utils import log
+from script_chainer.services.process_manager import ProcessManager
+from script_chainer.services.process_table import get_process_table
+
+TELEMETRY_MAGIC = b'SCRS'
+TELEMETRY_VERSION = 1
+_HEADER = struct.Struct('<4sH')
+_RECORD = struct.Struct('<dIBfQQQH')
+
+# 连续超出上限的采样次数达到该值才判定为超限，避免瞬时峰值误判
+LIMIT_BREACH_SAMPLES = 2
+# 未启用采样只设置了资源上限时的检查间隔（秒）
+LIMIT_CHECK_INTERVAL_SECONDS = 5
+
+
+class ProcessRole:
+    LAUNCHER = 0
+    TARGET = 1
+    CHILD = 2
+
+
+@dataclass
+class ResourceSample:
+    """一个进程的一次采样。"""
+
+    timestamp: float
+    pid: int
+    role: int
+    cpu_percent: float
+    rss_bytes: int
+    read_bytes: int
+    write_bytes: int
+    num_threads: int
+    # 句柄数（Windows）或文件描述符数，只在设置了句柄上限时采样，不写入采样文件
+    num_handles: int = 0
+
+
+@dataclass
+class ResourceLimits:
+    """进程树资源上限，按进程树合计计算，0 表示不限制。"""
+
+    max_rss_mb: int = 0
+    max_handles: int = 0
+    max_threads: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rss_mb > 0 or self.max_handles > 0 or self.max_threads > 0
+
+    def check(self, samples: list[ResourceSample]) -> str | None:
+        """检查一次采样是否超出上限。
+
+        Returns:
+            超出的项目说明，未超出时返回 None。
+        """
+        rss_mb = sum(i.rss_bytes for i in samples) / 1024 / 1024
+        if 0 < self.max_rss_mb < rss_mb:
+            return f'内存 {rss_mb:.0f}MB 超过上限 {self.max_rss_mb}MB'
+        handles = sum(i.num_handles for i in samples)
+        if 0 < self.max_handles < handles:
+            return f'句柄数 {handles} 超过上限 {self.max_handles}'
+        threads = sum(i.num_threads for i in samples)
+        if 0 < self.max_threads < threads:
+            return f'线程数 {threads} 超过上限 {self.max_threads}'
+        return None
+
+
+@dataclass
+class ResourceSummary:
+    """一次运行的资源占用汇总，CPU 和内存为进程树每次采样的合计。"""
+
+    sample_count: int = 0
+    avg_cpu_percent: float = 0
+    peak_cpu_percent: float = 0
+    avg_rss_mb: float = 0
+    peak_rss_mb: float = 0
+    peak_threads: int = 0
+    read_mb: float = 0
+    write_mb: float = 0
+
+    @property
+    def summary_text(self) -> str:
+        return (
+            f'CPU 平均 {self.avg_cpu_percent:.0f}% 峰值 {self.peak_cpu_percent:.0f}%'
+            f' 内存 平均 {self.avg_rss_mb:.0f}MB 峰值 {self.peak_rss_mb:.0f}MB'
+            f' 线程峰值 {self.peak_threads}'
+            f' IO 读 {self.read_mb:.0f}MB 写 {self.write_mb:.0f}MB'
+        )
+
+
+def get_tracked_pids(pm: ProcessManager, max_age: float | None = None) -> dict[int, int]:
+    """获取 ProcessManager 追踪的进程树（启动器、目标进程及其所有后代）的 PID 及其角色。
+
+    Args:
+        pm: 进程管理器。
+        max_age: 进程表快照的最大允许年龄（秒），用于查找后代进程。
+
+    Returns:
+        PID 到 ProcessRole 的映射。
+    """
+    roles: dict[int, int] = {}
+    launcher = pm.process
+    if launcher is not None and launcher.poll() is None:
+        roles[launcher.pid] = ProcessRole.LAUNCHER
+    target = pm.target_process
+    if target is not None:
+        roles[target.pid] = ProcessRole.TARGET
+
+    table = get_process_table()
+    for root_pid in list(roles):
+        for pid in table.get_children(root_pid, recursive=True, max_age=max_age):
+            roles.setdefault(pid, ProcessRole.CHILD)
+    return roles
+
+
+class ProcessTreeSampler:
+    """采样一组进程的资源占用。
+
+    psutil.Process 对象按 PID 缓存复用，cpu_percent 才能得到两次采样之间的 CPU 占用。
+    进程第一次被采样时 CPU 占用没有基准，固定为 0。
+    """
+
+    def __init__(self) -> None:
+        self._procs: dict[int, psutil.Process] = {}
+
+    def sample(self, roles: dict[int, int], with_handles: bool = False) -> tuple[list[ResourceSample], list[int]]:
+        """采样一次。不在 roles 中的进程不再缓存。
+
+        Args:
+            roles: 需要采样的 PID 到 ProcessRole 的映射。
+            with_handles: 是否采样句柄数（Windows）或文件描述符数。
+
+        Returns:
+            samples: 成功采样的进程。
+            new_pids: 本次第一次采样的进程，CPU 占用从下一次采样开始有效。
+        """
+        for pid in list(self._procs):
+            if pid not in roles:
+                del self._procs[pid]
+
+        now = time.time()
+        samples: list[ResourceSample] = []
+        new_pids: list[int] = []
+        for pid, role in roles.items():
+            proc = self._procs.get(pid)
+            if proc is None:
+                with suppress(psutil.NoSuchProcess, psutil.AccessDenied):
+                    proc = psutil.Process(pid)
+                    self._procs[pid] = proc
+                if proc is None:
+                    continue
+                new_pids.append(pid)
+            try:
+                with proc.oneshot():
+                    cpu_percent = proc.cpu_percent(interval=None)
+                    rss = proc.memory_info().rss
+                    num_threads = proc.num_threads()
+                    read_bytes, write_bytes = 0, 0
+                    with suppress(psutil.AccessDenied, AttributeError):
+                        io = proc.io_counters()
+                        read_bytes, write_bytes = io.read_bytes, io.write_bytes
+                    num_handles = 0
+                    if with_handles:
+                        with suppress(psutil.AccessDenied):
+                            num_handles = proc.num_handles() if sys.platform == 'win32' else proc.num_fds()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                self._procs.pop(pid, None)
+                continue
+            samples.append(ResourceSample(
+                timestamp=now,
+                pid=pid,
+                role=role,
+                cpu_percent=cpu_percent,
+                rss_bytes=rss,
+                read_bytes=read_bytes,
+                write_bytes=write_bytes,
+                num_threads=min(num_threads, 0xFFFF),
+                num_handles=num_handles,
+            ))
+        return samples, new_pids
+
+
+class ResourceSampler:
+    """在后台线程中采样一个 ProcessManager 追踪的进程树。"""
+
+    def __init__(
+        self,
+        pm: ProcessManager,
+        interval: float,
+        output_path: str | None = None,
+        limits: ResourceLimits | None = None,
+        on_breach: Callable[[str], None] | None = None,
+    ):
+        """
+        Args:
+            pm: 被采样的进程管理器。
+            interval: 采样间隔（秒）。
+            output_path: 二进制采样文件路径，为 None 时只统计汇总不落盘。
+            limits: 资源上限，为 None 时不检查。
+            on_breach: 连续 LIMIT_BREACH_SAMPLES 次采样超出上限时在采样线程中调用一次，参数为超出的项目说明。
+        """
+        self.interval: float = max(interval, 0.1)
+        self._pm = pm
+        self._limits: ResourceLimits | None = limits if limits is not None and limits.enabled else None
+        self._on_breach = on_breach
+        self._breach_count: int = 0
+        self.breach: str | None = None
+        self._output_path: Path | None = Path(output_path) if output_path else None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._tree_sampler = ProcessTreeSampler()
+
+        # 汇总统计，采样线程累加、其他线程读取汇总时都需持有 _lock
+        self._lock = threading.Lock()
+        self._tick_count = 0
+        self._cpu_sum = 0.0
+        self._rss_sum = 0
+        self._summary = ResourceSummary()
+        self._first_io: dict[int, tuple[int, int]] = {}
+        self._last_io: dict[int, tuple[int, int]] = {}
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='resource_sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> ResourceSummary:
+        """停止采样并返回汇总。"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval + 2)
+        return self.get_summary()
+
+    def get_summary(self) -> ResourceSummary:
+        """获取当前汇总。
+
+        stop 等待采样线程超时后采样线程可能仍在累加，返回的是加锁时的快照。
+        """
+        with self._lock:
+            summary = replace(self._summary)
+            tick_count = self._tick_count
+            cpu_sum = self._cpu_sum
+            rss_sum = self._rss_sum
+            read_bytes = sum(self._last_io[pid][0] - first[0] for pid, first in self._first_io.items())
+            write_bytes = sum(self._last_io[pid][1] - first[1] for pid, first in self._first_io.items())
+        summary.sample_count = tick_count
+        if tick_count > 0:
+            summary.avg_cpu_percent = cpu_sum / tick_count
+            summary.avg_rss_mb = rss_sum / tick_count / 1024 / 1024
+        summary.read_mb = read_bytes / 1024 / 1024
+        summary.write_mb = write_bytes / 1024 / 1024
+        return summary
+
+    def _run(self) -> None:
+        with ExitStack() as stack:
+            file: BinaryIO | None = None
+            if self._output_path is not None:
+                try:
+                    self._output_path.parent.mkdir(parents=True, exist_ok=True)
+                    file = stack.enter_context(open(self._output_path, 'wb'))
+                    file.write(_HEADER.pack(TELEMETRY_MAGIC, TELEMETRY_VERSION))
+                except OSError:
+                    log.error('创建资源采样文件失败 %s', self._output_path, exc_info=True)
+                    file = None
+
+            # 首次采样只为 cpu_percent 建立基准，不计入统计
+            self._check_limits(self._sample_once())
+            while not self._stop_event.wait(self.interval):
+                samples = self._sample_once()
+                if not samples:
+                    continue
+                self._accumulate(samples)
+                self._check_limits(samples)
+                if file is not None:
+                    file.write(b''.join(
+                        _RECORD.pack(
+                            i.timestamp, i.pid, i.role, i.cpu_percent,
+                            i.rss_bytes, i.read_bytes, i.write_bytes, i.num_threads,
+                        )
+                        for i in samples
+                    ))
+                    file.flush()
+
+    def _sample_once(self) -> list[ResourceSample]:
+        with_handles = self._limits is not None and self._limits.max_handles > 0
+        samples, _ = self._tree_sampler.sample(
+            get_tracked_pids(self._pm, max_age=self.interval / 2),
+            with_handles=with_handles,
+        )
+        return samples
+
+    def _check_limits(self, samples: list[ResourceSample]) -> None:
+        if self._limits is None or self.breach is not None or not samples:
+            return
+        breach = self._limits.check(samples)
+        self._breach_count = self._breach_count + 1 if breach is not None else 0
+        if self._breach_count < LIMIT_BREACH_SAMPLES:
+            return
+        self.breach = breach
+        if self._on_breach is not None:
+            try:
+                self._on_breach(breach)
+            except Exception:
+                log.error('资源超限回调异常', exc_info=True)
+
+    def _accumulate(self, samples: list[ResourceSample]) -> None:
+        cpu = sum(i.cpu_percent for i in samples)
+        rss = sum(i.rss_bytes for i in samples)
+        threads = sum(i.num_threads for i in samples)
+        with self._lock:
+            self._tick_count += 1
+            self._cpu_sum += cpu
+            self._rss_sum += rss
+            self._summary.peak_cpu_percent = max(self._summary.peak_cpu_percent, cpu)
+            self._summary.peak_rss_mb = max(self._summary.peak_rss_mb, rss / 1024 / 1024)
+            self._summary.peak_threads = max(self._summary.peak_threads, threads)
+            for i in samples:
+                self._first_io.setdefault(i.pid, (i.read_bytes, i.write_bytes))
+                self._last_io[i.pid] = (i.read_bytes, i.write_bytes)
+
+
+def read_samples(file_path: str) -> Iterator[ResourceSample]:
+    """读取采样文件。
+
+    Raises:
+        ValueError: 文件格式不正确时抛出。
+    """
+    with open(file_path, 'rb') as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f'采样文件不完整 {file_path}')
+        magic, version = _HEADER.unpack(header)
+        if magic != TELEMETRY_MAGIC or version != TELEMETRY_VERSION:
+            raise ValueError(f'不支持的采样文件 {file_path}')
+        while True:
+            data = f.read(_RECORD.size)
+            if len(data) < _RECORD.size:
+                # 进程被强制结束时最后一条记录可能不完整
+                return
+            yield ResourceSample(*_RECORD.unpack(data))
+
+
+def clear_outdated_files(telemetry_dir: str, keep_days: int = 7) -> None:
+    """删除超过 keep_days 天的采样文件。"""
+    deadline = time.time() - keep_days * 24 * 3600
+    for file_path in Path(telemetry_dir).glob('*.bin'):
+        with suppress(OSError):
+            if file_path.stat().st_mtime < deadline:
+                file_path.unlink()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RetryPolicy:
+    """脚本失败重试策略。
+
+    按失败类型分别限制最大重试次数，重试前按指数退避等待:
+    第 n 次重试等待 backoff_seconds * 2^(n-1) 秒，不超过 backoff_max_seconds，
+    再乘以 [1 - jitter_ratio, 1 + jitter_ratio] 内的随机系数，避免多个脚本同时重试。
+    """
+
+    # 失败类型到最大重试次数的映射，未列出的失败类型不重试
+    max_retries: dict[str, int] = field(default_factory=dict)
+    backoff_seconds: float = 0
+    backoff_max_seconds: float = 300
+    jitter_ratio: float = 0.2
+    # 重试前是否关闭游戏
+    kill_game: bool = False
+
+    def get_max_retries(self, failure_class: str) -> int:
+        return max(0, self.max_retries.get(failure_class, 0))
+
+    def should_retry(self, failure_class: str, retry_count: int) -> bool:
+        """是否应该重试。
+
+        Args:
+            failure_class: 本次失败的类型。
+            retry_count: 该失败类型已经重试的次数。
+        """
+        return retry_count < self.get_max_retries(failure_class)
+
+    def get_backoff_seconds(self, retry_count: int, rng: random.Random | None = None) -> float:
+        """获取第 retry_count 次重试前需要等待的秒数。
+
+        Args:
+            retry_count: 即将进行的是第几次重试，从 1 开始，不区分失败类型。
+            rng: 随机数生成器，默认使用 random 模块。
+        """
+        if self.backoff_seconds <= 0 or retry_count <= 0:
+            return 0
+        # 限制指数避免溢出，结果本来就会被 backoff_max_seconds 截断
+        delay = min(self.backoff_seconds * 2 ** min(retry_count - 1, 30), self.backoff_max_seconds)
+        jitter = (rng or random).uniform(-self.jitter_ratio, self.jitter_ratio)
+        return max(0.0, delay * (1 + jitter))
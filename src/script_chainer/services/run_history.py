@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from one_dragon.utils.log_utils import log
+from script_chainer.services.output_cadence import GapHistogram
+
+
+class ScriptOutcome:
+    SUCCESS = 'success'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+
+# 学习超时: 至少需要的成功样本数，以及在 p99 基础上增加的余量
+LEARNED_TIMEOUT_MIN_SAMPLES = 5
+LEARNED_TIMEOUT_MARGIN_RATIO = 0.25
+LEARNED_TIMEOUT_MIN_MARGIN_SECONDS = 300
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """计算分位数（线性插值）。
+
+    Args:
+        sorted_values: 已升序排序的非空数值列表。
+        q: 分位，取值 0~100。
+    """
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    pos = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+@dataclass
+class DurationStats:
+    """脚本成功运行耗时的统计（秒）。"""
+
+    count: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+
+    @classmethod
+    def from_durations(cls, durations: list[float]) -> DurationStats | None:
+        if len(durations) == 0:
+            return None
+        values = sorted(durations)
+        return cls(
+            count=len(values),
+            mean=sum(values) / len(values),
+            p50=percentile(values, 50),
+            p90=percentile(values, 90),
+            p99=percentile(values, 99),
+        )
+
+
+class RunHistory:
+    """脚本运行历史，保存在本地 SQLite 数据库中。
+
+    每次运行脚本记录一行: 开始时间、最后一次尝试的开始时间、结束时间、结果和重试次数。
+    运行耗时统计只使用成功的记录，用于预估脚本链耗时和按历史耗时推算超时时间。
+    另外按脚本保存输出间隔的直方图，用于推算无日志超时时间。
+    """
+
+    def __init__(self, db_path: str, keep_days: int = 90, sample_limit: int = 50):
+        """
+        Args:
+            db_path: 数据库文件路径。
+            keep_days: 保留最近多少天的记录，更早的记录在创建时清理。
+            sample_limit: 统计时每个脚本最多使用最近多少条成功记录。
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.sample_limit: int = sample_limit
+        self._lock = threading.Lock()
+        # 并行调度时多个线程共用一个连接，由 _lock 保证串行访问
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS script_run ('
+                ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+                ' chain_name TEXT NOT NULL,'
+                ' run_key TEXT NOT NULL,'
+                ' start_time REAL NOT NULL,'
+                ' attempt_start_time REAL NOT NULL,'
+                ' end_time REAL NOT NULL,'
+                ' outcome TEXT NOT NULL,'
+                ' retries INTEGER NOT NULL DEFAULT 0'
+                ')'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_script_run_key ON script_run (run_key, outcome, end_time)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS output_gap ('
+                ' run_key TEXT PRIMARY KEY,'
+                ' counts TEXT NOT NULL,'
+                ' update_time REAL NOT NULL'
+                ')'
+            )
+            self._conn.execute(
+                'DELETE FROM script_run WHERE end_time < ?',
+                (time.time() - keep_days * 24 * 3600,),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def record(
+        self,
+        chain_name: str,
+        run_key: str,
+        start_time: float,
+        end_time: float,
+        outcome: str,
+        retries: int = 0,
+        attempt_start_time: float | None = None,
+    ) -> None:
+        """记录一次脚本运行。写入失败只记录日志，不影响脚本链运行。
+
+        Args:
+            chain_name: 脚本链名称。
+            run_key: 脚本运行标识，见 ScriptConfig.run_key。
+            start_time: 开始时间戳。
+            end_time: 结束时间戳。
+            outcome: 运行结果，见 ScriptOutcome。
+            retries: 重试次数。
+            attempt_start_time: 最后一次尝试的开始时间戳，默认与 start_time 相同。
+        """
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    'INSERT INTO script_run'
+                    ' (chain_name, run_key, start_time, attempt_start_time, end_time, outcome, retries)'
+                    ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (
+                        chain_name, run_key, start_time,
+                        attempt_start_time if attempt_start_time is not None else start_time,
+                        end_time, outcome, retries,
+                    ),
+                )
+        except sqlite3.Error:
+            log.error('写入运行历史失败 %s', run_key, exc_info=True)
+
+    def get_duration_stats(self, run_key: str, per_attempt: bool = False) -> DurationStats | None:
+        """获取脚本最近成功运行的耗时统计。
+
+        Args:
+            run_key: 脚本运行标识。
+            per_attempt: 为 True 时统计最后一次尝试的耗时（用于推算超时），否则统计包含重试的总耗时。
+
+        Returns:
+            耗时统计，没有成功记录时返回 None。
+        """
+        start_column = 'attempt_start_time' if per_attempt else 'start_time'
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    f'SELECT end_time - {start_column} FROM script_run'
+                    ' WHERE run_key = ? AND outcome = ?'
+                    ' ORDER BY end_time DESC LIMIT ?',
+                    (run_key, ScriptOutcome.SUCCESS, self.sample_limit),
+                ).fetchall()
+        except sqlite3.Error:
+            log.error('读取运行历史失败 %s', run_key, exc_info=True)
+            return None
+        return DurationStats.from_durations([max(0.0, i[0]) for i in rows])
+
+    def get_learned_timeout(self, run_key: str, max_timeout_seconds: int) -> int | None:
+        """按历史耗时推算超时时间: p99 加上余量，且不超过配置的超时时间。
+
+        Args:
+            run_key: 脚本运行标识。
+            max_timeout_seconds: 配置的超时时间，作为上限。
+
+        Returns:
+            推算的超时时间（秒），成功样本不足 LEARNED_TIMEOUT_MIN_SAMPLES 时返回 None。
+        """
+        stats = self.get_duration_stats(run_key, per_attempt=True)
+        if stats is None or stats.count < LEARNED_TIMEOUT_MIN_SAMPLES:
+            return None
+        margin = max(stats.p99 * LEARNED_TIMEOUT_MARGIN_RATIO, LEARNED_TIMEOUT_MIN_MARGIN_SECONDS)
+        return min(max_timeout_seconds, math.ceil(stats.p99 + margin))
+
+    def get_gap_histogram(self, run_key: str) -> GapHistogram:
+        """获取脚本的输出间隔直方图，没有记录或读取失败时返回空直方图。"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT counts FROM output_gap WHERE run_key = ?', (run_key,)
+                ).fetchone()
+        except sqlite3.Error:
+            log.error('读取输出间隔失败 %s', run_key, exc_info=True)
+            return GapHistogram()
+        return GapHistogram.from_json(row[0]) if row is not None else GapHistogram()
+
+    def merge_gap_histogram(self, run_key: str, histogram: GapHistogram) -> None:
+        """将一次运行的输出间隔合并到脚本的直方图中。写入失败只记录日志。"""
+        if histogram.total == 0:
+            return
+        merged = self.get_gap_histogram(run_key)
+        merged.merge(histogram)
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO output_gap (run_key, counts, update_time) VALUES (?, ?, ?)',
+                    (run_key, merged.to_json(), time.time()),
+                )
+        except sqlite3.Error:
+            log.error('写入输出间隔失败 %s', run_key, exc_info=True)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import threading
+import uuid
+from collections.abc import Iterator
+from contextlib import suppress
+from pathlib import Path
+
+from one_dragon.utils import os_utils
+from one_dragon.utils.log_utils import log
+
+
+class JournalEvent:
+    RUN_START = 'run_start'
+    RUN_FINISH = 'run_finish'
+    GROUP_START = 'group_start'
+    GROUP_FINISH = 'group_finish'
+
+
+class GroupOutcome:
+    SUCCESS = 'success'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+
+class RunJournal:
+    """脚本链运行日志。
+
+    每天一个 JSON Lines 文件，只追加写入，每条记录写入后立即 fsync，
+    runner 进程被强制结束（重启、关闭控制台、OOM）时已完成的记录不会丢失。
+    用于在中断后恢复运行时跳过被中断的那次运行中已成功完成的运行组。
+    """
+
+    def __init__(self, journal_dir: str, keep_days: int = 7):
+        """
+        Args:
+            journal_dir: 日志文件目录。
+            keep_days: 保留最近多少天的日志文件，更早的文件在创建时清理。
+        """
+        self._journal_dir: Path = Path(journal_dir)
+        self._journal_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._remove_outdated(keep_days)
+
+    @staticmethod
+    def new_run_id() -> str:
+        """生成一次运行的唯一标识。"""
+        return f'{datetime.datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:6]}'
+
+    def get_file_path(self, dt: str | None = None) -> Path:
+        """获取指定日期的日志文件路径，默认为今天。"""
+        return self._journal_dir / f'journal_{dt or os_utils.get_dt()}.jsonl'
+
+    def record(
+        self,
+        run_id: str,
+        chain_name: str,
+        event: str,
+        group_key: str | None = None,
+        outcome: str | None = None,
+    ) -> None:
+        """追加一条记录并落盘。写入失败只记录日志，不影响脚本链运行。"""
+        item = {
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'run_id': run_id,
+            'chain': chain_name,
+            'event': event,
+        }
+        if group_key is not None:
+            item['group'] = group_key
+        if outcome is not None:
+            item['outcome'] = outcome
+        line = json.dumps(item, ensure_ascii=False) + '\n'
+
+        with self._lock:
+            try:
+                with open(self.get_file_path(), 'a', encoding='utf-8') as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError:
+                log.error('写入运行日志失败', exc_info=True)
+
+    def find_interrupted_run(self, chain_name: str) -> str | None:
+        """获取脚本链最近一次运行的标识，该次运行已正常结束时返回 None。
+
+        在所有保留的日志文件中查找，不受日期限制，跨过零点的运行也可以恢复。
+        没有结束记录（进程被强制结束）或结束记录为取消的运行视为被中断。
+
+        Args:
+            chain_name: 脚本链名称。
+
+        Returns:
+            被中断的运行标识。
+        """
+        run_id: str | None = None
+        finish_outcome: str | None = None
+        for item in self._iter_items():
+            if item.get('chain') != chain_name:
+                continue
+            event = item.get('event')
+            if event == JournalEvent.RUN_START:
+                run_id = item.get('run_id')
+                finish_outcome = None
+            elif event == JournalEvent.RUN_FINISH and item.get('run_id') == run_id:
+                finish_outcome = item.get('outcome')
+        if run_id is None or finish_outcome == GroupOutcome.SUCCESS:
+            return None
+        return run_id
+
+    def get_completed_group_keys(self, chain_name: str, run_id: str) -> set[str]:
+        """获取某次运行中已成功完成的运行组。
+
+        恢复运行时沿用被恢复的运行标识，多次中断后恢复的结果会累积。
+
+        Args:
+            chain_name: 脚本链名称。
+            run_id: 运行标识。
+
+        Returns:
+            已成功完成的运行组标识。
+        """
+        completed: set[str] = set()
+        for item in self._iter_items():
+            if (
+                item.get('chain') == chain_name
+                and item.get('run_id') == run_id
+                and item.get('event') == JournalEvent.GROUP_FINISH
+                and item.get('outcome') == GroupOutcome.SUCCESS
+            ):
+                completed.add(item.get('group'))
+        return completed
+
+    def _iter_items(self) -> Iterator[dict]:
+        """按时间顺序读取所有日志文件中的记录。"""
+        for file_path in sorted(self._journal_dir.glob('journal_*.jsonl')):
+            with open(file_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        # 进程在写入过程中被终止时，最后一行可能不完整
+                        continue
+                    if isinstance(item, dict):
+                        yield item
+
+    def _remove_outdated(self, keep_days: int) -> None:
+        today = os_utils.get_dt()
+        for file_path in self._journal_dir.glob('journal_*.jsonl'):
+            dt = file_path.stem[len('journal_'):]
+            with suppress(ValueError, OSError):
+                if os_utils.dt_day_diff(today, dt) >= keep_days:
+                    file_path.unlink()
@@ -0,0 +1,153 @@
+"""
+Python 脚本字节码缓存
+
+脚本链中的 Python 脚本（scripts/ 目录下的和引用的外部文件）编译后的代码对象用 marshal 保存在缓存目录中，
+再次运行时直接加载，不再解析源码。
+
+每个脚本一个缓存文件，文件名为脚本绝对路径的哈希。文件头记录 Python 字节码版本、
+编译时源码的修改时间、大小和内容哈希:
+    - 版本不同: 重新编译。
+    - 修改时间和大小都相同: 直接加载，不读取源码。
+    - 修改时间或大小不同: 读取源码计算内容哈希，相同时只更新文件头（例如文件被重新保存但内容未变），
+      不同时重新编译。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import struct
+import tempfile
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType
+
+from one_dragon.utils.log_utils import log
+
+CACHE_SUFFIX = '.pyc'
+
+# 文件头: 字节码版本(4) 标志(4) 源码修改时间(8, ns) 源码大小(8) 源码 SHA-256(32)
+_HEADER = struct.Struct('<4sIqq32s')
+_FLAG_EMPTY = 1
+
+
+@dataclass
+class ScriptCode:
+    """编译后的 Python 脚本。"""
+
+    code: CodeType
+    # 源码只有空白
+    is_empty: bool = False
+    # 是否从缓存加载（未解析源码）
+    from_cache: bool = False
+
+
+def get_cache_file(cache_dir: str, script_path: str) -> Path:
+    """脚本对应的缓存文件路径。"""
+    key = hashlib.sha1(script_path.encode('utf-8')).hexdigest()
+    return Path(cache_dir) / f'{key}{CACHE_SUFFIX}'
+
+
+def load_script_code(script_path: str, cache_dir: str | None = None) -> ScriptCode:
+    """编译 Python 脚本，优先使用字节码缓存。
+
+    代码对象的文件名为脚本的绝对路径，与直接 compile 源码一致。缓存读写失败不影响编译结果。
+
+    Args:
+        script_path: 脚本路径。
+        cache_dir: 缓存目录，为 None 时不使用缓存。
+
+    Returns:
+        编译后的脚本。
+
+    Raises:
+        OSError: 读取脚本失败。
+        SyntaxError: 脚本有语法错误。
+        ValueError: 脚本包含空字符等无法编译的内容。
+    """
+    abs_path = str(Path(script_path).resolve())
+    stat = os.stat(abs_path)
+    cache_file = get_cache_file(cache_dir, abs_path) if cache_dir is not None else None
+
+    header = None
+    data = b''
+    if cache_file is not None:
+        with suppress(OSError):
+            data = cache_file.read_bytes()
+        header = _read_header(data)
+
+    if header is not None and header[2] == stat.st_mtime_ns and header[3] == stat.st_size:
+        cached = _load_cached(data, header)
+        if cached is not None:
+            return cached
+
+    source = Path(abs_path).read_bytes()
+    source_hash = hashlib.sha256(source).digest()
+    if header is not None and header[4] == source_hash:
+        cached = _load_cached(data, header)
+        if cached is not None:
+            # 内容未变，更新文件头中的修改时间，下次不需要再读取源码
+            _write_cache(cache_file, cached, stat.st_mtime_ns, stat.st_size, source_hash)
+            return cached
+
+    text = source.decode('utf-8-sig')
+    script_code = ScriptCode(code=compile(text, abs_path, 'exec'), is_empty=not text.strip())
+    if cache_file is not None:
+        _write_cache(cache_file, script_code, stat.st_mtime_ns, stat.st_size, source_hash)
+    return script_code
+
+
+def _read_header(data: bytes) -> tuple | None:
+    """解析文件头，版本不同或内容不完整时返回 None。"""
+    if len(data) < _HEADER.size:
+        return None
+    header = _HEADER.unpack_from(data)
+    if header[0] != importlib.util.MAGIC_NUMBER:
+        return None
+    return header
+
+
+def _load_cached(data: bytes, header: tuple) -> ScriptCode | None:
+    try:
+        code = marshal.loads(data[_HEADER.size:])
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(code, CodeType):
+        return None
+    return ScriptCode(code=code, is_empty=bool(header[1] & _FLAG_EMPTY), from_cache=True)
+
+
+def _write_cache(cache_file: Path, script_code: ScriptCode, mtime_ns: int, size: int, source_hash: bytes) -> None:
+    """写入缓存文件。先写临时文件再替换，同时运行的 runner 不会读到写了一半的文件。
+
+    临时文件名由 tempfile 生成，同一进程内多个线程同时编译同一脚本时也不会互相覆盖。
+    """
+    flags = _FLAG_EMPTY if script_code.is_empty else 0
+    header = _HEADER.pack(importlib.util.MAGIC_NUMBER, flags, mtime_ns, size, source_hash)
+    temp_file: Path | None = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=cache_file.parent, prefix=f'{cache_file.name}.', suffix='.tmp', delete=False
+        ) as f:
+            temp_file = Path(f.name)
+            f.write(header + marshal.dumps(script_code.code))
+        os.replace(temp_file, cache_file)
+    except OSError:
+        log.error('写入 Python 脚本字节码缓存失败 %s', cache_file, exc_info=True)
+        if temp_file is not None:
+            with suppress(OSError):
+                temp_file.unlink()
+
+
+def clear_outdated_files(cache_dir: str, keep_days: int = 30) -> None:
+    """删除超过 keep_days 天没有更新的缓存文件。"""
+    deadline = time.time() - keep_days * 24 * 3600
+    for file_path in Path(cache_dir).glob(f'*{CACHE_SUFFIX}'):
+        with suppress(OSError):
+            if file_path.stat().st_mtime < deadline:
+                file_path.unlink()
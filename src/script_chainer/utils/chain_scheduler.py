@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from script_chainer.utils.runtime_group_utils import RuntimeGroup
+
+
+class ResourceLockRegistry:
+    """命名资源锁注册表。
+
+    一个运行组需要同时拿到它声明的所有锁才能开始运行（全有或全无，避免死锁）。
+    可以在多个调度器之间共享，任何锁释放都会唤醒所有等待中的调度器。
+    """
+
+    def __init__(self) -> None:
+        self.condition = threading.Condition()
+        self._held: set[str] = set()
+
+    def try_acquire(self, names: set[str]) -> bool:
+        """尝试获取全部锁，调用方需持有 condition。"""
+        if self._held & names:
+            return False
+        self._held |= names
+        return True
+
+    def acquire(self, names: set[str], cancel_event: threading.Event | None = None) -> bool:
+        """阻塞获取全部锁。
+
+        Returns:
+            是否获取成功，被取消时返回 False。
+        """
+        with self.condition:
+            while not self.try_acquire(names):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                self.condition.wait(timeout=1)
+            return True
+
+    def release(self, names: set[str]) -> None:
+        """释放锁并唤醒等待方。"""
+        with self.condition:
+            self._held -= names
+            self.condition.notify_all()
+
+
+def get_group_locks(group: RuntimeGroup) -> set[str]:
+    """获取运行组需要的资源锁。
+
+    除脚本配置声明的 resource_locks 外，同名游戏进程和同名脚本进程也会隐式加锁，
+    因为运行监控按进程名判断完成状态，同名进程并行会互相干扰。
+    """
+    locks: set[str] = set()
+    for script_config in group.scripts:
+        locks.update(i for i in script_config.resource_locks if i)
+        if script_config.game_process_name:
+            locks.add(f'game:{script_config.game_process_name}')
+        if script_config.script_process_name:
+            locks.add(f'script:{script_config.script_process_name}')
+    return locks
+
+
+def build_group_dependencies(groups: list[RuntimeGroup]) -> tuple[list[set[int]], list[str]]:
+    """根据脚本配置的 after 解析运行组之间的依赖。
+
+    after 中的名称对应其它脚本的显示名称，一个运行组依赖其内所有脚本声明的依赖。
+    依赖本次未参与运行的脚本（已禁用/已跳过）时忽略该依赖。
+
+    Returns:
+        deps: deps[i] 为第 i 个运行组依赖的运行组下标。
+        messages: 需要输出的提示信息。
+
+    Raises:
+        ValueError: 依赖关系存在环时抛出。
+    """
+    name_to_group: dict[str, int] = {}
+    for group_idx, group in enumerate(groups):
+        for script_config in group.scripts:
+            name_to_group.setdefault(script_config.script_display_name, group_idx)
+
+    deps: list[set[int]] = [set() for _ in groups]
+    messages: list[str] = []
+    for group_idx, group in enumerate(groups):
+        for script_config in group.scripts:
+            for name in script_config.after:
+                dep_idx = name_to_group.get(name)
+                if dep_idx is None:
+                    messages.append(f'依赖脚本未参与本次运行 忽略 {script_config.script_display_name} -> {name}')
+                elif dep_idx != group_idx:
+                    deps[group_idx].add(dep_idx)
+
+    _check_acyclic(groups, deps)
+    return deps, messages
+
+
+def _check_acyclic(groups: list[RuntimeGroup], deps: list[set[int]]) -> None:
+    """使用拓扑排序检查依赖是否存在环。"""
+    remaining = [len(i) for i in deps]
+    dependents: list[list[int]] = [[] for _ in groups]
+    for group_idx, group_deps in enumerate(deps):
+        for dep_idx in group_deps:
+            dependents[dep_idx].append(group_idx)
+
+    queue = [i for i, cnt in enumerate(remaining) if cnt == 0]
+    visited = 0
+    while queue:
+        group_idx = queue.pop()
+        visited += 1
+        for dependent in dependents[group_idx]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                queue.append(dependent)
+
+    if visited < len(groups):
+        names = [
+            groups[i].host.script_display_name
+            for i, cnt in enumerate(remaining)
+            if cnt > 0
+        ]
+        raise ValueError(f'脚本依赖存在循环: {", ".join(names)}')
+
+
+class ChainScheduler:
+    """按依赖关系和资源锁并行运行运行组的调度器。
+
+    同一时刻可运行的组按脚本链中的原始顺序优先启动。
+    挂靠（PRE/POST）的 Python 脚本与被挂靠脚本同属一个运行组，仍在组内按顺序执行。
+    依赖的运行组失败时不再运行，视为失败，依赖它的运行组同样跳过。
+    """
+
+    def __init__(
+        self,
+        groups: list[RuntimeGroup],
+        run_group: Callable[[RuntimeGroup], bool],
+        max_parallel: int,
+        cancel_event: threading.Event | None = None,
+        lock_registry: ResourceLockRegistry | None = None,
+        on_skip: Callable[[RuntimeGroup, RuntimeGroup], None] | None = None,
+    ):
+        """
+        Args:
+            groups: 需要运行的运行组。
+            run_group: 运行单个运行组的函数，在工作线程中调用，返回是否成功。抛出异常视为失败。
+            max_parallel: 最大并行运行组数量。
+            cancel_event: 可选的取消事件，被设置后不再启动新的运行组。
+            lock_registry: 资源锁注册表，多个调度器共享时可跨脚本链互斥。
+            on_skip: 运行组因依赖失败被跳过时的回调，参数为被跳过的运行组和失败的依赖。
+
+        Raises:
+            ValueError: 依赖关系存在环时抛出。
+        """
+        self.groups: list[RuntimeGroup] = groups
+        self.max_parallel: int = max(1, max_parallel)
+        self._run_group = run_group
+        self._cancel_event = cancel_event
+        self._locks = lock_registry if lock_registry is not None else ResourceLockRegistry()
+        self._on_skip = on_skip
+        self.deps, self.messages = build_group_dependencies(groups)
+        self._group_locks = [get_group_locks(i) for i in groups]
+        self.failed: set[int] = set()
+
+    def run(self) -> None:
+        """阻塞运行直到所有运行组完成、被跳过或被取消。
+
+        运行结束后 failed 为失败和因依赖失败被跳过的运行组下标。
+        """
+        pending: list[int] = list(range(len(self.groups)))
+        done: set[int] = set()
+        running: set[int] = set()
+        failed = self.failed
+        cond = self._locks.condition
+
+        def _on_done(group_idx: int, future: Future) -> None:
+            success = future.exception() is None and bool(future.result())
+            with cond:
+                running.discard(group_idx)
+                done.add(group_idx)
+                if not success:
+                    failed.add(group_idx)
+                self._locks.release(self._group_locks[group_idx])
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_parallel,
+            thread_name_prefix='script_chain_group',
+        ) as executor, cond:
+            while pending or running:
+                for group_idx in list(pending):
+                    # 运行组结束得足够快时完成回调会在 submit 所在线程直接执行，每启动一个组前都检查取消
+                    if self._cancel_event is not None and self._cancel_event.is_set():
+                        pending.clear()
+                        break
+                    failed_deps = self.deps[group_idx] & failed
+                    if failed_deps:
+                        # 按原始顺序遍历，被跳过的组在同一轮中也能让依赖它的组跳过
+                        pending.remove(group_idx)
+                        failed.add(group_idx)
+                        if self._on_skip is not None:
+                            self._on_skip(self.groups[group_idx], self.groups[min(failed_deps)])
+                        continue
+                    if len(running) >= self.max_parallel:
+                        continue
+                    if not self.deps[group_idx] <= done:
+                        continue
+                    if not self._locks.try_acquire(self._group_locks[group_idx]):
+                        continue
+                    pending.remove(group_idx)
+                    running.add(group_idx)
+                    future = executor.submit(self._run_group, self.groups[group_idx])
+                    future.add_done_callback(lambda f, i=group_idx: _on_done(i, f))
+
+                if pending or running:
+                    cond.wait(timeout=1)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import psutil
+
+from script_chainer.config.script_config import ScriptConfig
+from script_chainer.services.process_manager import is_process_existed
+from script_chainer.utils.wait_utils import wait_with_cancel
+
+
+def get_disk_check_path(script_path: str) -> str:
+    """获取检查剩余空间的路径: 脚本所在的目录，不存在时使用所在的盘符或根目录。"""
+    script_dir = Path(script_path).resolve().parent
+    if script_dir.is_dir():
+        return str(script_dir)
+    return script_dir.anchor or str(Path.cwd().anchor)
+
+
+def get_preflight_reasons(script_config: ScriptConfig, cpu_percent: float | None = None) -> list[str]:
+    """检查一次启动前资源条件。
+
+    Args:
+        script_config: 脚本配置。
+        cpu_percent: 系统 CPU 占用（%），为 None 时不检查 CPU。
+
+    Returns:
+        未满足的条件，全部满足时为空列表。
+    """
+    reasons: list[str] = []
+    if script_config.preflight_min_free_memory_mb > 0:
+        free_mb = psutil.virtual_memory().available // (1024 * 1024)
+        if free_mb < script_config.preflight_min_free_memory_mb:
+            reasons.append(f'可用内存 {free_mb}MB 低于 {script_config.preflight_min_free_memory_mb}MB')
+
+    if script_config.preflight_min_free_disk_mb > 0:
+        disk_path = get_disk_check_path(script_config.script_path)
+        try:
+            free_mb = psutil.disk_usage(disk_path).free // (1024 * 1024)
+        except OSError:
+            reasons.append(f'无法获取磁盘剩余空间 {disk_path}')
+        else:
+            if free_mb < script_config.preflight_min_free_disk_mb:
+                reasons.append(
+                    f'磁盘剩余空间 {free_mb}MB 低于 {script_config.preflight_min_free_disk_mb}MB {disk_path}'
+                )
+
+    if cpu_percent is not None and 0 < script_config.preflight_max_cpu_percent < cpu_percent:
+        reasons.append(f'CPU 占用 {cpu_percent:.0f}% 高于 {script_config.preflight_max_cpu_percent}%')
+
+    alive = [i for i in script_config.preflight_blocking_processes if is_process_existed(i)]
+    if alive:
+        reasons.append(f'进程仍在运行 {", ".join(alive)}')
+    return reasons
+
+
+def wait_preflight(
+    script_config: ScriptConfig,
+    stop_event: threading.Event,
+    on_status: Callable[[str], None] | None = None,
+    sample_interval: float = 1,
+) -> list[str]:
+    """启动脚本前等待资源条件满足。
+
+    每个采样周期检查一次，全部满足即返回；超过 preflight_max_wait_seconds 仍未满足时返回未满足的条件。
+
+    Args:
+        script_config: 脚本配置。
+        stop_event: 退出事件，被设置后立即返回。
+        on_status: 未满足的条件变化时的回调。
+        sample_interval: 采样间隔（秒）。
+
+    Returns:
+        等待结束时未满足的条件，全部满足或被取消时为空列表。
+    """
+    check_cpu = script_config.preflight_max_cpu_percent > 0
+    if check_cpu:
+        # 首次调用只建立基准，第一次检查前需要等待一个采样周期
+        psutil.cpu_percent(interval=None)
+        if wait_with_cancel(stop_event, sample_interval):
+            return []
+
+    deadline = time.monotonic() + script_config.preflight_max_wait_seconds
+    last_reasons: list[str] = []
+    while True:
+        cpu_percent = psutil.cpu_percent(interval=None) if check_cpu else None
+        reasons = get_preflight_reasons(script_config, cpu_percent)
+        if not reasons or time.monotonic() >= deadline:
+            return reasons
+
+        # 数值会随时间变化，只比较原因类别，避免刷屏
+        reason_keys = [i.split(' ')[0] for i in reasons]
+        if on_status is not None and reason_keys != last_reasons:
+            on_status(f'等待启动条件 {"; ".join(reasons)}')
+        last_reasons = reason_keys
+
+        if wait_with_cancel(stop_event, sample_interval):
+            return []
@@ -24,6 +24,32 @@ def graceful_kill_psutil(proc: psutil.Process, timeout: float = 3) -> None:
                     proc.wait(timeout=timeout)
 
 
+def request_close(proc: psutil.Process) -> bool:
+    """请求进程自行退出，不等待。
+
+    Windows 下 terminate 会直接结束进程，改为使用不带 /F 的 taskkill 向进程的窗口发送关闭消息；
+    其它系统发送 SIGTERM。
+
+    Returns:
+        关闭请求是否已送达。Windows 下进程没有窗口时无法送达。
+    """
+    if sys.platform != 'win32':
+        with suppress(psutil.NoSuchProcess, psutil.AccessDenied):
+            proc.terminate()
+            return True
+        return False
+    try:
+        result = subprocess.run(
+            ['taskkill', '/PID', str(proc.pid)],
+            capture_output=True,
+            timeout=5,
+            creationflags=subprocess.CREATE_NO_WINDOW,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
 def graceful_kill_popen(proc: subprocess.Popen, timeout: float = 3) -> None:
     """优雅终止一个 subprocess.Popen: terminate -> wait -> kill。"""
     with suppress(ProcessLookupError, OSError):
@@ -3,6 +3,9 @@ from __future__ import annotations
 import os
 import sys
 
+from script_chainer.services.daemon_ipc import DaemonClient, DaemonUnavailableError
+from script_chainer.win_exe.runner_logging import get_runner_daemon_info_file
+
 
 def build_runner_command(chain_name: str, script_index: int | None = None) -> tuple[list[str], str | None]:
     """构造 runner 启动命令。
@@ -29,3 +32,27 @@ def build_runner_command(chain_name: str, script_index: int | None = None) -> tu
         return command, os.path.dirname(sys.executable) or None
 
     raise RuntimeError('源码模式下不支持运行脚本链，请使用打包后的程序。')
+
+
+def start_chain_in_daemon(
+    chain_name: str,
+    debug_index: int | None = None,
+    resume: bool = False,
+) -> bool:
+    """尝试交给守护进程运行脚本链。
+
+    Returns:
+        是否已由守护进程开始运行，守护进程未运行时返回 False。
+
+    Raises:
+        RuntimeError: 守护进程拒绝运行（如已有脚本链在运行）时抛出。
+    """
+    try:
+        response = DaemonClient(get_runner_daemon_info_file()).request(
+            'start', chain=chain_name, debug_index=debug_index, resume=resume,
+        )
+    except DaemonUnavailableError:
+        return False
+    if not response.get('ok'):
+        raise RuntimeError(response.get('error') or '守护进程拒绝运行')
+    return True
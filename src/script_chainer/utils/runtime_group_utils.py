@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
 
-from script_chainer.config.script_config import ScriptConfig
+from script_chainer.config.script_config import (
+    CheckDoneMethods,
+    ScriptConfig,
+    ScriptType,
+)
 
 
 @dataclass
@@ -11,6 +16,10 @@ class RuntimeGroup:
 
     host: ScriptConfig
     scripts: list[ScriptConfig]
+    # 运行组标识，用于运行日志记录与恢复
+    key: str = ''
+    # 伴随脚本，在被挂靠脚本运行期间同时运行，不在 scripts 中
+    sidecars: list[ScriptConfig] = field(default_factory=list)
 
 
 @dataclass
@@ -64,9 +73,18 @@ def build_runtime_selection(
 
 def resolve_runtime_groups(
     selection: RuntimeSelection,
+    is_done_today: Callable[[ScriptConfig], bool] | None = None,
 ) -> tuple[list[RuntimeGroup], list[str]]:
     """根据本次运行选择结果，解析实际运行组并生成跳过提示。
 
+    Args:
+        selection: 本次运行选择结果。
+        is_done_today: 可选的判断函数，对配置了每个游戏日只运行一次的脚本调用，
+            返回 True 时跳过该脚本；被挂靠脚本被跳过时，挂靠在其上的脚本一并跳过。
+
+    伴随脚本放入被挂靠脚本所在运行组的 sidecars；被挂靠脚本不在本次运行中时（例如单独调试伴随脚本），
+    伴随脚本作为普通脚本运行。
+
     Returns:
         groups: 按实际运行顺序分好的运行组。
         skipped_messages: 需要输出的跳过提示。
@@ -82,11 +100,70 @@ def resolve_runtime_groups(
         if attach_target is not None and not selection.is_enabled(attach_target):
             skipped_messages.append(f'被挂靠脚本已禁用 跳过 {script_config.script_display_name}')
             continue
+        if is_done_today is not None:
+            if script_config.once_per_day and is_done_today(script_config):
+                skipped_messages.append(f'本游戏日已完成 跳过 {script_config.script_display_name}')
+                continue
+            if attach_target is not None and attach_target.once_per_day and is_done_today(attach_target):
+                skipped_messages.append(f'被挂靠脚本本游戏日已完成 跳过 {script_config.script_display_name}')
+                continue
 
         host = attach_target if attach_target is not None else script_config
-        if groups and groups[-1].host is host:
+        if script_config.is_sidecar and groups and groups[-1].host is host:
+            groups[-1].sidecars.append(script_config)
+        elif groups and groups[-1].host is host:
             groups[-1].scripts.append(script_config)
         else:
             groups.append(RuntimeGroup(host=host, scripts=[script_config]))
 
+    for group, key in zip(groups, get_group_keys(groups), strict=True):
+        group.key = key
     return groups, skipped_messages
+
+
+def get_group_keys(groups: list[RuntimeGroup]) -> list[str]:
+    """生成运行组标识，用于运行日志记录与恢复。
+
+    以被挂靠脚本的运行标识为基础，同一脚本在脚本链中出现多次时追加出现序号区分。
+    """
+    occurrences: dict[str, int] = {}
+    keys: list[str] = []
+    for group in groups:
+        run_key = group.host.run_key
+        occurrences[run_key] = occurrences.get(run_key, 0) + 1
+        keys.append(f'{run_key}#{occurrences[run_key]}')
+    return keys
+
+
+def get_group_game_name(group: RuntimeGroup) -> str:
+    """获取运行组中外部脚本使用的游戏进程名称，没有时返回空字符串。"""
+    for script_config in group.scripts:
+        if script_config.script_type == ScriptType.EXTERNAL and script_config.game_process_name:
+            return script_config.game_process_name
+    return ''
+
+
+def get_warm_game_names(groups: list[RuntimeGroup]) -> list[str]:
+    """按顺序运行时，计算每个运行组结束后可以保留（不关闭）的游戏进程。
+
+    相邻运行组使用同一游戏进程时，前一个运行组结束后不关闭游戏，留给下一个运行组继续使用，
+    最后一个运行组按自身配置决定是否关闭。以下情况不保留:
+        - 前一个运行组本来就不关闭游戏。
+        - 前一个运行组以游戏被关闭作为完成条件，此时游戏已经退出。
+
+    Returns:
+        与 groups 等长的列表，第 i 项为第 i 个运行组结束后保留的游戏进程名称，不保留时为空字符串。
+    """
+    names: list[str] = []
+    for idx, group in enumerate(groups):
+        game_name = get_group_game_name(group)
+        next_game_name = get_group_game_name(groups[idx + 1]) if idx + 1 < len(groups) else ''
+        same_game = bool(game_name) and game_name.lower() == next_game_name.lower()
+        scripts = [i for i in group.scripts if i.game_process_name.lower() == game_name.lower()]
+        keep = (
+            same_game
+            and any(i.kill_game_after_done for i in scripts)
+            and all(i.check_done != CheckDoneMethods.GAME_CLOSED.value.value for i in scripts)
+        )
+        names.append(game_name if keep else '')
+    return names
@@ -0,0 +1,202 @@
+"""
+runner 启动耗时分析
+
+在 sys.meta_path 最前面插入一个查找器，为每个新导入模块的加载器包一层计时，
+按导入嵌套关系记录每个模块的自身耗时与累计耗时，输出导入树。
+与 python -X importtime 的统计方式一致，但打包后的程序也可以使用。
+"""
+
+from __future__ import annotations
+
+import importlib.abc
+import importlib.machinery
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from types import ModuleType
+
+
+@dataclass
+class ImportRecord:
+    """一个模块的导入耗时。"""
+
+    name: str
+    cumulative_seconds: float = 0
+    children: list[ImportRecord] = field(default_factory=list)
+
+    @property
+    def self_seconds(self) -> float:
+        return self.cumulative_seconds - sum(i.cumulative_seconds for i in self.children)
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """包装原加载器，在执行模块时计时。其它属性全部转发给原加载器。"""
+
+    def __init__(self, loader: importlib.abc.Loader, profiler: ImportProfiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> ModuleType | None:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            self._loader.exec_module(module)
+            return
+        record = self._profiler.enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.exit(record)
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+
+class _TimedFinder(importlib.abc.MetaPathFinder):
+
+    def __init__(self, profiler: ImportProfiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname: str, path=None, target=None) -> importlib.machinery.ModuleSpec | None:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class ImportProfiler:
+    """记录安装期间主线程中的模块导入耗时。"""
+
+    def __init__(self) -> None:
+        self.roots: list[ImportRecord] = []
+        self._stack: list[tuple[ImportRecord, float]] = []
+        self._finder = _TimedFinder(self)
+
+    def install(self) -> None:
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def enter(self, name: str) -> ImportRecord:
+        record = ImportRecord(name=name)
+        if self._stack:
+            self._stack[-1][0].children.append(record)
+        else:
+            self.roots.append(record)
+        self._stack.append((record, time.perf_counter()))
+        return record
+
+    def exit(self, record: ImportRecord) -> None:
+        while self._stack:
+            top, start_time = self._stack.pop()
+            top.cumulative_seconds = time.perf_counter() - start_time
+            if top is record:
+                break
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(i.cumulative_seconds for i in self.roots)
+
+    def format_tree(self, min_ms: float = 1) -> list[str]:
+        """格式化导入树，累计耗时低于 min_ms 的模块不展开。
+
+        Returns:
+            每行一个模块: 累计耗时 | 自身耗时 | 缩进的模块名。
+        """
+        lines = [f'{"累计(ms)":>10} | {"自身(ms)":>10} | 模块']
+
+        def _append(record: ImportRecord, depth: int) -> None:
+            if record.cumulative_seconds * 1000 < min_ms:
+                return
+            lines.append(
+                f'{record.cumulative_seconds * 1000:>10.1f} | {record.self_seconds * 1000:>10.1f} | '
+                f'{"  " * depth}{record.name}'
+            )
+            for child in sorted(record.children, key=lambda i: i.cumulative_seconds, reverse=True):
+                _append(child, depth + 1)
+
+        for root in sorted(self.roots, key=lambda i: i.cumulative_seconds, reverse=True):
+            _append(root, 0)
+        return lines
+
+
+def _get_process_age_seconds() -> float | None:
+    """当前进程从创建到现在的时间，包含解释器启动。"""
+    try:
+        import psutil
+
+        return time.time() - psutil.Process().create_time()
+    except Exception:
+        return None
+
+
+def profile_runner_startup(chain_name: str = '01', min_ms: float = 1) -> None:
+    """分析 runner 从进程启动到即将启动第一个脚本的耗时，并打印报告。
+
+    依次执行 runner 的导入、上下文初始化、脚本链加载与运行组解析，但不实际运行脚本。
+    需要在导入 script_runner 之前调用，否则导入耗时无法统计。
+
+    Args:
+        chain_name: 用于分析的脚本链名称。
+        min_ms: 导入树中累计耗时低于该值（毫秒）的模块不展示。
+    """
+    phases: list[tuple[str, float]] = []
+    profiler = ImportProfiler()
+    profiler.install()
+    try:
+        phase_start = time.perf_counter()
+        from script_chainer.win_exe import script_runner
+        phases.append(('导入 runner', time.perf_counter() - phase_start))
+
+        phase_start = time.perf_counter()
+        ctx = script_runner.setup_runner()
+        phases.append(('初始化上下文', time.perf_counter() - phase_start))
+
+        phase_start = time.perf_counter()
+        from script_chainer.config.script_config import ScriptChainConfig
+        from script_chainer.utils.runtime_group_utils import (
+            build_runtime_selection,
+            resolve_runtime_groups,
+        )
+        chain_config = ScriptChainConfig(chain_name)
+        groups, _ = resolve_runtime_groups(
+            build_runtime_selection(chain_config.script_list, chain_config.compute_attach_targets())
+        )
+        phases.append((f'加载脚本链 {chain_name} ({len(groups)} 组)', time.perf_counter() - phase_start))
+    finally:
+        profiler.uninstall()
+
+    process_age = _get_process_age_seconds()
+
+    print('=== 导入耗时 ===')
+    for line in profiler.format_tree(min_ms=min_ms):
+        print(line)
+    print(f'导入总耗时 {profiler.total_seconds * 1000:.1f} ms')
+    print('=== 启动阶段 ===')
+    for name, seconds in phases:
+        print(f'{seconds * 1000:>10.1f} ms | {name}')
+    if process_age is not None:
+        print(f'进程启动至可运行第一个脚本 {process_age * 1000:.1f} ms')
+
+    if ctx is not None:
+        ctx.after_app_shutdown()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='分析 runner 启动耗时')
+    parser.add_argument('--chain', type=str, default='01', help='用于分析的脚本链名称')
+    parser.add_argument('--min-ms', type=float, default=1, help='导入树中只展示累计耗时不低于该值的模块')
+    args = parser.parse_args()
+    profile_runner_startup(args.chain, args.min_ms)
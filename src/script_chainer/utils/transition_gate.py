@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+
+import psutil
+
+from script_chainer.config.script_config import TransitionGateConfig
+from script_chainer.services.process_manager import is_process_existed
+from script_chainer.utils.runtime_group_utils import RuntimeGroup
+from script_chainer.utils.wait_utils import wait_with_cancel
+
+
+def get_teardown_process_names(group: RuntimeGroup) -> list[str]:
+    """获取运行组结束后应当退出的进程名称。
+
+    只包含配置了结束后关闭的游戏/脚本进程，用户要求保留的进程不需要等待。
+    """
+    names: list[str] = []
+    for script_config in group.scripts:
+        if script_config.kill_game_after_done and script_config.game_process_name:
+            names.append(script_config.game_process_name)
+        if script_config.kill_script_after_done and script_config.script_process_name:
+            names.append(script_config.script_process_name)
+    return list(dict.fromkeys(names))
+
+
+def wait_transition_gate(
+    config: TransitionGateConfig,
+    process_names: list[str],
+    stop_event: threading.Event,
+    on_status: Callable[[str], None] | None = None,
+    sample_interval: float = 1,
+) -> bool:
+    """等待运行组切换条件满足。
+
+    未启用时固定等待 fallback_wait_seconds 秒。启用时每个采样周期检查一次条件，
+    全部满足即返回；超过 max_wait_seconds 仍未满足时也会返回，不阻塞脚本链。
+
+    Args:
+        config: 切换条件配置。
+        process_names: 需要等待退出的进程名称。
+        stop_event: 退出事件，被设置后立即返回。
+        on_status: 等待原因变化时的回调。
+        sample_interval: 采样间隔（秒）。
+
+    Returns:
+        是否可以开始下一个运行组，被取消时返回 False。
+    """
+    if not config.enabled:
+        if on_status is not None:
+            on_status(f'{config.fallback_wait_seconds}秒后开始下一个脚本')
+        return not wait_with_cancel(stop_event, config.fallback_wait_seconds)
+
+    start_time = time.monotonic()
+    deadline = start_time + config.max_wait_seconds
+    cpu_ok_since: float | None = None
+    last_reasons: list[str] = []
+    psutil.cpu_percent(interval=None)  # 首次调用只建立基准
+
+    while True:
+        if wait_with_cancel(stop_event, sample_interval):
+            return False
+        now = time.monotonic()
+
+        reasons: list[str] = []
+        alive = [i for i in process_names if is_process_existed(i)]
+        if alive:
+            reasons.append(f'等待进程退出 {", ".join(alive)}')
+
+        cpu_percent = psutil.cpu_percent(interval=None)
+        if cpu_percent <= config.max_cpu_percent:
+            if cpu_ok_since is None:
+                cpu_ok_since = now
+        else:
+            cpu_ok_since = None
+        if cpu_ok_since is None:
+            reasons.append(f'等待CPU空闲 当前 {cpu_percent:.0f}%')
+        elif now - cpu_ok_since < config.cpu_stable_seconds:
+            reasons.append(f'等待CPU持续空闲 {config.cpu_stable_seconds} 秒')
+
+        free_mb = psutil.virtual_memory().available // (1024 * 1024)
+        if free_mb < config.min_free_memory_mb:
+            reasons.append(f'等待内存释放 可用 {free_mb}MB')
+
+        if not reasons:
+            if on_status is not None:
+                on_status(f'切换条件已满足 等待 {now - start_time:.0f} 秒后开始下一个脚本')
+            return True
+
+        if now >= deadline:
+            if on_status is not None:
+                on_status(f'切换条件等待超时 {config.max_wait_seconds} 秒，开始下一个脚本: {"; ".join(reasons)}')
+            return True
+
+        # CPU 稳定计时中的提示会随时间变化，只比较原因类别，避免刷屏
+        reason_keys = [i.split(' ')[0] for i in reasons]
+        if on_status is not None and reason_keys != last_reasons:
+            on_status('; '.join(reasons))
+        last_reasons = reason_keys
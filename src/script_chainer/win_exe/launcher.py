@@ -1,5 +1,6 @@
 import argparse
 import ctypes
+import multiprocessing
 import sys
 
 from one_dragon.launcher.exe_launcher import ExeLauncher
@@ -13,6 +14,11 @@ class ScriptChainerLauncher(ExeLauncher):
     - 无参数: 启动 GUI 配置编辑器
     - --onedragon: 运行脚本链
     - --chain: 指定脚本链名称（仅 --onedragon 模式）
+    - --chains: 在同一进程内运行多个脚本链（仅 --onedragon 模式）
+    - --resume: 跳过上次被中断的运行中已成功完成的脚本，用于中断后继续运行（仅 --onedragon 模式）
+    - --daemon: 以守护进程模式常驻，通过本地端口接收运行命令（仅 --onedragon 模式）
+    - --via-daemon: 守护进程在运行时交给守护进程运行并立即返回（仅 --onedragon 模式）
+    - --profile-startup: 输出 runner 导入树和启动耗时，不实际运行脚本（仅 --onedragon 模式）
     """
 
     def __init__(self):
@@ -37,6 +43,44 @@ class ScriptChainerLauncher(ExeLauncher):
             default=None,
             help="仅调试指定下标脚本，并按挂靠关系一并编排（禁用项仍会跳过）",
         )
+        parser.add_argument(
+            "--chains",
+            type=str,
+            default=None,
+            help="逗号分隔的多个脚本链名称，在同一进程内运行（仅 --onedragon 模式使用，例如: 01,02,03）",
+        )
+        parser.add_argument(
+            "--max-concurrent-chains",
+            type=int,
+            default=1,
+            help="--chains 模式下最多同时运行的脚本链数量（默认: 1）",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="跳过上次被中断的运行中已成功完成的脚本，用于中断后继续运行（仅 --onedragon 模式使用）",
+        )
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="以守护进程模式常驻，通过本地端口接收运行命令（仅 --onedragon 模式使用）",
+        )
+        parser.add_argument(
+            "--daemon-port",
+            type=int,
+            default=0,
+            help="守护进程监听端口（默认: 由系统分配）",
+        )
+        parser.add_argument(
+            "--via-daemon",
+            action="store_true",
+            help="守护进程在运行时交给守护进程运行 --chain 并立即返回，否则正常运行（仅 --onedragon 模式使用）",
+        )
+        parser.add_argument(
+            "--profile-startup",
+            action="store_true",
+            help="输出 runner 导入树和到可运行第一个脚本的耗时，不实际运行脚本（仅 --onedragon 模式使用）",
+        )
 
     @staticmethod
     def _hide_console() -> None:
@@ -54,22 +98,61 @@ class ScriptChainerLauncher(ExeLauncher):
 
     def run_onedragon_mode(self, launch_args) -> None:
         """运行脚本链"""
-        from script_chainer.win_exe.script_runner import run_chain
+        if self.args and self.args.profile_startup:
+            # 需要在导入 script_runner 之前开始统计
+            from script_chainer.utils.startup_profiler import profile_runner_startup
+            profile_runner_startup(self.args.chain)
+            sys.exit(0)
+
+        from script_chainer.win_exe.script_runner import (
+            parse_chain_names,
+            run_chain,
+            run_chains,
+        )
 
         # 从 launch_args 和 self.args 中提取参数
         chain_name = self.args.chain if self.args else "01"
         shutdown_delay = self.args.shutdown if self.args and self.args.shutdown else 0
         debug_index = self.args.debug_index if self.args else None
+        chains = self.args.chains if self.args else None
+        resume = self.args.resume if self.args else False
 
-        run_chain(
-            chain_name=chain_name,
-            shutdown_delay=shutdown_delay,
-            debug_index=debug_index,
-        )
+        if self.args and self.args.daemon:
+            from script_chainer.win_exe.runner_daemon import run_daemon
+            run_daemon(port=self.args.daemon_port)
+            sys.exit(0)
+
+        if self.args and self.args.via_daemon and not chains:
+            from script_chainer.utils.runner_utils import start_chain_in_daemon
+            try:
+                started = start_chain_in_daemon(chain_name, debug_index=debug_index, resume=resume)
+            except RuntimeError as e:
+                print(f"守护进程拒绝运行脚本链 {chain_name}: {e}")
+                sys.exit(1)
+            if started:
+                print(f"已交给守护进程运行脚本链 {chain_name}")
+                sys.exit(0)
+
+        if chains:
+            run_chains(
+                chain_names=parse_chain_names(chains),
+                shutdown_delay=shutdown_delay,
+                max_concurrent_chains=self.args.max_concurrent_chains,
+                resume=resume,
+            )
+        else:
+            run_chain(
+                chain_name=chain_name,
+                shutdown_delay=shutdown_delay,
+                debug_index=debug_index,
+                resume=resume,
+            )
         sys.exit(0)
 
 
 def main():
+    # 打包为 exe 时 Python 脚本工作进程也从这里启动，需要先交给 multiprocessing 处理
+    multiprocessing.freeze_support()
     launcher = ScriptChainerLauncher()
     launcher.run()
 
@@ -0,0 +1,140 @@
+"""
+子进程输出处理吞吐量测试
+
+启动一个尽可能快地输出大量行的子进程，统计 runner 每秒处理的行数:
+    - 逐行: 原实现，逐行读取管道，每行同步打印到控制台、写一条日志并加入通知池。
+    - 批量: 当前实现，OutputPipeline 批量读取，经 runner 实际使用的 _make_stdout_callback
+      交给 RunnerConsole 写线程和 LogNotifier，计时到 RunnerConsole 写完全部输出为止。
+两种方式都使用 runner 的 logger，控制台和日志都写入空设备。
+
+    python -m script_chainer.win_exe.output_benchmark --lines 200000
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, redirect_stdout
+
+from colorama import Style
+
+from one_dragon.utils.encoding_utils import decode_bytes, get_console_encoding
+from one_dragon.utils.log_utils import get_log_formatter
+from script_chainer.services.log_notifier import LogNotifier
+from script_chainer.services.output_pipeline import OutputPipeline
+from script_chainer.win_exe import script_runner
+from script_chainer.win_exe.runner_logging import log
+
+_CHILD_CODE = (
+    'import sys\n'
+    'out = sys.stdout\n'
+    'for i in range({lines}):\n'
+    '    out.write("[12:00:00.000] 输出第 %d 行 abcdefghijklmnopqrstuvwxyz\\n" % i)\n'
+)
+
+_DISPLAY_NAME = 'bench'
+
+
+@contextmanager
+def _null_sinks() -> Iterator[None]:
+    """控制台和 runner 日志都写入空设备，结束后恢复。"""
+    old_handlers, old_level, old_propagate = list(log.handlers), log.level, log.propagate
+    handler = logging.FileHandler(os.devnull, encoding='utf-8')
+    handler.setFormatter(get_log_formatter())
+    log.handlers = [handler]
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    try:
+        with open(os.devnull, 'w', encoding='utf-8') as console, redirect_stdout(console):
+            yield
+    finally:
+        handler.close()
+        log.handlers = old_handlers
+        log.setLevel(old_level)
+        log.propagate = old_propagate
+
+
+def _new_notifier() -> LogNotifier:
+    """只收集日志行、不推送的通知器。"""
+    return LogNotifier(None, _DISPLAY_NAME, 3600)
+
+
+def _start_child(lines: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, '-c', _CHILD_CODE.format(lines=lines)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+
+
+def _make_line_callback(notifier: LogNotifier, state: script_runner._RunMonitorState) -> Callable[[str], None]:
+    """原实现的逐行回调。"""
+    prefix = f'{Style.DIM}[{_DISPLAY_NAME}]{Style.RESET_ALL}'
+
+    def _on_stdout(line: str) -> None:
+        print(f'{prefix} {line}', flush=True)
+        log.info('[脚本] %s', line)
+        notifier.add(line)
+        state.last_log_time = time.time()
+
+    return _on_stdout
+
+
+def bench_by_line(lines: int) -> float:
+    """逐行读取回调，返回每秒处理的行数。"""
+    notifier = _new_notifier()
+    state = script_runner._RunMonitorState()
+    callback = _make_line_callback(notifier, state)
+    console_enc = get_console_encoding()
+    with _null_sinks():
+        start = time.perf_counter()
+        proc = _start_child(lines)
+        for raw_line in iter(proc.stdout.readline, b''):
+            callback(decode_bytes(raw_line, console_enc).rstrip('\r\n'))
+        proc.stdout.close()
+        proc.wait()
+        elapsed = time.perf_counter() - start
+    return lines / elapsed
+
+
+def bench_pipeline(lines: int) -> float:
+    """OutputPipeline 批量读取，经 runner 的输出回调和控制台写线程处理，返回每秒处理的行数。"""
+    notifier = _new_notifier()
+    state = script_runner._RunMonitorState()
+    callback = script_runner._make_stdout_callback(_DISPLAY_NAME, notifier, state)
+    line_count = 0
+
+    def _on_lines(batch: list[str]) -> None:
+        nonlocal line_count
+        callback(batch)
+        line_count += len(batch)
+
+    with _null_sinks():
+        start = time.perf_counter()
+        proc = _start_child(lines)
+        pipeline = OutputPipeline(proc.stdout, _on_lines)
+        pipeline.start()
+        pipeline.join()
+        proc.wait()
+        script_runner._console.flush(timeout=None)
+        elapsed = time.perf_counter() - start
+    assert line_count == lines, line_count
+    return lines / elapsed
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='子进程输出处理吞吐量测试')
+    parser.add_argument('--lines', type=int, default=200000, help='子进程输出的行数')
+    parser.add_argument('--rounds', type=int, default=3, help='每种方式运行的次数，取最好成绩')
+    args = parser.parse_args()
+
+    by_line = max(bench_by_line(args.lines) for _ in range(args.rounds))
+    batched = max(bench_pipeline(args.lines) for _ in range(args.rounds))
+    print(f'逐行读取回调 {by_line:>12,.0f} 行/秒')
+    print(f'批量读取分发 {batched:>12,.0f} 行/秒 ({batched / by_line:.1f}x)')
@@ -0,0 +1,182 @@
+"""
+runner 控制台输出
+
+运行消息与脚本输出只在调用线程中格式化并生成日志记录，放入队列后立即返回；
+后台写线程每次取出队列中积压的全部内容，合并为一次控制台写入，再依次交给日志处理器和消息监听方。
+编排线程不再因为控制台、日志文件或监听方的写入而阻塞。
+
+队列满时的策略: 反压，不丢弃。
+    队列有上限，写入方阻塞在入队上，直到写线程追上。脚本输出的分发线程因此阻塞，
+    OutputPipeline 的有界队列随之填满，读线程停止读取管道，最终由子进程阻塞在写操作上。
+    写线程自身（例如监听方输出运行消息）入队时队列已满则直接写出，避免阻塞自身。
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ConsoleEntry:
+    """一条待输出的内容。"""
+
+    # 写入控制台的文本，可以包含多行，不含末尾换行
+    text: str
+    records: list[logging.LogRecord] = field(default_factory=list)
+    # print_message 的 (时间, 级别, 消息)，用于通知监听方
+    message: tuple[str, str, str] | None = None
+
+
+class RunnerConsole:
+    """在后台线程中批量写控制台和日志。
+
+    写线程在第一次输出时启动，进程退出时会先写完队列中剩余的内容。
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        listeners: list[Callable[[str, str, str], None]] | None = None,
+        max_batch: int = 256,
+        max_pending: int = 1024,
+    ):
+        """
+        Args:
+            logger: 写入日志记录的 logger。
+            listeners: 运行消息监听方列表，参数为 (时间, 级别, 消息)，由调用方增删。
+            max_batch: 每次最多合并写入的条数。
+            max_pending: 队列中最多积压的条数，超过时写入方阻塞（反压）。
+        """
+        self.logger: logging.Logger = logger
+        self.listeners: list[Callable[[str, str, str], None]] = listeners if listeners is not None else []
+        self.max_batch: int = max(1, max_batch)
+        self._queue: queue.Queue[ConsoleEntry | threading.Event] = queue.Queue(maxsize=max(1, max_pending))
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def write(
+        self,
+        text: str,
+        log_msg: str | None = None,
+        log_args: tuple = (),
+        message: tuple[str, str, str] | None = None,
+        stacklevel: int = 1,
+    ) -> None:
+        """输出一行内容。
+
+        Args:
+            text: 写入控制台的文本，不含换行。
+            log_msg: 日志内容，为 None 时不写日志。
+            log_args: 日志参数。
+            message: 运行消息 (时间, 级别, 消息)，不为 None 时通知监听方。
+            stacklevel: 日志记录中的调用位置，1 表示调用 write 的位置。
+        """
+        records = []
+        if log_msg is not None and self.logger.isEnabledFor(logging.INFO):
+            records = self._make_records(log_msg, [log_args], stacklevel + 1)
+        self._ensure_started()
+        self._put(ConsoleEntry(text=text, records=records, message=message))
+
+    def write_lines(
+        self,
+        texts: list[str],
+        log_lines: list[str] | None = None,
+        stacklevel: int = 1,
+    ) -> None:
+        """输出多行内容，作为一个整体放入队列。
+
+        日志只生成一条记录，内容为 log_lines 按换行拼接，避免逐行写日志文件。
+
+        Args:
+            texts: 写入控制台的各行文本，不含换行。
+            log_lines: 写入日志的各行内容，为 None 或空时不写日志。
+            stacklevel: 日志记录中的调用位置，1 表示调用 write_lines 的位置。
+        """
+        if not texts:
+            return
+        records = []
+        if log_lines and self.logger.isEnabledFor(logging.INFO):
+            records = self._make_records('%s', [('\n'.join(log_lines),)], stacklevel + 1)
+        self._ensure_started()
+        self._put(ConsoleEntry(text='\n'.join(texts), records=records))
+
+    def _put(self, entry: ConsoleEntry) -> None:
+        """放入队列，队列已满时阻塞。写线程中入队失败时直接写出。"""
+        if threading.current_thread() is not self._thread:
+            self._queue.put(entry)
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._write_batch([entry])
+
+    def _make_records(self, log_msg: str, log_args_list: list[tuple], stacklevel: int) -> list[logging.LogRecord]:
+        """在调用线程中生成日志记录，保留原始的时间、线程和调用位置。"""
+        fn, lno, func, _ = self.logger.findCaller(stacklevel=stacklevel + 1)
+        return [
+            self.logger.makeRecord(self.logger.name, logging.INFO, fn, lno, log_msg, args, None, func)
+            for args in log_args_list
+        ]
+
+    def flush(self, timeout: float | None = 5) -> bool:
+        """等待此前放入的内容全部输出。
+
+        Returns:
+            是否在超时前输出完成。写线程未启动时直接返回 True。
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive() or thread is threading.current_thread():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='runner_console', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: list[ConsoleEntry | threading.Event]) -> None:
+        entries = [i for i in batch if isinstance(i, ConsoleEntry)]
+        if entries:
+            # 每次写入时再取 sys.stdout，与 colorama 的包装及 Python 脚本的输出重定向保持一致
+            stream = sys.stdout
+            if stream is not None:
+                try:
+                    stream.write(''.join(f'{i.text}\n' for i in entries))
+                    stream.flush()
+                except (OSError, ValueError):
+                    pass
+            for entry in entries:
+                for record in entry.records:
+                    self.logger.handle(record)
+                if entry.message is not None:
+                    for listener in list(self.listeners):
+                        try:
+                            listener(*entry.message)
+                        except Exception:
+                            self.logger.error('运行消息监听方异常', exc_info=True)
+        for i in batch:
+            if isinstance(i, threading.Event):
+                i.set()
@@ -0,0 +1,253 @@
+"""
+runner 守护进程
+
+常驻后台并保持上下文（配置、推送渠道）已初始化，通过本地 TCP 接收命令，
+将运行消息作为结构化事件推送给订阅方。同一时刻只运行一个脚本链。
+
+命令:
+    start: 运行脚本链，参数 chain / debug_index / resume
+    stop: 停止当前运行的脚本链
+    status: 查询运行状态
+    exit: 停止当前运行并退出守护进程
+
+事件:
+    message: 运行消息 {time, level, message}
+    chain_start: 脚本链开始 {chain}
+    chain_finish: 脚本链结束 {chain, summary, error}
+
+客户端命令行:
+    python -m script_chainer.win_exe.runner_daemon status
+    python -m script_chainer.win_exe.runner_daemon start 01 --follow
+    python -m script_chainer.win_exe.runner_daemon stop
+    python -m script_chainer.win_exe.runner_daemon watch
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+from script_chainer.context.script_chainer_context import ScriptChainerContext
+from script_chainer.services.daemon_ipc import (
+    DaemonClient,
+    DaemonServer,
+    DaemonUnavailableError,
+)
+from script_chainer.win_exe.runner_logging import get_runner_daemon_info_file, log
+from script_chainer.win_exe.script_runner import (
+    ChainRunSummary,
+    add_message_listener,
+    execute_chain,
+    finish_runner,
+    is_stop_requested,
+    print_message,
+    remove_message_listener,
+    reset_stop_request,
+    setup_runner,
+    stop_active_run,
+)
+
+
+class RunnerDaemon:
+    """runner 守护进程，负责处理命令和管理脚本链运行线程。"""
+
+    def __init__(self, ctx: ScriptChainerContext | None, port: int = 0):
+        """
+        Args:
+            ctx: 已初始化的上下文，为 None 时不推送通知。
+            port: 监听端口，0 表示由系统分配。
+        """
+        self._ctx: ScriptChainerContext | None = ctx
+        self._lock = threading.Lock()
+        self._exit_event = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._current_chain: str | None = None
+        self._start_time: float | None = None
+        self._last_summary: ChainRunSummary | None = None
+        self._server = DaemonServer(self._handle_request, get_runner_daemon_info_file(), port)
+
+    def serve_forever(self) -> None:
+        """开始监听并阻塞直到收到 exit 命令或退出信号。
+
+        Raises:
+            OSError: 无法监听端口时抛出。
+        """
+        self._server.start()
+        add_message_listener(self._on_message)
+        print_message(f'守护进程已启动 端口 {self._server.port} PID {os.getpid()}', level='PASS')
+        try:
+            # 主线程保持可中断的等待，以便及时处理退出信号
+            while not self._exit_event.wait(0.5):
+                pass
+            self._stop_chain()
+            if self._worker is not None:
+                self._worker.join()
+        finally:
+            remove_message_listener(self._on_message)
+            self._server.close()
+            print_message('守护进程已退出')
+
+    def _handle_request(self, request: dict) -> dict:
+        cmd = request.get('cmd')
+        if cmd == 'start':
+            debug_index = request.get('debug_index')
+            return self._start_chain(
+                chain_name=str(request.get('chain') or '01'),
+                debug_index=int(debug_index) if debug_index is not None else None,
+                resume=bool(request.get('resume', False)),
+            )
+        if cmd == 'stop':
+            return {'stopped': self._stop_chain()}
+        if cmd == 'status':
+            return self._get_status()
+        if cmd == 'exit':
+            self._exit_event.set()
+            return {}
+        raise ValueError(f'未知命令 {cmd}')
+
+    def _start_chain(self, chain_name: str, debug_index: int | None, resume: bool) -> dict:
+        with self._lock:
+            if self._exit_event.is_set():
+                raise ValueError('守护进程正在退出')
+            if self._worker is not None and self._worker.is_alive():
+                raise ValueError(f'已有脚本链正在运行 {self._current_chain}')
+            reset_stop_request()
+            self._current_chain = chain_name
+            self._start_time = time.time()
+            self._worker = threading.Thread(
+                target=self._run_chain,
+                args=(chain_name, debug_index, resume),
+                name='runner_daemon_chain',
+                daemon=True,
+            )
+            self._worker.start()
+        return {'chain': chain_name}
+
+    def _stop_chain(self) -> bool:
+        """停止当前运行的脚本链，返回是否有脚本链在运行。"""
+        with self._lock:
+            running = self._worker is not None and self._worker.is_alive()
+        if running:
+            print_message(f'收到停止命令 停止运行 {self._current_chain}', level='ERROR')
+            stop_active_run()
+        return running
+
+    def _get_status(self) -> dict:
+        with self._lock:
+            running = self._worker is not None and self._worker.is_alive()
+            return {
+                'pid': os.getpid(),
+                'running': running,
+                'chain': self._current_chain if running else None,
+                'elapsed_seconds': time.time() - self._start_time if running and self._start_time else 0,
+                'last_summary': self._last_summary.summary_text if self._last_summary is not None else None,
+            }
+
+    def _run_chain(self, chain_name: str, debug_index: int | None, resume: bool) -> None:
+        """工作线程入口: 运行一个脚本链并推送开始/结束事件。"""
+        self._server.broadcast({'event': 'chain_start', 'chain': chain_name})
+        try:
+            summary = execute_chain(self._ctx, chain_name, debug_index=debug_index, resume=resume)
+        except (Exception, SystemExit) as e:
+            # 停止运行时 Python 脚本会以 SystemExit 退出
+            log.error('守护进程运行脚本链异常 %s', chain_name, exc_info=True)
+            summary = ChainRunSummary(chain_name=chain_name, error=str(e) or type(e).__name__)
+        if is_stop_requested() and summary.error is None:
+            summary.error = '已停止'
+
+        print_message(summary.summary_text, level='ERROR' if summary.error else 'PASS')
+        with self._lock:
+            self._last_summary = summary
+        self._server.broadcast({
+            'event': 'chain_finish',
+            'chain': chain_name,
+            'summary': summary.summary_text,
+            'error': summary.error,
+        })
+
+    def _on_message(self, timestamp: str, level: str, message: str) -> None:
+        self._server.broadcast({'event': 'message', 'time': timestamp, 'level': level, 'message': message})
+
+
+def run_daemon(port: int = 0) -> None:
+    """以守护进程模式运行 runner。已有守护进程在运行时直接返回。
+
+    Args:
+        port: 监听端口，0 表示由系统分配。
+    """
+    try:
+        status = DaemonClient(get_runner_daemon_info_file()).request('status')
+        print(f'守护进程已在运行 PID {status.get("pid")}')
+        return
+    except DaemonUnavailableError:
+        pass
+
+    ctx = setup_runner()
+    try:
+        RunnerDaemon(ctx, port).serve_forever()
+    finally:
+        finish_runner(ctx)
+
+
+def _print_event(event: dict) -> None:
+    if event.get('event') == 'message':
+        print(f'{event.get("time")} | {event.get("level")} | {event.get("message")}')
+    elif event.get('event') == 'chain_start':
+        print(f'开始运行脚本链 {event.get("chain")}')
+    elif event.get('event') == 'chain_finish':
+        print(event.get('summary'))
+
+
+def client_main(argv: list[str] | None = None) -> int:
+    """守护进程客户端命令行入口。
+
+    Returns:
+        进程退出码。
+    """
+    parser = argparse.ArgumentParser(description='千机链 runner 守护进程客户端')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    start_parser = sub.add_parser('start', help='运行脚本链')
+    start_parser.add_argument('chain', type=str, help='脚本链名称')
+    start_parser.add_argument('--debug-index', type=int, default=None, help='仅调试指定下标脚本')
+    start_parser.add_argument('--resume', action='store_true', help='跳过上次被中断的运行中已成功完成的脚本')
+    start_parser.add_argument('--follow', action='store_true', help='持续输出运行消息直到脚本链结束')
+    sub.add_parser('stop', help='停止当前运行的脚本链')
+    sub.add_parser('status', help='查询运行状态')
+    sub.add_parser('watch', help='持续输出运行消息')
+    sub.add_parser('exit', help='退出守护进程')
+    args = parser.parse_args(argv)
+
+    client = DaemonClient(get_runner_daemon_info_file())
+    try:
+        if args.cmd == 'watch':
+            for event in client.subscribe():
+                _print_event(event)
+            return 0
+
+        events = client.subscribe() if args.cmd == 'start' and args.follow else None
+        params = {}
+        if args.cmd == 'start':
+            params = {'chain': args.chain, 'debug_index': args.debug_index, 'resume': args.resume}
+        response = client.request(args.cmd, **params)
+        if not response.get('ok'):
+            print(response.get('error'))
+            return 1
+        response.pop('ok')
+        print(response)
+
+        if events is not None:
+            for event in events:
+                _print_event(event)
+                if event.get('event') == 'chain_finish' and event.get('chain') == args.chain:
+                    return 1 if event.get('error') else 0
+        return 0
+    except DaemonUnavailableError as e:
+        print(e)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(client_main())
@@ -13,6 +13,7 @@ from one_dragon.utils.log_utils import (
 RUNNER_LOGGER_NAME = 'ScriptChainerRunner'
 RUNNER_LOG_FILE_NAME = 'script_chainer_runner.log'
 RUNNER_FRAMEWORK_LOG_FILE_NAME = 'script_chainer_framework.log'
+RUNNER_DAEMON_INFO_FILE_NAME = 'script_chainer_daemon.json'
 log = logging.getLogger(RUNNER_LOGGER_NAME)
 
 
@@ -37,6 +38,18 @@ def get_runner_log_file_path(file_name: str = RUNNER_LOG_FILE_NAME) -> str:
     return get_log_file_path(default_name=file_name)
 
 
+def get_runner_data_dir(dir_name: str) -> str:
+    """获取 runner 运行数据目录（位于日志目录 `.log/` 下），不存在时创建。"""
+    data_dir = Path(get_runner_log_file_path(dir_name))
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return str(data_dir)
+
+
+def get_runner_daemon_info_file() -> str:
+    """获取 runner 守护进程连接信息文件路径。"""
+    return get_runner_log_file_path(RUNNER_DAEMON_INFO_FILE_NAME)
+
+
 def configure_runner_runtime_logging() -> ProjectRuntimeLoggingContext:
     """显式启用 runner 进程的项目日志与框架日志分流。"""
     runner_log_file = get_runner_log_file_path(RUNNER_LOG_FILE_NAME)
@@ -0,0 +1,111 @@
+"""
+脚本输出归档查看
+
+    python -m script_chainer.win_exe.runner_output list --name BetterGI
+    python -m script_chainer.win_exe.runner_output tail BetterGI -n 100
+    python -m script_chainer.win_exe.runner_output show BetterGI --since 04:10 --until "2026-04-20 04:30"
+
+目标可以是归档文件路径，也可以是脚本名称的一部分（取最近一次运行的归档）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import sys
+from pathlib import Path
+
+from script_chainer.services.output_archive import (
+    ArchiveLine,
+    iter_lines,
+    list_archives,
+    tail_lines,
+)
+from script_chainer.win_exe.runner_logging import get_runner_data_dir
+
+
+def parse_time(text: str) -> float:
+    """解析时间，支持 HH:MM[:SS]（今天）和 YYYY-mm-dd HH:MM[:SS]。
+
+    Raises:
+        ValueError: 格式不正确时抛出。
+    """
+    text = text.strip()
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M'):
+        try:
+            return datetime.datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            pass
+    for fmt in ('%H:%M:%S', '%H:%M'):
+        try:
+            t = datetime.datetime.strptime(text, fmt).time()
+            return datetime.datetime.combine(datetime.date.today(), t).timestamp()
+        except ValueError:
+            pass
+    raise ValueError(f'无法解析时间 {text}')
+
+
+def resolve_archive(archive_dir: str, target: str) -> Path | None:
+    """将归档文件路径或脚本名称解析为归档文件，名称匹配多个时取最近一个。"""
+    if os.path.isfile(target):
+        return Path(target)
+    files = list_archives(archive_dir, target)
+    return files[0] if files else None
+
+
+def _format_line(line: ArchiveLine) -> str:
+    dt = datetime.datetime.fromtimestamp(line.timestamp)
+    return f'{dt:%Y-%m-%d %H:%M:%S},{dt.microsecond // 1000:03d} | {line.text}'
+
+
+def main(argv: list[str] | None = None) -> int:
+    """命令行入口。
+
+    Returns:
+        进程退出码。
+    """
+    parser = argparse.ArgumentParser(description='查看脚本输出归档')
+    parser.add_argument('--dir', type=str, default=None, help='归档目录，默认为 runner 日志目录下的 output')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    list_parser = sub.add_parser('list', help='列出归档，从新到旧')
+    list_parser.add_argument('--name', type=str, default=None, help='只列出文件名包含该内容的归档')
+    list_parser.add_argument('--limit', type=int, default=20, help='最多列出的数量')
+    tail_parser = sub.add_parser('tail', help='查看最后若干行')
+    tail_parser.add_argument('target', type=str, help='归档文件路径或脚本名称')
+    tail_parser.add_argument('-n', type=int, default=50, help='行数')
+    show_parser = sub.add_parser('show', help='按时间范围查看')
+    show_parser.add_argument('target', type=str, help='归档文件路径或脚本名称')
+    show_parser.add_argument('--since', type=str, default=None, help='起始时间 HH:MM[:SS] 或 YYYY-mm-dd HH:MM[:SS]')
+    show_parser.add_argument('--until', type=str, default=None, help='结束时间，格式同 --since')
+    args = parser.parse_args(argv)
+
+    archive_dir = args.dir or get_runner_data_dir('output')
+    if args.cmd == 'list':
+        for file_path in list_archives(archive_dir, args.name)[:args.limit]:
+            size_kb = file_path.stat().st_size / 1024
+            print(f'{size_kb:>10.1f} KB | {file_path}')
+        return 0
+
+    file_path = resolve_archive(archive_dir, args.target)
+    if file_path is None:
+        print(f'未找到归档 {args.target}')
+        return 1
+
+    if args.cmd == 'tail':
+        lines = tail_lines(str(file_path), args.n)
+    else:
+        try:
+            start_time = parse_time(args.since) if args.since else None
+            end_time = parse_time(args.until) if args.until else None
+        except ValueError as e:
+            print(e)
+            return 1
+        lines = iter_lines(str(file_path), start_time, end_time)
+    for line in lines:
+        print(_format_line(line))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,52 +1,152 @@
 import argparse
 import atexit
 import datetime
+import marshal
+import math
+import multiprocessing
 import os
+import re
 import shlex
 import signal
+import sqlite3
 import sys
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, wait
 from contextlib import suppress
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import partial
 from pathlib import Path, PurePath
 
 from colorama import Fore, Style, init
 
+from one_dragon.base.config.config_item import get_config_item_from_enum
+from one_dragon.base.operation.notify_pool import NotifyPoolItem
 from one_dragon.utils import cmd_utils
+from script_chainer.config.script_chain_record import ScriptChainRecord
 from script_chainer.config.script_config import (
     CheckDoneMethods,
+    FailureClasses,
+    IdleTargets,
     ScriptChainConfig,
     ScriptConfig,
     ScriptType,
+    TransitionGateConfig,
 )
 from script_chainer.context.script_chainer_context import ScriptChainerContext
+from script_chainer.services.idle_detector import IdleDetector
 from script_chainer.services.log_notifier import LogNotifier
+from script_chainer.services.output_archive import (
+    ARCHIVE_SUFFIX,
+    OutputArchiveWriter,
+)
+from script_chainer.services.output_archive import (
+    clear_outdated_files as clear_outdated_archives,
+)
+from script_chainer.services.output_cadence import GapHistogram, get_stall_timeout
 from script_chainer.services.process_manager import (
     LauncherExitError,
     ProcessInfo,
     ProcessManager,
     find_process_by_info,
-    is_process_existed,
+)
+from script_chainer.services.process_watcher import ProcessWatcher
+from script_chainer.services.python_worker_pool import PythonJob, PythonWorkerPool
+from script_chainer.services.resource_sampler import (
+    LIMIT_CHECK_INTERVAL_SECONDS,
+    ResourceLimits,
+    ResourceSampler,
+    ResourceSummary,
+    clear_outdated_files,
+    get_tracked_pids,
+)
+from script_chainer.services.retry_policy import RetryPolicy
+from script_chainer.services.run_history import RunHistory, ScriptOutcome
+from script_chainer.services.run_journal import GroupOutcome, JournalEvent, RunJournal
+from script_chainer.utils.bytecode_cache import ScriptCode, load_script_code
+from script_chainer.utils.bytecode_cache import (
+    clear_outdated_files as clear_outdated_bytecode,
+)
+from script_chainer.utils.chain_scheduler import (
+    ChainScheduler,
+    ResourceLockRegistry,
+    get_group_locks,
 )
 from script_chainer.utils.console_close_utils import force_exit_on_console_close
+from script_chainer.utils.preflight_check import wait_preflight
 from script_chainer.utils.runtime_group_utils import (
+    RuntimeGroup,
     build_runtime_selection,
+    get_warm_game_names,
     resolve_runtime_groups,
 )
+from script_chainer.utils.transition_gate import (
+    get_teardown_process_names,
+    wait_transition_gate,
+)
 from script_chainer.utils.wait_utils import wait_with_cancel
+from script_chainer.win_exe.runner_console import RunnerConsole
 from script_chainer.win_exe.runner_logging import (
     configure_runner_runtime_logging,
+    get_runner_data_dir,
     log,
 )
 
-# 当前活跃的 ProcessManager，用于信号处理时清理
-_active_pm: ProcessManager | None = None
+# 当前活跃的 ProcessManager，用于信号处理时清理（并行调度时可能同时存在多个）
+_active_pms: set[ProcessManager] = set()
+_active_pms_lock = threading.Lock()
+
+# Python 脚本在当前进程内 exec，会替换 sys.stdout / sys.argv / cwd 等全局状态，
+# 并行调度时需要串行执行
+_python_exec_lock = threading.Lock()
+
+# 各脚本链的 Python 脚本工作进程池，运行脚本链时创建，结束后关闭
+_python_worker_pools: dict[str, PythonWorkerPool] = {}
+_python_worker_pools_lock = threading.Lock()
+
+# 运行日志，在 setup_runner 中创建
+_run_journal: RunJournal | None = None
+
+# 脚本运行历史，在 setup_runner 中创建
+_run_history: RunHistory | None = None
+
+# 脚本链完成记录，用于每个游戏日只运行一次的脚本
+_chain_records: dict[str, ScriptChainRecord] = {}
+_chain_records_lock = threading.Lock()
+
+# 提前启动的脚本进程，以 id(ScriptConfig) 为键；多个脚本链同时运行时，各脚本链结束时只关闭自己的
+_prewarmed_launches: 'dict[int, _PrewarmedLaunch]' = {}
+_prewarmed_launches_lock = threading.Lock()
+
+# 资源采样文件目录，在 setup_runner 中创建，为 None 时只统计不落盘
+_telemetry_dir: str | None = None
+
+# 脚本输出归档目录，在 setup_runner 中创建，为 None 时不归档
+_output_archive_dir: str | None = None
+
+# Python 脚本字节码缓存目录，在 setup_runner 中创建，为 None 时每次都编译源码
+_bytecode_cache_dir: str | None = None
 
+# print_message 的监听方，参数为 (时间, 级别, 消息)，用于守护进程推送运行进度
+_message_listeners: list[Callable[[str, str, str], None]] = []
 
-class _NoLogTimeoutError(Exception):
-    """脚本长时间无日志输出时抛出，触发外层重试。"""
+# 运行消息和脚本输出的控制台/日志写入，监听方在写线程中按消息顺序调用
+_console = RunnerConsole(log, _message_listeners)
+
+
+class _ScriptFailure(Exception):
+    """脚本运行失败时抛出，由外层按重试策略决定是否重试。"""
+
+    def __init__(self, failure_class: str, detail: str = ''):
+        """
+        Args:
+            failure_class: 失败类型，见 FailureClasses。
+            detail: 失败详情，附加在通知内容中。
+        """
+        super().__init__(failure_class)
+        self.failure_class: str = failure_class
+        self.detail: str = detail
 
 
 @dataclass
@@ -56,19 +156,56 @@ class _RunMonitorState:
     script_ever_existed: bool = False
     game_ever_existed: bool = False
     last_log_time: float | None = None
+    # 完成日志: 正则在启动前编译一次，首次匹配后不再检查；匹配后通过 on_done_matched 唤醒监控
+    done_pattern: re.Pattern[str] | None = None
+    done_matched_time: float | None = None
+    on_done_matched: Callable[[], None] | None = None
+    # 提前启动时还没有日志通知器，由接管的运行组补上
+    log_notifier: LogNotifier | None = None
+    # 脚本输出归档，启动脚本时创建，运行结束时关闭
+    output_archive: OutputArchiveWriter | None = None
+    # 本次运行的输出间隔直方图，启用自适应无日志超时时创建，运行成功后合并到运行历史
+    gap_histogram: GapHistogram | None = None
+    # 资源采样线程发现进程树超出资源上限时写入超限说明，并唤醒监控
+    resource_breach: str | None = None
+
+
+@dataclass
+class _PrewarmedLaunch:
+    """提前启动的脚本进程，由下一个运行组中对应的脚本接管。"""
+
+    script_config: ScriptConfig
+    state: _RunMonitorState
+    # 所属的脚本链
+    chain_name: str = ''
+    thread: threading.Thread | None = None
+    pm: ProcessManager | None = None
+
+
+@dataclass
+class _Sidecar:
+    """运行中的伴随脚本。"""
+
+    script_config: ScriptConfig
+    cancel_event: threading.Event
+    thread: threading.Thread | None = None
 
 
 class _TeeWriter:
-    """包装 stdout，将每行输出同时写入 LogNotifier。"""
+    """包装 stdout，将执行脚本线程的每行输出同时写入 LogNotifier。
+
+    并行调度时其它运行组的线程也会写 stdout，这些输出不属于当前脚本，只透传不收集。
+    """
 
     def __init__(self, original: object, notifier: LogNotifier) -> None:
         self._original = original
         self._notifier = notifier
+        self._thread_id = threading.get_ident()
 
     def write(self, s: str) -> int:
         result = self._original.write(s)
         stripped = s.strip()
-        if stripped:
+        if stripped and threading.get_ident() == self._thread_id:
             self._notifier.add(stripped)
         return result
 
@@ -79,12 +216,39 @@ class _TeeWriter:
         return getattr(self._original, name)
 
 
+@dataclass
+class ChainRunSummary:
+    """单个脚本链的运行汇总。"""
+
+    chain_name: str
+    group_count: int = 0
+    finished_group_count: int = 0
+    resumed_group_count: int = 0
+    elapsed_seconds: float = 0
+    error: str | None = None
+
+    @property
+    def summary_text(self) -> str:
+        if self.error is not None:
+            return f'脚本链 {self.chain_name} 运行失败: {self.error}'
+        minutes = int(self.elapsed_seconds // 60)
+        resumed = f' 恢复跳过 {self.resumed_group_count} 组' if self.resumed_group_count > 0 else ''
+        return (
+            f'脚本链 {self.chain_name} 完成 {self.finished_group_count}/{self.group_count} 组'
+            f'{resumed} 耗时 {minutes} 分钟'
+        )
+
+
 class _RunnerExitController:
     """管理 runner 的退出状态和普通信号处理。"""
 
     def __init__(self) -> None:
         self._shutdown_event = threading.Event()
 
+    @property
+    def shutdown_event(self) -> threading.Event:
+        return self._shutdown_event
+
     def wait(self, seconds: float) -> bool:
         return wait_with_cancel(self._shutdown_event, seconds)
 
@@ -98,6 +262,8 @@ class _RunnerExitController:
         self._shutdown_event.set()
         cleanup()
         if force:
+            # 强制退出不会执行 atexit，先写完已输出的消息
+            _console.flush(timeout=1)
             os._exit(1)
         sys.exit(1)
 
@@ -119,18 +285,37 @@ def parse_args():
     parser.add_argument('--chain', type=str, default='01', help='脚本链名称')
     parser.add_argument('-s', '--shutdown', type=int, nargs='?', const=60, help='运行后关机延迟秒数，默认60秒')
     parser.add_argument('--debug-index', type=int, default=None, help='仅调试指定下标脚本，并按挂靠关系一并编排（禁用项仍会跳过）')
+    parser.add_argument('--chains', type=str, default=None, help='逗号分隔的多个脚本链名称，在同一进程内运行，例如 01,02,03')
+    parser.add_argument('--max-concurrent-chains', type=int, default=1, help='--chains 模式下最多同时运行的脚本链数量')
+    parser.add_argument('--resume', action='store_true', help='跳过上次被中断的运行中已成功完成的脚本，用于中断后继续运行')
+    parser.add_argument('--daemon', action='store_true', help='以守护进程模式常驻，通过本地端口接收运行命令')
+    parser.add_argument('--daemon-port', type=int, default=0, help='守护进程监听端口，默认由系统分配')
 
     return parser.parse_args()
 
 
 def print_message(message: str, level="INFO"):
-    # 打印消息，带有时间戳和日志级别
-    _exit_controller.wait(0.1)
+    # 打印消息，带有时间戳和日志级别，由 _console 在后台线程写出，不阻塞调用方
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]
     colors = {"INFO": Fore.CYAN, "ERROR": Fore.YELLOW + Style.BRIGHT, "PASS": Fore.GREEN}
     color = colors.get(level, Fore.WHITE)
-    print(f"{timestamp} | {color}{level}{Style.RESET_ALL} | {message}")
-    log.info(message)
+    _console.write(
+        f"{timestamp} | {color}{level}{Style.RESET_ALL} | {message}",
+        log_msg=message,
+        message=(timestamp, level, message),
+        stacklevel=2,
+    )
+
+
+def add_message_listener(listener: Callable[[str, str, str], None]) -> None:
+    """注册 print_message 监听方，参数为 (时间, 级别, 消息)。"""
+    _message_listeners.append(listener)
+
+
+def remove_message_listener(listener: Callable[[str, str, str], None]) -> None:
+    """移除 print_message 监听方。"""
+    with suppress(ValueError):
+        _message_listeners.remove(listener)
 
 
 def _push_chain_notification(
@@ -138,13 +323,17 @@ def _push_chain_notification(
     chain_name: str,
     action: str,
     script_config: ScriptConfig,
+    detail: str = '',
 ) -> None:
-    """按脚本配置推送脚本链通知。"""
+    """按脚本配置推送脚本链通知，detail 不为空时附加在通知内容后。"""
     if ctx is None:
         return
+    content = f'脚本链 {chain_name} {action}: {script_config.script_display_name}'
+    if detail:
+        content = f'{content}\n{detail}'
     ctx.push_service.push_async(
         title=ctx.notify_config.title,
-        content=f'脚本链 {chain_name} {action}: {script_config.script_display_name}',
+        content=content,
     )
 
 
@@ -152,23 +341,38 @@ def _make_stdout_callback(
     display_name: str,
     log_notifier: LogNotifier | None = None,
     state: _RunMonitorState | None = None,
-) -> Callable[[str], None]:
-    """创建 stdout 回调，为每行输出添加前缀。
+) -> Callable[[list[str]], None]:
+    """创建 stdout 批量回调，为每行输出添加前缀后输出到控制台和日志，并转发给日志通知器和运行监控状态。
 
     Args:
         display_name: 显示名称。
         log_notifier: 可选的日志通知器，用于定时推送日志。
-        state: 可选的运行监控状态，用于记录最后一次收到日志的时间戳。
+        state: 可选的运行监控状态，用于记录最后一次收到日志的时间戳，以及匹配完成日志。
     """
     prefix = f'{Style.DIM}[{display_name}]{Style.RESET_ALL}'
 
-    def _on_stdout(line: str) -> None:
-        print(f'{prefix} {line}', flush=True)
-        log.info('[脚本] %s', line)
-        if log_notifier is not None:
-            log_notifier.add(line)
+    def _on_stdout(lines: list[str]) -> None:
+        now = time.time()
+        archive = state.output_archive if state is not None else None
+        if archive is not None:
+            archive.write_lines(lines, now)
+        _console.write_lines(
+            [f'{prefix} {line}' for line in lines],
+            log_lines=None if archive is not None else [f'[脚本] {line}' for line in lines],
+        )
+        notifier = log_notifier if log_notifier is not None or state is None else state.log_notifier
+        if notifier is not None:
+            notifier.add_many(lines)
         if state is not None:
-            state.last_log_time = time.time()
+            # 同一批输出视为一次输出，只记录与上一批之间的间隔
+            if state.gap_histogram is not None and state.last_log_time is not None:
+                state.gap_histogram.add(now - state.last_log_time)
+            state.last_log_time = now
+            if state.done_pattern is not None and state.done_matched_time is None:
+                if any(state.done_pattern.search(line) is not None for line in lines):
+                    state.done_matched_time = state.last_log_time
+                    if state.on_done_matched is not None:
+                        state.on_done_matched()
 
     return _on_stdout
 
@@ -205,6 +409,9 @@ def _launch_script(
     if script_config.script_process_name:
         target = ProcessInfo(name=script_config.script_process_name)
 
+    if state is not None and state.output_archive is None:
+        state.output_archive = _new_output_archive(script_config)
+
     pm = ProcessManager()
     try:
         display_name = script_config.game_display_name or script_config.script_display_name or PurePath(script_path).name
@@ -232,85 +439,143 @@ def _launch_script(
     return pm
 
 
+def _new_output_archive(script_config: ScriptConfig) -> OutputArchiveWriter | None:
+    """按配置为本次运行创建输出归档，未启用时返回 None。
+
+    归档按日期分目录，文件名为 启动时间_脚本名称，同一秒内多次启动时追加序号。
+    """
+    if not script_config.archive_output or _output_archive_dir is None:
+        return None
+    now = datetime.datetime.now()
+    safe_name = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in script_config.script_display_name)
+    base_path = os.path.join(_output_archive_dir, now.strftime('%Y%m%d'), f'{now:%H%M%S}_{safe_name}')
+    file_path = f'{base_path}{ARCHIVE_SUFFIX}'
+    seq = 1
+    while os.path.exists(file_path):
+        seq += 1
+        file_path = f'{base_path}_{seq}{ARCHIVE_SUFFIX}'
+    return OutputArchiveWriter(file_path)
+
+
 def _wait_for_subprocess_ready(
     pm: ProcessManager,
-    script_path: str,
+    script_config: ScriptConfig,
     state: _RunMonitorState,
+    watcher: ProcessWatcher,
     timeout: float = 20,
     expect_target: bool = False,
 ) -> bool:
     """等待子进程就绪，确保进程已经成功启动并运行了一段时间。
 
+    launcher 场景下若启动器已正常退出而目标进程尚未出现，
+    则阻塞等待 watcher 的进程出现事件，并将出现的进程设为追踪目标。
+
     Args:
         pm: ProcessManager 实例。
-        script_path: 脚本路径（用于日志）。
+        script_config: 脚本配置。
+        state: 运行监控状态。
+        watcher: 进程监听器。
         timeout: 等待超时时间（秒）。
         expect_target: 是否期望追踪到目标进程（launcher 场景）。
 
     Returns:
         子进程是否就绪。
     """
-    start_time = time.time()
+    script_path = script_config.script_path
+    deadline = time.monotonic() + timeout
+    waiting_target_printed = False
 
     while True:
-        now = time.time()
-
-        if pm.process is None and pm.target_process is None:
-            # 进程完全不存在
-            if now - start_time > timeout:
-                break
-            if _exit_controller.wait(1):
-                break
-            continue
-
         if pm.is_running():
             state.script_ever_existed = True
             print_message(f'创建脚本子进程 {script_path}')
             return True
-        else:
-            # 进程已退出
-            if pm.process is not None:
-                rc = pm.process.poll()
-                if rc == 0:
-                    if expect_target and pm.target_process is None:
-                        # launcher 退出但目标进程未就绪，继续等待
-                        print_message(f'启动器已退出 (rc=0)，等待目标进程 {script_path}')
-                    else:
-                        print_message(f'启动器已退出 (rc=0) {script_path}')
-                        return True
-                else:
-                    print_message(f'子进程异常退出 (rc={rc}) {script_path}', level='ERROR')
-
-        if now - start_time > timeout:
-            break
 
-        if _exit_controller.wait(1):
-            break
+        if pm.process is None and pm.target_process is None:
+            # 进程完全不存在
+            return False
+
+        if pm.process is not None and pm.target_process is None:
+            rc = pm.process.poll()
+            if rc != 0:
+                print_message(f'子进程异常退出 (rc={rc}) {script_path}', level='ERROR')
+                return False
+            if not expect_target:
+                print_message(f'启动器已退出 (rc=0) {script_path}')
+                return True
+
+            # launcher 退出但目标进程未就绪，等待目标进程出现
+            if not waiting_target_printed:
+                print_message(f'启动器已退出 (rc=0)，等待目标进程 {script_path}')
+                waiting_target_printed = True
+            watcher.watch_name(script_config.script_process_name)
+            pids = watcher.get_pids(script_config.script_process_name)
+            if pids and pm.attach_target(pids[0]):
+                continue
 
-    return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        watcher.wait_changed(remaining)
+        if _exit_controller.is_shutdown_requested():
+            return False
 
 
 def _monitor_script_done(
     script_config: ScriptConfig,
     state: _RunMonitorState,
-) -> None:
+    pm: ProcessManager,
+    watcher: ProcessWatcher,
+    run_timeout_seconds: int | None = None,
+    no_log_timeout_seconds: int | None = None,
+) -> bool:
     """监控脚本运行状态，等待完成条件满足。
 
+    游戏与脚本进程的存活状态由 watcher 维护，本函数只在进程事件或
+    下一个超时检查点到达时被唤醒，不再逐秒扫描进程表。
+
     Args:
         script_config: 脚本配置。
         state: 运行监控状态（跨 _wait_for_subprocess_ready 持久化的进程存在标志）。
+        pm: ProcessManager 实例，其追踪的进程用于初始化脚本进程的监听。
+        watcher: 进程监听器。
+        run_timeout_seconds: 运行超时时间（秒），为 None 时使用脚本配置的超时时间。
+        no_log_timeout_seconds: 无日志超时时间（秒），为 None 时使用脚本配置的超时时间。
+
+    Returns:
+        是否按完成条件正常结束。完成方式非法、未满足完成条件就结束或 runner 退出时返回 False。
+        运行超时且未选择重试运行超时时视为运行结束，返回 True。
+
+    Raises:
+        _ScriptFailure: 运行超时（已选择重试运行超时）、无日志超时或资源超限。
     """
     start_time = time.time()
     last_status: str = ''
 
-    no_log_timeout = script_config.no_log_timeout_seconds
+    no_log_timeout = no_log_timeout_seconds
+    if no_log_timeout is None:
+        no_log_timeout = script_config.no_log_timeout_seconds
+    if run_timeout_seconds is None:
+        run_timeout_seconds = script_config.run_timeout_seconds
+
+    watcher.watch_name(script_config.game_process_name)
+    watcher.watch_name(script_config.script_process_name, known_pid=pm.main_pid)
+
+    idle_detector: IdleDetector | None = None
+    if script_config.check_done == CheckDoneMethods.PROCESS_IDLE.value.value:
+        idle_detector = IdleDetector(
+            max_cpu_percent=script_config.idle_max_cpu_percent,
+            max_io_kbps=script_config.idle_max_io_kbps,
+            window_seconds=script_config.idle_window_seconds,
+        )
 
     while True:
         is_done: bool = False
+        is_success: bool = False
         status: str = ''
 
         # 检查游戏进程状态
-        game_current_existed = is_process_existed(script_config.game_process_name)
+        game_current_existed = watcher.is_alive(script_config.game_process_name)
         game_closed = state.game_ever_existed and not game_current_existed
         state.game_ever_existed = state.game_ever_existed or game_current_existed
 
@@ -330,54 +595,88 @@ def _monitor_script_done(
             last_status = status
 
         # 检查脚本进程状态
-        script_current_existed = is_process_existed(script_config.script_process_name)
+        script_current_existed = watcher.is_alive(script_config.script_process_name)
         script_closed = state.script_ever_existed and not script_current_existed
         state.script_ever_existed = state.script_ever_existed or script_current_existed
 
         # 判断完成条件
+        now = time.time()
+        next_done_check: float | None = None
         if script_config.check_done == CheckDoneMethods.GAME_OR_SCRIPT_CLOSED.value.value:
             if game_closed or script_closed:
-                is_done = True
+                is_done = is_success = True
                 print_message(f'游戏或脚本被关闭 {script_config.game_display_name}', level='PASS')
         elif script_config.check_done == CheckDoneMethods.GAME_CLOSED.value.value:
             if game_closed:
-                is_done = True
+                is_done = is_success = True
                 print_message(f'游戏被关闭 {script_config.game_display_name}', level='PASS')
         elif script_config.check_done == CheckDoneMethods.SCRIPT_CLOSED.value.value:
             if script_closed:
-                is_done = True
+                is_done = is_success = True
                 print_message(f'脚本被关闭 {script_config.script_display_name}', level='PASS')
+        elif script_config.check_done == CheckDoneMethods.STDOUT_MATCHED.value.value:
+            if state.done_matched_time is not None:
+                next_done_check = state.done_matched_time + script_config.done_pattern_delay_seconds
+                if now >= next_done_check or script_closed:
+                    is_done = is_success = True
+                    print_message(f'匹配到完成日志 {script_config.script_display_name}', level='PASS')
+            elif script_closed:
+                is_done = True
+                print_message(f'脚本已关闭但未匹配到完成日志 {script_config.script_display_name}', level='ERROR')
+        elif idle_detector is not None:
+            if _check_process_idle(script_config, state, pm, watcher, idle_detector):
+                is_done = is_success = True
+                print_message(
+                    f'进程持续空闲 {script_config.idle_window_seconds} 秒 {script_config.script_display_name}',
+                    level='PASS',
+                )
+            else:
+                next_done_check = now + idle_detector.sample_interval
         else:
             print_message(f'未知的检查结束方式 {script_config.check_done}', level='ERROR')
             is_done = True
 
-        now = time.time()
+        if is_done:
+            return is_success
+
+        # 资源上限检查（由资源采样线程写入）
+        if state.resource_breach is not None:
+            print_message(f'脚本资源超限 {state.resource_breach} {script_config.script_display_name}', level='ERROR')
+            raise _ScriptFailure(FailureClasses.RESOURCE_LIMIT.value.value, state.resource_breach)
 
         # 总运行超时检查
-        if now - start_time > script_config.run_timeout_seconds:
-            is_done = True
+        run_deadline = start_time + run_timeout_seconds
+        if now > run_deadline:
             print_message(f'脚本运行超时 {script_config.script_display_name}', level='ERROR')
-
-        if is_done:
-            break
+            if _is_run_timeout_failure(script_config):
+                raise _ScriptFailure(FailureClasses.RUN_TIMEOUT.value.value)
+            return True
 
         # 静默超时检查（无日志输出超时，触发重启）
-        if (
-            no_log_timeout > 0
-            and state.last_log_time is not None
-            and now - state.last_log_time > no_log_timeout
-        ):
-            print_message(
-                f'脚本超过 {no_log_timeout} 秒无日志输出，判定为未响应 {script_config.script_display_name}',
-                level='ERROR',
-            )
-            raise _NoLogTimeoutError()
+        next_check = run_deadline if next_done_check is None else min(run_deadline, next_done_check)
+        if no_log_timeout > 0 and state.last_log_time is not None:
+            no_log_deadline = state.last_log_time + no_log_timeout
+            if now > no_log_deadline:
+                print_message(
+                    f'脚本超过 {no_log_timeout} 秒无日志输出，判定为未响应 {script_config.script_display_name}',
+                    level='ERROR',
+                )
+                raise _ScriptFailure(FailureClasses.NO_LOG_TIMEOUT.value.value)
+            next_check = min(next_check, no_log_deadline)
 
-        if _exit_controller.wait(1):
-            break
+        # 阻塞等待进程出现/退出事件，最迟在下一个超时检查点醒来
+        watcher.wait_changed(next_check - now + 0.01)
+        if _exit_controller.is_shutdown_requested():
+            return False
 
 
-def _cleanup_processes(script_config: ScriptConfig, pm: ProcessManager, force_script: bool = False) -> None:
+def _cleanup_processes(
+    script_config: ScriptConfig,
+    pm: ProcessManager,
+    force_script: bool = False,
+    keep_game: bool = False,
+    graceful_stop: bool = False,
+) -> None:
     """清理脚本和游戏进程。
 
     通过 ProcessManager.kill() 精确终止已追踪的进程及其子进程树（基于 PID）。
@@ -386,35 +685,137 @@ def _cleanup_processes(script_config: ScriptConfig, pm: ProcessManager, force_sc
         script_config: 脚本配置。
         pm: ProcessManager 实例。
         force_script: 是否忽略用户配置，强制终止当前被管理的脚本进程。
+        keep_game: 是否忽略用户配置，保留游戏进程留给下一个运行组使用。
+        graceful_stop: 是否先请求脚本进程自行退出，超时后再终止（ProcessManager.stop()）。
     """
     if force_script or script_config.kill_script_after_done:
         print_message(f'尝试关闭脚本进程 {pm.main_name} (pid={pm.main_pid})')
         try:
-            pm.kill()
+            if graceful_stop:
+                pm.stop()
+            else:
+                pm.kill()
         except Exception:
             log.error('通过 ProcessManager 关闭脚本进程失败', exc_info=True)
 
-    if script_config.kill_game_after_done:
-        game_name = script_config.game_process_name
-        if game_name:
-            print_message(f'尝试关闭游戏进程 {game_name}')
+    if keep_game and script_config.kill_game_after_done and script_config.game_process_name:
+        print_message(f'下一个脚本使用同一游戏 保留游戏进程 {script_config.game_process_name}')
+    elif script_config.kill_game_after_done and script_config.game_process_name:
+        _kill_game_process(script_config.game_process_name)
+
+
+def _kill_game_process(game_name: str) -> None:
+    """按进程名关闭游戏进程。"""
+    print_message(f'尝试关闭游戏进程 {game_name}')
+    try:
+        proc = find_process_by_info(ProcessInfo(name=game_name), max_age=0)
+        if proc is not None:
+            proc.terminate()
             try:
-                proc = find_process_by_info(ProcessInfo(name=game_name))
-                if proc is not None:
-                    proc.terminate()
-                    try:
-                        proc.wait(timeout=5)
-                    except Exception:
-                        with suppress(Exception):
-                            proc.kill()
+                proc.wait(timeout=5)
             except Exception:
-                log.error('关闭游戏进程失败', exc_info=True)
+                with suppress(Exception):
+                    proc.kill()
+    except Exception:
+        log.error('关闭游戏进程失败', exc_info=True)
+
+
+def _new_monitor_state(script_config: ScriptConfig) -> _RunMonitorState:
+    """创建一次脚本运行的监控状态。"""
+    state = _RunMonitorState()
+    if script_config.no_log_timeout_seconds > 0 and script_config.no_log_adaptive:
+        state.gap_histogram = GapHistogram()
+    if script_config.check_done == CheckDoneMethods.STDOUT_MATCHED.value.value:
+        state.done_pattern = re.compile(script_config.done_pattern)
+    return state
+
+
+def _start_prewarm_launch(script_config: ScriptConfig, chain_name: str) -> None:
+    """在后台提前启动脚本进程，由之后运行该脚本的 _run_script_once 接管。
+
+    启动器初始化与组间等待并行进行。启动后立即登记到活跃进程，runner 退出时会被一并清理。
+    """
+    launch = _PrewarmedLaunch(
+        script_config=script_config,
+        state=_new_monitor_state(script_config),
+        chain_name=chain_name,
+    )
+
+    def _launch() -> None:
+        pm = _launch_script(script_config, None, launch.state)
+        with _active_pms_lock:
+            _active_pms.add(pm)
+        launch.pm = pm
+        if _exit_controller.is_shutdown_requested():
+            _cleanup_active_pm()
+
+    launch.thread = threading.Thread(target=_launch, name='script_prewarm', daemon=True)
+    with _prewarmed_launches_lock:
+        _prewarmed_launches[id(script_config)] = launch
+    print_message(f'提前启动下一个脚本 {script_config.script_display_name}')
+    launch.thread.start()
+
+
+def _take_prewarmed_launch(script_config: ScriptConfig) -> _PrewarmedLaunch | None:
+    """取出脚本已提前启动的进程，等待启动完成。没有提前启动或启动失败时返回 None。"""
+    with _prewarmed_launches_lock:
+        launch = _prewarmed_launches.pop(id(script_config), None)
+    if launch is None:
+        return None
+    if launch.thread is not None:
+        launch.thread.join()
+    if launch.pm is None or launch.pm.process is None:
+        return None
+    return launch
+
+
+def _discard_prewarmed_launches(chain_name: str) -> None:
+    """关闭脚本链中所有未被接管的提前启动进程，其它脚本链的不受影响。"""
+    with _prewarmed_launches_lock:
+        keys = [key for key, launch in _prewarmed_launches.items() if launch.chain_name == chain_name]
+        launches = [_prewarmed_launches.pop(key) for key in keys]
+    for launch in launches:
+        if launch.thread is not None:
+            launch.thread.join()
+        if launch.pm is None:
+            continue
+        print_message(f'关闭未使用的提前启动进程 {launch.script_config.script_display_name}')
+        with _active_pms_lock:
+            _active_pms.discard(launch.pm)
+        with suppress(Exception):
+            launch.pm.kill()
+        if launch.state.output_archive is not None:
+            launch.state.output_archive.close()
+
+
+def _check_process_idle(
+    script_config: ScriptConfig,
+    state: _RunMonitorState,
+    pm: ProcessManager,
+    watcher: ProcessWatcher,
+    idle_detector: IdleDetector,
+) -> bool:
+    """按配置的检查对象采样一次，返回脚本进程树/游戏是否已持续空闲。
+
+    游戏尚未出现时不开始计时；脚本进程树或游戏已退出时，对应的进程组视为空闲。
+    """
+    groups: dict[str, list[int]] = {}
+    if script_config.idle_target != IdleTargets.GAME.value.value:
+        groups['script'] = list(get_tracked_pids(pm, max_age=idle_detector.sample_interval / 2))
+    if script_config.idle_target != IdleTargets.SCRIPT.value.value:
+        if not state.game_ever_existed:
+            idle_detector.reset()
+            return False
+        groups['game'] = watcher.get_pids(script_config.game_process_name)
+    return idle_detector.check(groups)
 
 
 def _run_script_once(
     script_config: ScriptConfig,
     log_notifier: LogNotifier | None = None,
-) -> None:
+    resource_summaries: dict[str, ResourceSummary] | None = None,
+    keep_game: bool = False,
+) -> bool:
     """运行单个脚本的一次完整生命周期。
 
     流程:
@@ -424,29 +825,54 @@ def _run_script_once(
         4. 监控运行状态。
         5. 清理进程。
 
-    静默超时逻辑:
-        当 script_config.no_log_timeout_seconds > 0 时，若脚本在指定时间内没有任何
-        日志输出，则认为游戏/脚本未响应，会终止当前进程并向调用方抛出
-        _NoLogTimeoutError，由链编排层决定是否重试和发送通知。
+    失败处理:
+        启动失败、未找到脚本进程、运行超时、无日志超时、资源超限或未满足完成条件就结束时，
+        会强制终止当前脚本进程并向调用方抛出 _ScriptFailure，由重试策略决定是否重试和发送通知。
+        启动前等待资源条件超时时不启动脚本，同样抛出 _ScriptFailure。
 
     Args:
         script_config: 脚本配置。
         log_notifier: 可选的日志通知器，用于定时推送日志。
-    """
-    global _active_pm
+        resource_summaries: 可选的资源占用汇总，启用采样时以脚本显示名称为键写入本次运行的汇总。
+        keep_game: 正常结束时是否不关闭游戏进程，留给下一个运行组使用。
+            运行组结束后按整组的结果决定是否关闭，见 _run_group。
+
+    Returns:
+        脚本是否成功运行完成。配置不合法或 runner 退出时返回 False。
 
+    Raises:
+        _ScriptFailure: 脚本运行失败。
+    """
     invalid_message = script_config.invalid_message
     if invalid_message is not None:
         print_message(f'脚本配置不合法 跳过运行 {invalid_message}')
-        return
+        return False
 
     script_path = script_config.script_path
-    no_log_timeout = script_config.no_log_timeout_seconds
+    no_log_timeout = _get_no_log_timeout(script_config)
 
     # 1. 启动脚本子进程
-    state = _RunMonitorState()
-    pm = _launch_script(script_config, log_notifier, state)
-    _active_pm = pm
+    prewarmed = _take_prewarmed_launch(script_config)
+    if prewarmed is not None:
+        print_message(f'接管提前启动的脚本进程 {script_config.script_display_name}')
+        state, pm = prewarmed.state, prewarmed.pm
+        state.log_notifier = log_notifier
+    else:
+        _check_preflight(script_config)
+        if _exit_controller.is_shutdown_requested():
+            return False
+        state = _new_monitor_state(script_config)
+        pm = _launch_script(script_config, log_notifier, state)
+    with _active_pms_lock:
+        _active_pms.add(pm)
+    watcher = ProcessWatcher(cancel_event=_exit_controller.shutdown_event)
+    state.on_done_matched = watcher.notify
+
+    def _on_resource_breach(breach: str) -> None:
+        state.resource_breach = breach
+        watcher.notify()
+
+    sampler = _start_resource_sampler(script_config, pm, _on_resource_breach)
     try:
         # 2. 等待子进程就绪
         # 仅当脚本进程名与启动文件名不同时才期望追踪目标进程（launcher 场景）
@@ -454,10 +880,16 @@ def _run_script_once(
             bool(script_config.script_process_name)
             and script_config.script_process_name.lower() != PurePath(script_path).name.lower()
         )
-        if not _wait_for_subprocess_ready(pm, script_path, state, expect_target=expect_target):
+        if not _wait_for_subprocess_ready(pm, script_config, state, watcher, expect_target=expect_target):
             print_message(f'子进程创建失败 {script_path}', level='ERROR')
             pm.kill()
-            return
+            if _exit_controller.is_shutdown_requested():
+                return False
+            # 启动器正常退出但一直没有出现脚本进程
+            launcher_exited = pm.process is not None and pm.process.poll() == 0
+            if expect_target and launcher_exited:
+                raise _ScriptFailure(FailureClasses.TARGET_NOT_FOUND.value.value)
+            raise _ScriptFailure(FailureClasses.LAUNCH_FAILED.value.value)
 
         print_message(f'脚本子进程创建成功 {script_path}', level='PASS')
         if no_log_timeout > 0:
@@ -465,57 +897,274 @@ def _run_script_once(
 
         # 3. 监控脚本运行状态
         try:
-            _monitor_script_done(script_config, state)
-        except _NoLogTimeoutError:
-            _cleanup_processes(script_config, pm, force_script=True)
+            is_success = _monitor_script_done(
+                script_config, state, pm, watcher, _get_run_timeout(script_config), no_log_timeout
+            )
+            if not is_success and not _exit_controller.is_shutdown_requested():
+                raise _ScriptFailure(FailureClasses.SCRIPT_FAILED.value.value)
+        except _ScriptFailure as e:
+            # 失败的脚本可能仍在运行但已不可用，强制关闭；游戏可能处于异常状态，按配置关闭。
+            # 资源超限的脚本仍能响应，先请求其自行退出
+            graceful_stop = e.failure_class == FailureClasses.RESOURCE_LIMIT.value.value
+            _cleanup_processes(script_config, pm, force_script=True, graceful_stop=graceful_stop)
             raise
 
-        # 4. 清理进程（正常退出路径）
-        _cleanup_processes(script_config, pm)
+        # 4. 清理进程（正常退出路径），保留的游戏进程由运行组按整组结果决定是否关闭
+        _cleanup_processes(script_config, pm, keep_game=keep_game)
+        # 只学习正常结束的运行，卡住的运行中的长间隔不计入
+        if is_success and state.gap_histogram is not None and _run_history is not None:
+            _run_history.merge_gap_histogram(script_config.run_key, state.gap_histogram)
+        return is_success
     finally:
-        _active_pm = None
+        if sampler is not None:
+            summary = sampler.stop()
+            if summary.sample_count > 0:
+                print_message(f'资源占用 {script_config.script_display_name} {summary.summary_text}')
+                if resource_summaries is not None:
+                    resource_summaries[script_config.script_display_name] = summary
+        watcher.close()
+        with _active_pms_lock:
+            _active_pms.discard(pm)
+        if state.output_archive is not None:
+            state.output_archive.close()
+
+
+def _check_preflight(script_config: ScriptConfig) -> None:
+    """启动脚本前等待资源条件满足。
+
+    Raises:
+        _ScriptFailure: 等待超时仍未满足。
+    """
+    if not script_config.preflight_enabled:
+        return
+    reasons = wait_preflight(script_config, _exit_controller.shutdown_event, on_status=print_message)
+    if not reasons:
+        return
+    detail = '; '.join(reasons)
+    print_message(f'启动条件未满足 {detail} {script_config.script_display_name}', level='ERROR')
+    raise _ScriptFailure(FailureClasses.PREFLIGHT_FAILED.value.value, detail)
+
+
+def _is_run_timeout_failure(script_config: ScriptConfig) -> bool:
+    """运行超时是否视为失败。
+
+    只有在失败重试中选择了运行超时时才视为失败并重试；否则与原有行为一致，
+    运行超时视为运行结束，按 kill_script_after_done 清理后继续下一个脚本（可作为最长运行时间使用）。
+    """
+    return FailureClasses.RUN_TIMEOUT.value.value in script_config.retry_failures
 
 
-def _run_external_script_with_retries(
+def _get_run_timeout(script_config: ScriptConfig) -> int:
+    """获取脚本本次运行的超时时间。
+
+    启用学习超时且历史成功样本足够时，使用历史耗时 p99 加余量，否则使用配置的超时时间。
+    """
+    if not script_config.learn_run_timeout or _run_history is None:
+        return script_config.run_timeout_seconds
+    learned = _run_history.get_learned_timeout(script_config.run_key, script_config.run_timeout_seconds)
+    if learned is None:
+        return script_config.run_timeout_seconds
+    if learned < script_config.run_timeout_seconds:
+        print_message(f'按历史运行耗时 超时时间调整为 {learned} 秒 {script_config.script_display_name}')
+    return learned
+
+
+def _get_no_log_timeout(script_config: ScriptConfig) -> int:
+    """获取脚本本次运行的无日志超时时间，0 表示不检查。
+
+    启用自适应无日志超时且历史输出间隔样本足够时，使用间隔 p99.5 乘以倍数（不超过配置的超时时间），
+    否则使用配置的超时时间。
+    """
+    configured = script_config.no_log_timeout_seconds
+    if configured <= 0 or not script_config.no_log_adaptive or _run_history is None:
+        return configured
+    histogram = _run_history.get_gap_histogram(script_config.run_key)
+    learned = get_stall_timeout(histogram, script_config.no_log_adaptive_factor, configured)
+    if learned is None:
+        return configured
+    if learned < configured:
+        print_message(f'按历史输出间隔 无日志超时调整为 {learned} 秒 {script_config.script_display_name}')
+    return learned
+
+
+def _record_run_history(
+    chain_name: str,
     script_config: ScriptConfig,
+    start_time: float,
+    is_success: bool,
+    retries: int = 0,
+    attempt_start_time: float | None = None,
+) -> None:
+    """记录一次脚本运行到运行历史。"""
+    if _run_history is None:
+        return
+    if _exit_controller.is_shutdown_requested():
+        outcome = ScriptOutcome.CANCELLED
+    else:
+        outcome = ScriptOutcome.SUCCESS if is_success else ScriptOutcome.FAILED
+    _run_history.record(
+        chain_name=chain_name,
+        run_key=script_config.run_key,
+        start_time=start_time,
+        end_time=time.time(),
+        outcome=outcome,
+        retries=retries,
+        attempt_start_time=attempt_start_time,
+    )
+
+
+def _start_resource_sampler(
+    script_config: ScriptConfig,
+    pm: ProcessManager,
+    on_breach: Callable[[str], None] | None = None,
+) -> ResourceSampler | None:
+    """按配置为脚本进程树启动资源采样，未启用采样且未设置资源上限时返回 None。
+
+    只设置了资源上限时按 LIMIT_CHECK_INTERVAL_SECONDS 采样，不写入采样文件。
+    """
+    limits = ResourceLimits(
+        max_rss_mb=script_config.max_rss_mb,
+        max_handles=script_config.max_handles,
+        max_threads=script_config.max_threads,
+    )
+    telemetry_enabled = script_config.telemetry_interval_seconds > 0
+    if not telemetry_enabled and not limits.enabled:
+        return None
+    output_path = None
+    if telemetry_enabled and _telemetry_dir is not None:
+        safe_name = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in script_config.script_display_name)
+        file_name = f'{datetime.datetime.now().strftime("%Y%m%d_%H%M%S")}_{safe_name}_{pm.process.pid}.bin'
+        output_path = os.path.join(_telemetry_dir, file_name)
+    interval = script_config.telemetry_interval_seconds if telemetry_enabled else LIMIT_CHECK_INTERVAL_SECONDS
+    sampler = ResourceSampler(pm, interval, output_path, limits=limits, on_breach=on_breach)
+    sampler.start()
+    return sampler
+
+
+def _get_retry_policy(script_config: ScriptConfig) -> RetryPolicy:
+    """按脚本配置生成重试策略。无日志超时按原有的 no_log_max_retries 重试，
+    设置了资源上限时资源超限按 resource_limit_max_retries 重试。
+    """
+    max_retries = dict.fromkeys(script_config.retry_failures, script_config.retry_max_retries)
+    if script_config.no_log_timeout_seconds > 0:
+        max_retries[FailureClasses.NO_LOG_TIMEOUT.value.value] = script_config.no_log_max_retries
+    else:
+        max_retries.pop(FailureClasses.NO_LOG_TIMEOUT.value.value, None)
+    if script_config.resource_limits_enabled:
+        max_retries[FailureClasses.RESOURCE_LIMIT.value.value] = script_config.resource_limit_max_retries
+    else:
+        max_retries.pop(FailureClasses.RESOURCE_LIMIT.value.value, None)
+    return RetryPolicy(
+        max_retries=max_retries,
+        backoff_seconds=script_config.retry_backoff_seconds,
+        backoff_max_seconds=script_config.retry_backoff_max_seconds,
+        kill_game=script_config.retry_kill_game,
+    )
+
+
+def _run_script_with_retries(
+    script_config: ScriptConfig,
+    run_once: Callable[[], bool],
     log_notifier: LogNotifier | None = None,
     ctx: ScriptChainerContext | None = None,
     chain_name: str = '',
-) -> None:
-    """运行外部脚本，并在静默超时时按配置重试。"""
-    max_retries = (
-        script_config.no_log_max_retries
-        if script_config.no_log_timeout_seconds > 0
-        else 0
-    )
-    for retry_count in range(max_retries + 1):
-        if retry_count > 0:
+) -> bool:
+    """运行脚本，失败时按重试策略重试，外部脚本和 Python 脚本共用。
+
+    每种失败类型分别计算重试次数，重试前按策略关闭游戏并退避等待。
+
+    Args:
+        script_config: 脚本配置。
+        run_once: 运行一次脚本，失败时抛出 _ScriptFailure。
+        log_notifier: 可选的日志通知器，重试前推送已有日志。
+        ctx: 上下文，用于推送重试通知。
+        chain_name: 脚本链名称。
+
+    Returns:
+        脚本是否成功运行完成。
+    """
+    policy = _get_retry_policy(script_config)
+    display_name = script_config.script_display_name
+    start_time = time.time()
+    attempt_start_time = start_time
+    retry_counts: dict[str, int] = {}
+    retry_count = 0
+    is_success = False
+    try:
+        while True:
+            attempt_start_time = time.time()
+            try:
+                is_success = run_once()
+                return is_success
+            except _ScriptFailure as e:
+                failure_class = e.failure_class
+                failure_detail = e.detail
+            if _exit_controller.is_shutdown_requested():
+                return False
+            # 资源超限说明脚本可能存在泄漏，不论是否重试都通知
+            if failure_class == FailureClasses.RESOURCE_LIMIT.value.value:
+                _push_chain_notification(ctx, chain_name, '资源超限', script_config, failure_detail)
+
+            max_retries = policy.get_max_retries(failure_class)
+            failure_retries = retry_counts.get(failure_class, 0)
+            if not policy.should_retry(failure_class, failure_retries):
+                if max_retries > 0:
+                    print_message(f'已达最大重试次数 ({max_retries})，放弃重试 {display_name}', level='ERROR')
+                return False
+            failure_retries += 1
+            retry_counts[failure_class] = failure_retries
+            retry_count += 1
+
+            failure_item = get_config_item_from_enum(FailureClasses, failure_class)
+            failure_label = failure_item.label if failure_item is not None else failure_class
             if log_notifier is not None:
                 log_notifier.flush()
-            print_message(
-                f'重试运行脚本 ({retry_count}/{max_retries}) '
-                f'{script_config.script_display_name}',
-                level='INFO',
-            )
             if script_config.notify_start:
                 _push_chain_notification(
                     ctx,
                     chain_name,
-                    f'无日志超时重试 ({retry_count}/{max_retries})',
+                    f'{failure_label}重试 ({failure_retries}/{max_retries})',
                     script_config,
+                    failure_detail,
                 )
-        try:
-            _run_script_once(script_config, log_notifier)
-            return
-        except _NoLogTimeoutError:
-            if retry_count < max_retries:
-                continue
+            if policy.kill_game and script_config.game_process_name:
+                _kill_game_process(script_config.game_process_name)
+            backoff_seconds = policy.get_backoff_seconds(retry_count)
+            if backoff_seconds > 0:
+                print_message(f'{failure_label} {backoff_seconds:.0f} 秒后重试 {display_name}')
+                if _exit_controller.wait(backoff_seconds):
+                    return False
             print_message(
-                f'已达最大重试次数 ({max_retries})，放弃重启 '
-                f'{script_config.script_display_name}',
-                level='ERROR',
+                f'重试运行脚本 {failure_label} ({failure_retries}/{max_retries}) {display_name}',
+                level='INFO',
             )
-            return
+    finally:
+        _record_run_history(chain_name, script_config, start_time, is_success, retry_count, attempt_start_time)
+
+
+def _run_python_script_once(
+    script_config: ScriptConfig,
+    log_notifier: LogNotifier | None = None,
+    chain_name: str = '',
+) -> bool:
+    """执行一次 Python 脚本，执行失败时抛出 _ScriptFailure。配置不合法时直接返回 False，不重试。
+
+    脚本链启用了工作进程池时在工作进程中执行，否则在当前进程内串行执行。
+    """
+    with _python_worker_pools_lock:
+        pool = _python_worker_pools.get(chain_name)
+    if pool is not None:
+        is_success = _run_python_script_in_worker(script_config, pool, log_notifier)
+    else:
+        with _python_exec_lock:
+            is_success = _run_python_script(script_config, log_notifier)
+    if (
+        not is_success
+        and script_config.invalid_message is None
+        and not _exit_controller.is_shutdown_requested()
+    ):
+        raise _ScriptFailure(FailureClasses.SCRIPT_FAILED.value.value)
+    return is_success
 
 
 def _run_script_in_group(
@@ -523,21 +1172,47 @@ def _run_script_in_group(
     log_notifier: LogNotifier | None = None,
     ctx: ScriptChainerContext | None = None,
     chain_name: str = '',
-) -> None:
-    """运行运行组中的单个脚本。"""
+    resource_summaries: dict[str, ResourceSummary] | None = None,
+    keep_game: bool = False,
+) -> bool:
+    """运行运行组中的单个脚本。
+
+    Returns:
+        脚本是否成功运行完成。
+    """
+    if script_config.script_type == ScriptType.PYTHON:
+        run_once = partial(_run_python_script_once, script_config, log_notifier, chain_name)
+    else:
+        run_once = partial(_run_script_once, script_config, log_notifier, resource_summaries, keep_game)
+
     try:
-        if script_config.script_type == ScriptType.PYTHON:
-            _run_python_script(script_config, log_notifier)
-        else:
-            _run_external_script_with_retries(script_config, log_notifier, ctx, chain_name)
+        is_success = _run_script_with_retries(script_config, run_once, log_notifier, ctx, chain_name)
     except Exception:
         log.error('脚本执行异常', exc_info=True)
+        return False
+
+    if is_success and script_config.once_per_day:
+        try:
+            _get_chain_record(chain_name).record_done(script_config)
+        except Exception:
+            log.error('记录脚本完成状态失败', exc_info=True)
+    return is_success
+
+
+def _get_chain_record(chain_name: str) -> ScriptChainRecord:
+    """获取脚本链的完成记录，同一脚本链在进程内共用一个实例。"""
+    with _chain_records_lock:
+        record = _chain_records.get(chain_name)
+        if record is None:
+            record = ScriptChainRecord(chain_name)
+            _chain_records[chain_name] = record
+        return record
 
 
 def _run_python_script(
     script_config: ScriptConfig,
     log_notifier: LogNotifier | None = None,
-) -> None:
+) -> bool:
     """执行 Python 类型的脚本。
 
     读取 .py 文件并用 exec() 在当前进程中执行。
@@ -545,25 +1220,19 @@ def _run_python_script(
     Args:
         script_config: 脚本配置（script_type == 'python'）。
         log_notifier: 可选的日志通知器，用于定时推送日志。
+
+    Returns:
+        脚本是否执行成功，空脚本视为成功。
     """
     script_file = Path(script_config.script_path)
     display_name = script_config.script_display_name
 
-    invalid_msg = script_config.invalid_message
-    if invalid_msg is not None:
-        print_message(f'Python 脚本配置不合法 跳过运行 {invalid_msg}')
-        return
-
-    try:
-        code = script_file.read_text(encoding='utf-8')
-    except Exception as e:
-        print_message(f'读取 Python 脚本失败 {display_name}: {e}', level='ERROR')
-        log.error('读取 Python 脚本失败', exc_info=True)
-        return
-
-    if not code or not code.strip():
+    script_code = _load_python_script(script_config)
+    if script_code is None:
+        return False
+    if script_code.is_empty:
         print_message(f'Python 脚本为空 跳过 {display_name}')
-        return
+        return True
 
     print_message(f'执行 Python 脚本 {display_name}...')
     old_argv = sys.argv[:]
@@ -593,21 +1262,24 @@ def _run_python_script(
         with force_exit_on_console_close(
             lambda: _exit_controller.exit(_cleanup_active_pm, force=True)
         ):
-            exec(compile(code, script_path, 'exec'), exec_globals)
+            exec(script_code.code, exec_globals)
             if _exit_controller.is_shutdown_requested():
                 raise SystemExit(1)
         print_message(f'Python 脚本执行完成 {display_name}', level='PASS')
+        return True
     except SystemExit as e:
         if _exit_controller.is_shutdown_requested():
             raise
         if e.code in (0, None):
             print_message(f'Python 脚本执行完成 {display_name}', level='PASS')
-        else:
-            print_message(f'Python 脚本执行失败 {display_name}: exit={e.code}', level='ERROR')
-            log.error('Python 脚本通过 SystemExit 退出: %s', e.code)
+            return True
+        print_message(f'Python 脚本执行失败 {display_name}: exit={e.code}', level='ERROR')
+        log.error('Python 脚本通过 SystemExit 退出: %s', e.code)
+        return False
     except Exception as e:
         print_message(f'Python 脚本执行失败 {display_name}: {e}', level='ERROR')
         log.error('Python 脚本执行失败', exc_info=True)
+        return False
     finally:
         sys.stdout = old_stdout
         sys.argv = old_argv
@@ -616,105 +1288,656 @@ def _run_python_script(
             os.chdir(old_cwd)
 
 
+def _load_python_script(script_config: ScriptConfig) -> ScriptCode | None:
+    """编译 Python 脚本，源码未变化时直接使用字节码缓存。
+
+    Returns:
+        编译后的脚本，配置不合法、读取失败或编译失败时返回 None。
+    """
+    invalid_msg = script_config.invalid_message
+    if invalid_msg is not None:
+        print_message(f'Python 脚本配置不合法 跳过运行 {invalid_msg}')
+        return None
+
+    display_name = script_config.script_display_name
+    try:
+        return load_script_code(script_config.script_path, _bytecode_cache_dir)
+    except OSError as e:
+        print_message(f'读取 Python 脚本失败 {display_name}: {e}', level='ERROR')
+        log.error('读取 Python 脚本失败', exc_info=True)
+    except (SyntaxError, ValueError) as e:
+        print_message(f'Python 脚本执行失败 {display_name}: {e}', level='ERROR')
+        log.error('编译 Python 脚本失败', exc_info=True)
+    return None
+
+
+def _run_python_script_in_worker(
+    script_config: ScriptConfig,
+    pool: PythonWorkerPool,
+    log_notifier: LogNotifier | None = None,
+    cancel_event: threading.Event | None = None,
+) -> bool:
+    """在工作进程中执行 Python 类型的脚本，脚本输出与外部脚本一样带前缀输出。
+
+    Args:
+        script_config: 脚本配置（script_type == 'python'）。
+        pool: 工作进程池。
+        log_notifier: 可选的日志通知器，用于定时推送日志。
+        cancel_event: 设置后强制结束脚本，默认为 runner 退出事件。
+
+    Returns:
+        脚本是否执行成功，空脚本视为成功，运行超时且未选择重试运行超时时视为成功。
+
+    Raises:
+        _ScriptFailure: 运行超时（已选择重试运行超时）。
+    """
+    display_name = script_config.script_display_name
+    script_code = _load_python_script(script_config)
+    if script_code is None:
+        return False
+    if script_code.is_empty:
+        print_message(f'Python 脚本为空 跳过 {display_name}')
+        return True
+
+    print_message(f'执行 Python 脚本 {display_name}...')
+    result = pool.run(
+        PythonJob(script_path=script_config.script_path, code=marshal.dumps(script_code.code)),
+        output_callback=_make_stdout_callback(display_name, log_notifier),
+        timeout_seconds=_get_run_timeout(script_config),
+        cancel_event=cancel_event if cancel_event is not None else _exit_controller.shutdown_event,
+    )
+    if result.cancelled:
+        return False
+    if result.timed_out:
+        print_message(f'Python 脚本运行超时 {display_name}', level='ERROR')
+        if _is_run_timeout_failure(script_config):
+            raise _ScriptFailure(FailureClasses.RUN_TIMEOUT.value.value)
+        return True
+    if not result.is_success:
+        print_message(f'Python 脚本执行失败 {display_name}: exit={result.exit_code}', level='ERROR')
+        return False
+    print_message(f'Python 脚本执行完成 {display_name}', level='PASS')
+    return True
+
+
+def _start_python_worker_pool(chain_name: str, size: int, runtime_groups: list[RuntimeGroup]) -> None:
+    """运行组中有 Python 脚本时，为脚本链创建工作进程池并在后台预先启动工作进程。"""
+    if size <= 0:
+        return
+    if not any(
+        i.script_type == ScriptType.PYTHON
+        for group in runtime_groups
+        for i in group.scripts + group.sidecars
+    ):
+        return
+    pool = PythonWorkerPool(size)
+    with _python_worker_pools_lock:
+        old_pool = _python_worker_pools.pop(chain_name, None)
+        _python_worker_pools[chain_name] = pool
+    if old_pool is not None:
+        old_pool.close()
+    pool.start()
+
+
+def _start_sidecars(
+    group: RuntimeGroup,
+    chain_name: str,
+    log_notifier: LogNotifier | None = None,
+) -> list[_Sidecar]:
+    """启动运行组的伴随脚本，每个伴随脚本在单独的线程中通过工作进程运行。
+
+    伴随脚本需要在被挂靠脚本结束时强制停止，只能在工作进程中运行，脚本链未启用工作进程池时不运行。
+    """
+    if not group.sidecars:
+        return []
+    with _python_worker_pools_lock:
+        pool = _python_worker_pools.get(chain_name)
+    if pool is None:
+        names = ', '.join(i.script_display_name for i in group.sidecars)
+        print_message(f'未启用 Python 工作进程池 伴随脚本不运行 {names}', level='ERROR')
+        return []
+
+    sidecars: list[_Sidecar] = []
+    for script_config in group.sidecars:
+        sidecar = _Sidecar(script_config=script_config, cancel_event=threading.Event())
+        sidecar.thread = threading.Thread(
+            target=_run_sidecar,
+            args=(sidecar, pool, log_notifier),
+            name=f'sidecar_{script_config.idx}',
+            daemon=True,
+        )
+        print_message(f'启动伴随脚本 {script_config.script_display_name}')
+        sidecar.thread.start()
+        sidecars.append(sidecar)
+    return sidecars
+
+
+def _run_sidecar(sidecar: _Sidecar, pool: PythonWorkerPool, log_notifier: LogNotifier | None) -> None:
+    """运行伴随脚本直到其自行结束或被停止。伴随脚本的结果不影响运行组的结果。"""
+    try:
+        _run_python_script_in_worker(sidecar.script_config, pool, log_notifier, sidecar.cancel_event)
+    except _ScriptFailure:
+        # 运行超时，已输出提示
+        pass
+    except Exception:
+        log.error('伴随脚本执行异常 %s', sidecar.script_config.script_display_name, exc_info=True)
+
+
+def _stop_sidecars(sidecars: list[_Sidecar]) -> None:
+    """停止仍在运行的伴随脚本并等待其线程结束。"""
+    for sidecar in sidecars:
+        if sidecar.thread is not None and sidecar.thread.is_alive():
+            print_message(f'停止伴随脚本 {sidecar.script_config.script_display_name}')
+        sidecar.cancel_event.set()
+    for sidecar in sidecars:
+        if sidecar.thread is not None:
+            sidecar.thread.join(timeout=10)
+
+
+def _close_python_worker_pool(chain_name: str) -> None:
+    """关闭脚本链的工作进程池。"""
+    with _python_worker_pools_lock:
+        pool = _python_worker_pools.pop(chain_name, None)
+    if pool is not None:
+        pool.close()
+
+
 def _cleanup_active_pm():
-    """清理当前活跃的 ProcessManager 子进程。"""
-    global _active_pm
-    if _active_pm is not None:
+    """清理当前活跃的 ProcessManager 子进程和 Python 脚本工作进程。"""
+    with _active_pms_lock:
+        pms = list(_active_pms)
+        _active_pms.clear()
+    for pm in pms:
         with suppress(Exception):
-            _active_pm.kill()
-        _active_pm = None
+            pm.kill()
+    with _python_worker_pools_lock:
+        pools = list(_python_worker_pools.values())
+        _python_worker_pools.clear()
+    for pool in pools:
+        with suppress(Exception):
+            pool.close()
 
 
-def run_chain(chain_name: str = '01', shutdown_delay: int = 0, debug_index: int | None = None) -> None:
-    """运行指定的脚本链。
+def stop_active_run() -> None:
+    """停止当前的运行: 不再启动新的脚本，并关闭正在运行的脚本进程和 Python 脚本工作进程。"""
+    _exit_controller.shutdown_event.set()
+    _cleanup_active_pm()
+
+
+def reset_stop_request() -> None:
+    """清除停止请求，之后可以再次运行脚本链。"""
+    _exit_controller.reset()
+
+
+def is_stop_requested() -> bool:
+    return _exit_controller.is_shutdown_requested()
+
+
+def _run_group(
+    group: RuntimeGroup,
+    ctx: ScriptChainerContext | None,
+    chain_name: str,
+    is_debug: bool = False,
+    run_id: str | None = None,
+    start_detail: str = '',
+    keep_game_name: str = '',
+) -> bool:
+    """运行一个运行组: 推送开始通知，按顺序运行组内脚本，推送结束通知。
 
     Args:
+        group: 运行组。
+        ctx: 上下文，为 None 时不推送通知。
         chain_name: 脚本链名称。
-        shutdown_delay: 运行后关机延迟秒数，0 表示不关机。
-        debug_index: 调试脚本下标，None 表示运行整个脚本链，非负整数表示仅调试该下标脚本，
-            并按编排/挂靠关系一并纳入与其关联的脚本。
+        is_debug: 是否调试运行。
+        run_id: 本次运行标识，不为 None 时在运行日志中记录运行组的开始和结果。
+        start_detail: 附加在开始通知中的内容。
+        keep_game_name: 结束后保留的游戏进程名称，下一个运行组使用同一游戏时不关闭。
+            组内脚本结束时都不关闭该游戏，整组成功完成才保留，否则在运行组结束时关闭。
+
+    Returns:
+        组内脚本是否全部成功运行完成，也即 keep_game_name 对应的游戏进程是否被保留。
+    """
+    journal = _run_journal if run_id is not None else None
+    if journal is not None:
+        journal.record(run_id, chain_name, JournalEvent.GROUP_START, group.key)
+    outcome = GroupOutcome.FAILED
+
+    log_notifier: LogNotifier | None = None
+    if ctx is not None and group.host.notify_log_interval > 0:
+        log_notifier = LogNotifier(
+            ctx=ctx,
+            title=f'{ctx.notify_config.title} - {group.host.script_display_name} 日志',
+            interval=group.host.notify_log_interval,
+        )
+        log_notifier.start()
+
+    try:
+        if group.host.notify_start:
+            _push_chain_notification(
+                ctx,
+                chain_name,
+                '调试开始' if is_debug else '开始运行',
+                group.host,
+                start_detail,
+            )
+
+        all_success = True
+        resource_summaries: dict[str, ResourceSummary] = {}
+        for script_config in group.scripts:
+            if _exit_controller.is_shutdown_requested():
+                break
+            keep_game = bool(keep_game_name) and script_config.game_process_name.lower() == keep_game_name.lower()
+            # 伴随脚本只在被挂靠脚本运行期间运行，不覆盖前置/后置脚本
+            sidecars = _start_sidecars(group, chain_name, log_notifier) if script_config is group.host else []
+            try:
+                if not _run_script_in_group(
+                    script_config, log_notifier, ctx, chain_name, resource_summaries, keep_game
+                ):
+                    all_success = False
+            finally:
+                _stop_sidecars(sidecars)
+
+        if _exit_controller.is_shutdown_requested():
+            outcome = GroupOutcome.CANCELLED
+        elif all_success:
+            outcome = GroupOutcome.SUCCESS
+
+        if group.host.notify_done:
+            _push_chain_notification(
+                ctx,
+                chain_name,
+                '调试结束' if is_debug else '运行结束',
+                group.host,
+                '\n'.join(f'{name}: {summary.summary_text}' for name, summary in resource_summaries.items()),
+            )
+        return outcome == GroupOutcome.SUCCESS
+    finally:
+        if log_notifier is not None:
+            log_notifier.stop()
+        if keep_game_name and outcome != GroupOutcome.SUCCESS:
+            # 失败或被取消时游戏可能处于异常状态，按脚本配置关闭，不留给下一个运行组
+            print_message(f'运行组未成功完成 不保留游戏进程 {keep_game_name}')
+            _kill_game_process(keep_game_name)
+        if journal is not None:
+            if _exit_controller.is_shutdown_requested():
+                outcome = GroupOutcome.CANCELLED
+            journal.record(run_id, chain_name, JournalEvent.GROUP_FINISH, group.key, outcome)
+
+
+def _run_groups_in_order(
+    runtime_groups: list[RuntimeGroup],
+    ctx: ScriptChainerContext | None,
+    chain_name: str,
+    is_debug: bool = False,
+    lock_registry: ResourceLockRegistry | None = None,
+    transition_gate: TransitionGateConfig | None = None,
+    run_id: str | None = None,
+    start_detail: str = '',
+) -> int:
+    """按顺序逐个运行运行组，组间按切换条件等待（未启用时固定等待 10 秒）。
+
+    相邻运行组使用同一游戏进程时，前一个运行组成功结束后不关闭游戏，避免下一个运行组重新启动游戏。
+    下一个运行组的第一个脚本配置了提前启动时，在当前运行组结束后立即启动其脚本进程，与组间等待并行。
+
+    Args:
+        lock_registry: 多个脚本链同时运行时共享的资源锁，运行每个组前需要先获取该组的锁。
+        transition_gate: 运行组之间的切换条件。
+        run_id: 本次运行标识，不为 None 时记录运行日志。
+        start_detail: 附加在第一个运行组开始通知中的内容。
+
+    Returns:
+        已运行完成的运行组数量。
+    """
+    finished_count = 0
+    warm_game_names = get_warm_game_names(runtime_groups)
+    for group_idx, group in enumerate(runtime_groups):
+        locks = get_group_locks(group) if lock_registry is not None else set()
+        if lock_registry is not None and not lock_registry.acquire(locks, _exit_controller.shutdown_event):
+            break
+        keep_game_name = warm_game_names[group_idx]
+        try:
+            is_success = _run_group(
+                group, ctx, chain_name, is_debug, run_id,
+                start_detail if group_idx == 0 else '', keep_game_name,
+            )
+            finished_count += 1
+        finally:
+            if lock_registry is not None:
+                lock_registry.release(locks)
+
+        if group_idx < len(runtime_groups) - 1:
+            process_names = get_teardown_process_names(group)
+            # 运行组成功完成时才保留游戏，失败时游戏已在 _run_group 结束时关闭，需要等待其退出
+            if keep_game_name and is_success:
+                process_names = [i for i in process_names if i.lower() != keep_game_name.lower()]
+            gate = transition_gate if transition_gate is not None else TransitionGateConfig()
+            if _prewarm_next_group(runtime_groups[group_idx + 1], chain_name):
+                # 启动器初始化本身会占用 CPU，不再等待 CPU 空闲
+                gate = replace(gate, max_cpu_percent=100)
+            if not wait_transition_gate(
+                config=gate,
+                process_names=process_names,
+                stop_event=_exit_controller.shutdown_event,
+                on_status=print_message,
+            ):
+                break
+    return finished_count
+
+
+def _prewarm_next_group(group: RuntimeGroup, chain_name: str) -> bool:
+    """下一个运行组的第一个脚本配置了提前启动时，提前启动其脚本进程。
+    设置了启动前检查的脚本需要在启动时检查资源条件，不提前启动。
+
+    Returns:
+        是否已提前启动。
+    """
+    script_config = group.scripts[0]
+    if (
+        not script_config.prewarm_launch
+        or script_config.script_type != ScriptType.EXTERNAL
+        or script_config.invalid_message is not None
+        or script_config.preflight_enabled
+        or _exit_controller.is_shutdown_requested()
+    ):
+        return False
+    _start_prewarm_launch(script_config, chain_name)
+    return True
+
+
+def _run_groups_in_parallel(
+    runtime_groups: list[RuntimeGroup],
+    ctx: ScriptChainerContext | None,
+    chain_name: str,
+    max_parallel: int,
+    is_debug: bool = False,
+    lock_registry: ResourceLockRegistry | None = None,
+    run_id: str | None = None,
+    start_detail: str = '',
+) -> int:
+    """按依赖关系和资源锁并行运行运行组。依赖失败的运行组不运行。
+
+    Args:
+        run_id: 本次运行标识，不为 None 时记录运行日志。
+        start_detail: 附加在最先开始的运行组开始通知中的内容。
+
+    Returns:
+        已运行完成的运行组数量。
+
+    Raises:
+        ValueError: 依赖关系存在环时抛出。
+    """
+    finished_count = 0
+    started_count = 0
+    count_lock = threading.Lock()
+
+    def _run_group_safely(group: RuntimeGroup) -> bool:
+        nonlocal finished_count, started_count
+        with count_lock:
+            detail = start_detail if started_count == 0 else ''
+            started_count += 1
+        success = False
+        try:
+            success = _run_group(group, ctx, chain_name, is_debug, run_id, detail)
+        except Exception:
+            log.error('运行组执行异常', exc_info=True)
+        with count_lock:
+            finished_count += 1
+        return success
+
+    def _on_skip(group: RuntimeGroup, failed_dep: RuntimeGroup) -> None:
+        print_message(
+            f'依赖脚本运行失败 跳过 {group.host.script_display_name} -> {failed_dep.host.script_display_name}',
+            'ERROR',
+        )
+
+    scheduler = ChainScheduler(
+        groups=runtime_groups,
+        run_group=_run_group_safely,
+        max_parallel=max_parallel,
+        cancel_event=_exit_controller.shutdown_event,
+        lock_registry=lock_registry,
+        on_skip=_on_skip,
+    )
+    for message in scheduler.messages:
+        print_message(message)
+    print_message(f'并行运行脚本链 {chain_name} 最大并行数 {scheduler.max_parallel}')
+    scheduler.run()
+    return finished_count
+
+
+def execute_chain(
+    ctx: ScriptChainerContext | None,
+    chain_name: str,
+    debug_index: int | None = None,
+    lock_registry: ResourceLockRegistry | None = None,
+    resume: bool = False,
+) -> ChainRunSummary:
+    """在已初始化的 runner 环境中运行一个脚本链。
+
+    脚本链配置的 max_parallel 大于 1 时，按脚本配置的 after 依赖和资源锁并行运行运行组，
+    否则按顺序逐个运行。非调试运行会在运行日志中记录每个运行组的结果，
+    并跳过配置了每个游戏日只运行一次且本游戏日已成功完成的脚本。
+
+    Args:
+        ctx: 上下文，为 None 时不推送通知。
+        chain_name: 脚本链名称。
+        debug_index: 调试脚本下标，None 表示运行整个脚本链。
+        lock_registry: 多个脚本链同时运行时共享的资源锁。
+        resume: 是否跳过运行日志中上次被中断的运行已成功完成的运行组。调试运行时忽略。
+
+    Returns:
+        脚本链运行汇总。
+    """
+    summary = ChainRunSummary(chain_name=chain_name)
+    start_time = time.time()
+    try:
+        chain_config: ScriptChainConfig = ScriptChainConfig(chain_name)
+        if not chain_config.is_file_exists():
+            summary.error = f'脚本链配置不存在 {chain_name}'
+            print_message(summary.error, "ERROR")
+            return summary
+
+        attach_targets = chain_config.compute_attach_targets()
+        try:
+            selection = build_runtime_selection(
+                chain_config.script_list,
+                attach_targets,
+                debug_index=debug_index,
+            )
+        except ValueError as e:
+            summary.error = str(e)
+            print_message(summary.error, 'ERROR')
+            return summary
+
+        if selection.debug_target is not None:
+            print_message(f'调试运行脚本链 {chain_name}: {selection.debug_target.script_display_name}')
+
+        # 调试运行不跳过本游戏日已完成的脚本
+        runtime_groups, skipped_messages = resolve_runtime_groups(
+            selection,
+            _get_chain_record(chain_name).is_done_today if debug_index is None else None,
+        )
+        summary.group_count = len(runtime_groups)
+
+        for message in skipped_messages:
+            print_message(message)
+
+        is_debug = debug_index is not None
+        journal = _run_journal if not is_debug else None
+        run_id: str | None = None
+        if resume and journal is not None:
+            run_id, runtime_groups = _skip_completed_groups(journal, chain_name, runtime_groups)
+            summary.resumed_group_count = summary.group_count - len(runtime_groups)
+
+        eta_text = _get_chain_eta_text(runtime_groups, chain_config.max_parallel)
+        if eta_text:
+            print_message(eta_text)
+
+        _start_python_worker_pool(chain_name, chain_config.python_worker_pool_size, runtime_groups)
+        if journal is not None:
+            # 恢复运行沿用被中断的运行标识，再次中断后恢复时仍能跳过之前完成的运行组
+            if run_id is None:
+                run_id = RunJournal.new_run_id()
+            journal.record(run_id, chain_name, JournalEvent.RUN_START)
+        run_finished = False
+        try:
+            if chain_config.max_parallel > 1 and len(runtime_groups) > 1:
+                try:
+                    summary.finished_group_count = _run_groups_in_parallel(
+                        runtime_groups, ctx, chain_name, chain_config.max_parallel, is_debug,
+                        lock_registry, run_id, eta_text,
+                    )
+                except ValueError as e:
+                    summary.error = str(e)
+                    print_message(summary.error, 'ERROR')
+                    return summary
+            else:
+                summary.finished_group_count = _run_groups_in_order(
+                    runtime_groups, ctx, chain_name, is_debug, lock_registry,
+                    chain_config.transition_gate, run_id, eta_text,
+                )
+            run_finished = not _exit_controller.is_shutdown_requested()
+        finally:
+            _discard_prewarmed_launches(chain_name)
+            _close_python_worker_pool(chain_name)
+            if journal is not None:
+                journal.record(
+                    run_id, chain_name, JournalEvent.RUN_FINISH,
+                    outcome=GroupOutcome.SUCCESS if run_finished else GroupOutcome.CANCELLED,
+                )
+
+        print_message('已完成调试脚本' if is_debug else f'已完成全部脚本 {chain_name}')
+        return summary
+    finally:
+        summary.elapsed_seconds = time.time() - start_time
+
+
+def _get_chain_eta_text(runtime_groups: list[RuntimeGroup], max_parallel: int) -> str:
+    """按运行历史中各脚本耗时的中位数预估脚本链耗时。
+
+    按顺序运行时为各运行组耗时之和；并行运行时取总耗时均摊到并行数与最长运行组中的较大值。
+
+    Returns:
+        预估耗时的描述，没有任何脚本有运行历史时返回空字符串。
     """
+    if _run_history is None:
+        return ''
+    group_seconds: list[float] = []
+    unknown_count = 0
+    for group in runtime_groups:
+        seconds = 0.0
+        for script_config in group.scripts:
+            stats = _run_history.get_duration_stats(script_config.run_key)
+            if stats is None:
+                unknown_count += 1
+            else:
+                seconds += stats.p50
+        group_seconds.append(seconds)
+
+    total_seconds = sum(group_seconds)
+    if total_seconds <= 0:
+        return ''
+    if max_parallel > 1 and len(group_seconds) > 1:
+        total_seconds = max(total_seconds / max_parallel, max(group_seconds))
+
+    finish_time = datetime.datetime.now() + datetime.timedelta(seconds=total_seconds)
+    unknown = f' ({unknown_count} 个脚本无运行历史)' if unknown_count > 0 else ''
+    return f'预计耗时 {math.ceil(total_seconds / 60)} 分钟 约 {finish_time:%H:%M} 完成{unknown}'
+
+
+def _skip_completed_groups(
+    journal: RunJournal,
+    chain_name: str,
+    runtime_groups: list[RuntimeGroup],
+) -> tuple[str | None, list[RuntimeGroup]]:
+    """过滤掉脚本链上次被中断的运行中已成功完成的运行组。
+
+    Returns:
+        被恢复的运行标识（没有被中断的运行时为 None）和剩余的运行组。
+    """
+    try:
+        run_id = journal.find_interrupted_run(chain_name)
+        completed = journal.get_completed_group_keys(chain_name, run_id) if run_id is not None else set()
+    except OSError:
+        log.error('读取运行日志失败 不跳过任何运行组', exc_info=True)
+        return None, runtime_groups
+
+    if run_id is None:
+        print_message(f'脚本链 {chain_name} 没有被中断的运行 从头开始运行')
+        return None, runtime_groups
+
+    remaining: list[RuntimeGroup] = []
+    for group in runtime_groups:
+        if group.key in completed:
+            print_message(f'上次运行已成功完成 跳过 {group.host.script_display_name}')
+        else:
+            remaining.append(group)
+    return run_id, remaining
+
+
+def setup_runner() -> ScriptChainerContext | None:
+    """初始化 runner 进程: 日志、信号处理、控制台颜色，并创建上下文。
+
+    Returns:
+        上下文实例，初始化失败时返回 None。
+    """
+    global _run_journal, _run_history, _telemetry_dir, _output_archive_dir, _bytecode_cache_dir
     _exit_controller.reset()
     configure_runner_runtime_logging()
 
+    try:
+        _run_journal = RunJournal(get_runner_data_dir('journal'))
+    except OSError:
+        log.error('创建运行日志失败 本次运行不记录进度', exc_info=True)
+        _run_journal = None
+
+    try:
+        if _run_history is None:
+            _run_history = RunHistory(os.path.join(get_runner_data_dir('history'), 'run_history.db'))
+    except (OSError, sqlite3.Error):
+        log.error('打开运行历史失败 本次运行不记录运行耗时', exc_info=True)
+        _run_history = None
+
+    try:
+        _telemetry_dir = get_runner_data_dir('telemetry')
+        clear_outdated_files(_telemetry_dir)
+    except OSError:
+        log.error('创建资源采样目录失败 本次运行不保存采样文件', exc_info=True)
+        _telemetry_dir = None
+
+    try:
+        _output_archive_dir = get_runner_data_dir('output')
+        clear_outdated_archives(_output_archive_dir)
+    except OSError:
+        log.error('创建脚本输出归档目录失败 本次运行脚本输出写入 runner 日志', exc_info=True)
+        _output_archive_dir = None
+
+    try:
+        _bytecode_cache_dir = get_runner_data_dir('bytecode')
+        clear_outdated_bytecode(_bytecode_cache_dir)
+    except OSError:
+        log.error('创建 Python 脚本字节码缓存目录失败 本次运行不使用缓存', exc_info=True)
+        _bytecode_cache_dir = None
+
     # 注册普通信号处理，控制台关闭强退仅在 Python exec 窗口内临时启用
     _exit_controller.install_handlers(_cleanup_active_pm)
     atexit.register(_cleanup_active_pm)
 
     init(autoreset=True)
-    chain_config: ScriptChainConfig = ScriptChainConfig(chain_name)
 
     # 创建上下文实例
-    ctx = None
     try:
         ctx = ScriptChainerContext()
-        ctx.init()
+        ctx.init(load_all_push_channels=False)
+        return ctx
     except Exception as e:
         log.error(f'初始化上下文实例失败: {e}')
+        return None
 
-    try:
-        if not chain_config.is_file_exists():
-            print_message(f'脚本链配置不存在 {chain_name}', "ERROR")
-        else:
-            attach_targets = chain_config.compute_attach_targets()
-            try:
-                selection = build_runtime_selection(
-                    chain_config.script_list,
-                    attach_targets,
-                    debug_index=debug_index,
-                )
-            except ValueError as e:
-                print_message(str(e), 'ERROR')
-                return
-
-            if selection.debug_target is not None:
-                print_message(f'调试运行脚本链 {chain_name}: {selection.debug_target.script_display_name}')
-
-            runtime_groups, skipped_messages = resolve_runtime_groups(selection)
-
-            for message in skipped_messages:
-                print_message(message)
-
-            for group_idx, group in enumerate(runtime_groups):
-                log_notifier: LogNotifier | None = None
-                if ctx is not None and group.host.notify_log_interval > 0:
-                    log_notifier = LogNotifier(
-                        ctx=ctx,
-                        title=f'{ctx.notify_config.title} - {group.host.script_display_name} 日志',
-                        interval=group.host.notify_log_interval,
-                    )
-                    log_notifier.start()
-
-                try:
-                    if group.host.notify_start:
-                        _push_chain_notification(
-                            ctx,
-                            chain_name,
-                            '调试开始' if debug_index is not None else '开始运行',
-                            group.host,
-                        )
-
-                    for script_config in group.scripts:
-                        _run_script_in_group(script_config, log_notifier, ctx, chain_name)
-
-                    if group.host.notify_done:
-                        _push_chain_notification(
-                            ctx,
-                            chain_name,
-                            '调试结束' if debug_index is not None else '运行结束',
-                            group.host,
-                        )
-                finally:
-                    if log_notifier is not None:
-                        log_notifier.stop()
-
-                if group_idx < len(runtime_groups) - 1:
-                    print_message('10秒后开始下一个脚本')
-                    if _exit_controller.wait(10):
-                        break
-
-            print_message('已完成调试脚本' if debug_index is not None else '已完成全部脚本')
 
+def finish_runner(ctx: ScriptChainerContext | None, shutdown_delay: int = 0) -> None:
+    """运行结束后的收尾: 按需关机、等待关闭窗口、释放上下文资源。"""
+    try:
         if shutdown_delay > 0:
             cmd_utils.shutdown_sys(shutdown_delay)
             print_message('准备关机')
@@ -728,18 +1951,131 @@ def run_chain(chain_name: str = '01', shutdown_delay: int = 0, debug_index: int
                 ctx.after_app_shutdown()
             except Exception as e:
                 log.error(f'清理资源失败: {e}')
+        _console.flush()
+
+
+def run_chain(
+    chain_name: str = '01',
+    shutdown_delay: int = 0,
+    debug_index: int | None = None,
+    resume: bool = False,
+) -> None:
+    """运行指定的脚本链。
+
+    Args:
+        chain_name: 脚本链名称。
+        shutdown_delay: 运行后关机延迟秒数，0 表示不关机。
+        debug_index: 调试脚本下标，None 表示运行整个脚本链，非负整数表示仅调试该下标脚本，
+            并按编排/挂靠关系一并纳入与其关联的脚本。
+        resume: 是否跳过上次被中断的运行中已成功完成的运行组，用于中断后继续运行。
+    """
+    ctx = setup_runner()
+    try:
+        execute_chain(ctx, chain_name, debug_index=debug_index, resume=resume)
+    finally:
+        finish_runner(ctx, shutdown_delay)
+
+
+def run_chains(
+    chain_names: list[str],
+    shutdown_delay: int = 0,
+    max_concurrent_chains: int = 1,
+    resume: bool = False,
+) -> list[ChainRunSummary]:
+    """在同一个 runner 进程内运行多个脚本链。
+
+    上下文和推送渠道只初始化一次。脚本链之间共享资源锁，
+    同一游戏/脚本进程不会被两个脚本链同时运行。全部结束后推送一条合并的汇总通知。
+
+    Args:
+        chain_names: 脚本链名称列表，按顺序提交运行，重复的名称只运行一次。
+        shutdown_delay: 运行后关机延迟秒数，0 表示不关机。
+        max_concurrent_chains: 最多同时运行的脚本链数量。
+        resume: 是否跳过上次被中断的运行中已成功完成的运行组，用于中断后继续运行。
+
+    Returns:
+        各脚本链的运行汇总，顺序与去重后的 chain_names 一致。
+    """
+    chain_names = _dedupe_chain_names(chain_names)
+    ctx = setup_runner()
+    summaries: list[ChainRunSummary] = []
+    try:
+        lock_registry = ResourceLockRegistry()
+        max_workers = max(1, max_concurrent_chains)
+        print_message(f'运行脚本链 {", ".join(chain_names)} 最大同时运行数 {max_workers}')
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='script_chain') as executor:
+            futures = [
+                executor.submit(execute_chain, ctx, chain_name, None, lock_registry, resume)
+                for chain_name in chain_names
+            ]
+            # 带超时地等待，保证主线程能及时处理退出信号
+            while not all(f.done() for f in futures):
+                wait(futures, timeout=0.5)
+
+        for chain_name, future in zip(chain_names, futures, strict=True):
+            try:
+                summaries.append(future.result())
+            except Exception as e:
+                log.error('脚本链执行异常 %s', chain_name, exc_info=True)
+                summaries.append(ChainRunSummary(chain_name=chain_name, error=str(e)))
+
+        for summary in summaries:
+            print_message(summary.summary_text, level='ERROR' if summary.error else 'PASS')
+        _push_summary_notification(ctx, summaries)
+    finally:
+        finish_runner(ctx, shutdown_delay)
+    return summaries
+
+
+def _push_summary_notification(
+    ctx: ScriptChainerContext | None,
+    summaries: list[ChainRunSummary],
+) -> None:
+    """将多个脚本链的运行汇总合并为一条通知推送。"""
+    if ctx is None or len(summaries) == 0:
+        return
+    ctx.push_service.push_merged_async(
+        title=ctx.notify_config.title,
+        items=[NotifyPoolItem(content=summary.summary_text) for summary in summaries],
+    )
+
+
+def parse_chain_names(chains: str) -> list[str]:
+    """解析逗号分隔的脚本链名称列表，重复的名称只保留第一次出现的位置。"""
+    return _dedupe_chain_names(i.strip() for i in chains.split(','))
+
+
+def _dedupe_chain_names(chain_names: Iterable[str]) -> list[str]:
+    """去掉空名称和重复名称并保持顺序。
+
+    运行状态（Python 工作进程池、预启动进程、运行日志）按脚本链名称区分，同一脚本链不能同时运行两次。
+    """
+    return list(dict.fromkeys(i for i in chain_names if i))
 
 
 def run():
     """独立运行入口"""
     args = parse_args()
-    run_chain(
-        chain_name=args.chain,
-        shutdown_delay=args.shutdown if args.shutdown else 0,
-        debug_index=args.debug_index,
-    )
+    if args.daemon:
+        from script_chainer.win_exe.runner_daemon import run_daemon
+        run_daemon(port=args.daemon_port)
+    elif args.chains:
+        run_chains(
+            chain_names=parse_chain_names(args.chains),
+            shutdown_delay=args.shutdown if args.shutdown else 0,
+            max_concurrent_chains=args.max_concurrent_chains,
+            resume=args.resume,
+        )
+    else:
+        run_chain(
+            chain_name=args.chain,
+            shutdown_delay=args.shutdown if args.shutdown else 0,
+            debug_index=args.debug_index,
+            resume=args.resume,
+        )
     sys.exit(0)
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     run()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import threading
+
+import pytest
+
+from script_chainer.utils import bytecode_cache
+from script_chainer.utils.bytecode_cache import get_cache_file, load_script_code
+
+
+def _run(code) -> dict:
+    namespace: dict = {}
+    exec(code, namespace)
+    return namespace
+
+
+@pytest.fixture
+def script(tmp_path):
+    script_path = tmp_path / 'script.py'
+    script_path.write_text('value = 1\n', encoding='utf-8')
+    return script_path
+
+
+def test_header_round_trip(tmp_path, script):
+    cache_dir = str(tmp_path / 'cache')
+    first = load_script_code(str(script), cache_dir)
+    assert not first.from_cache
+
+    cache_file = get_cache_file(cache_dir, str(script.resolve()))
+    header = bytecode_cache._read_header(cache_file.read_bytes())
+    stat = os.stat(script)
+    assert header[0] == importlib.util.MAGIC_NUMBER
+    assert header[2] == stat.st_mtime_ns
+    assert header[3] == stat.st_size
+
+    second = load_script_code(str(script), cache_dir)
+    assert second.from_cache
+    assert second.code.co_filename == str(script.resolve())
+    assert _run(second.code)['value'] == 1
+
+
+def test_touched_file_with_same_content_reuses_cache(tmp_path, script):
+    cache_dir = str(tmp_path / 'cache')
+    load_script_code(str(script), cache_dir)
+    stat = os.stat(script)
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    loaded = load_script_code(str(script), cache_dir)
+    assert loaded.from_cache
+    # 文件头已更新为新的修改时间
+    header = bytecode_cache._read_header(get_cache_file(cache_dir, str(script.resolve())).read_bytes())
+    assert header[2] == stat.st_mtime_ns + 10**9
+
+
+def test_changed_source_is_recompiled(tmp_path, script):
+    cache_dir = str(tmp_path / 'cache')
+    load_script_code(str(script), cache_dir)
+    script.write_text('value = 22\n', encoding='utf-8')
+
+    loaded = load_script_code(str(script), cache_dir)
+    assert not loaded.from_cache
+    assert _run(loaded.code)['value'] == 22
+    assert load_script_code(str(script), cache_dir).from_cache
+
+
+def test_invalid_cache_is_ignored(tmp_path, script):
+    cache_dir = str(tmp_path / 'cache')
+    load_script_code(str(script), cache_dir)
+    cache_file = get_cache_file(cache_dir, str(script.resolve()))
+
+    # 其它 Python 版本生成的缓存
+    data = cache_file.read_bytes()
+    cache_file.write_bytes(b'\0\0\0\0' + data[4:])
+    assert not load_script_code(str(script), cache_dir).from_cache
+
+    # 写了一半的文件
+    cache_file.write_bytes(cache_file.read_bytes()[:10])
+    assert not load_script_code(str(script), cache_dir).from_cache
+    assert load_script_code(str(script), cache_dir).from_cache
+
+
+def test_empty_script_flag(tmp_path):
+    script_path = tmp_path / 'empty.py'
+    script_path.write_text('\n  \n', encoding='utf-8')
+    cache_dir = str(tmp_path / 'cache')
+    assert load_script_code(str(script_path), cache_dir).is_empty
+    loaded = load_script_code(str(script_path), cache_dir)
+    assert loaded.from_cache and loaded.is_empty
+
+
+def test_without_cache_dir(tmp_path, script):
+    loaded = load_script_code(str(script))
+    assert not loaded.from_cache
+    assert not loaded.is_empty
+    assert not list(tmp_path.glob('**/*.pyc'))
+
+
+def test_syntax_error_is_raised(tmp_path):
+    script_path = tmp_path / 'bad.py'
+    script_path.write_text('def broken(:\n', encoding='utf-8')
+    with pytest.raises(SyntaxError):
+        load_script_code(str(script_path), str(tmp_path / 'cache'))
+
+
+def test_concurrent_writes_do_not_collide(tmp_path, script, monkeypatch):
+    errors: list[str] = []
+    monkeypatch.setattr(bytecode_cache.log, 'error', lambda msg, *args, **kwargs: errors.append(msg % args))
+    cache_dir = str(tmp_path / 'cache')
+    script_code = load_script_code(str(script))
+    cache_file = get_cache_file(cache_dir, str(script.resolve()))
+    stat = os.stat(script)
+
+    def _write() -> None:
+        for _ in range(50):
+            bytecode_cache._write_cache(cache_file, script_code, stat.st_mtime_ns, stat.st_size, b'\0' * 32)
+
+    threads = [threading.Thread(target=_write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [i.name for i in cache_file.parent.iterdir()] == [cache_file.name]
+    assert load_script_code(str(script), cache_dir).from_cache
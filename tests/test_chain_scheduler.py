@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from script_chainer.config.script_config import ScriptConfig
+from script_chainer.utils.chain_scheduler import (
+    ChainScheduler,
+    ResourceLockRegistry,
+    build_group_dependencies,
+    get_group_locks,
+)
+from script_chainer.utils.runtime_group_utils import RuntimeGroup
+
+
+def _group(name: str, after: list[str] | None = None, **kwargs) -> RuntimeGroup:
+    script = ScriptConfig(display_name=name, after=after or [], **kwargs)
+    return RuntimeGroup(host=script, scripts=[script], key=name)
+
+
+def _names(groups: list[RuntimeGroup]) -> list[str]:
+    return [i.host.script_display_name for i in groups]
+
+
+def test_build_group_dependencies():
+    groups = [_group('a'), _group('b', ['a']), _group('c', ['a', 'b', 'missing'])]
+    deps, messages = build_group_dependencies(groups)
+    assert deps == [set(), {0}, {0, 1}]
+    assert len(messages) == 1
+    assert 'missing' in messages[0]
+
+
+def test_build_group_dependencies_rejects_cycle():
+    groups = [_group('a', ['c']), _group('b', ['a']), _group('c', ['b']), _group('d')]
+    with pytest.raises(ValueError) as e:
+        build_group_dependencies(groups)
+    message = str(e.value)
+    assert 'a' in message and 'b' in message and 'c' in message
+    assert 'd' not in message
+
+
+def test_self_dependency_is_ignored():
+    deps, _ = build_group_dependencies([_group('a', ['a'])])
+    assert deps == [set()]
+
+
+def test_get_group_locks():
+    group = _group('a', resource_locks=['gpu', ''], game_process_name='game.exe', script_process_name='py.exe')
+    assert get_group_locks(group) == {'gpu', 'game:game.exe', 'script:py.exe'}
+
+
+def test_resource_lock_registry_all_or_nothing():
+    registry = ResourceLockRegistry()
+    with registry.condition:
+        assert registry.try_acquire({'a', 'b'})
+        assert not registry.try_acquire({'b', 'c'})
+        # 获取失败时不会占用其中空闲的锁
+        assert registry.try_acquire({'c'})
+    registry.release({'a', 'b'})
+    with registry.condition:
+        assert registry.try_acquire({'a', 'b'})
+
+
+def test_resource_lock_registry_acquire_cancelled():
+    registry = ResourceLockRegistry()
+    assert registry.acquire({'a'})
+    cancel_event = threading.Event()
+    cancel_event.set()
+    assert not registry.acquire({'a'}, cancel_event)
+
+
+def test_resource_lock_registry_acquire_waits_for_release():
+    registry = ResourceLockRegistry()
+    assert registry.acquire({'a'})
+    timer = threading.Timer(0.05, registry.release, args=({'a'},))
+    timer.start()
+    assert registry.acquire({'a'})
+    timer.join()
+
+
+def test_scheduler_respects_dependencies():
+    groups = [_group('a'), _group('b', ['a']), _group('c', ['b']), _group('d')]
+    finished: list[str] = []
+    lock = threading.Lock()
+
+    def _run(group: RuntimeGroup) -> bool:
+        with lock:
+            finished.append(group.host.script_display_name)
+        return True
+
+    scheduler = ChainScheduler(groups, _run, max_parallel=2)
+    scheduler.run()
+    assert sorted(finished) == ['a', 'b', 'c', 'd']
+    assert finished.index('a') < finished.index('b') < finished.index('c')
+    assert scheduler.failed == set()
+
+
+def test_scheduler_skips_dependents_of_failed_group():
+    groups = [_group('a'), _group('b', ['a']), _group('c', ['b']), _group('d'), _group('e', ['d'])]
+    ran: list[str] = []
+    skipped: list[tuple[str, str]] = []
+
+    def _run(group: RuntimeGroup) -> bool:
+        name = group.host.script_display_name
+        ran.append(name)
+        if name == 'd':
+            raise RuntimeError('boom')
+        return name != 'a'
+
+    def _on_skip(group: RuntimeGroup, failed_dep: RuntimeGroup) -> None:
+        skipped.append((group.host.script_display_name, failed_dep.host.script_display_name))
+
+    scheduler = ChainScheduler(groups, _run, max_parallel=1, on_skip=_on_skip)
+    scheduler.run()
+    assert sorted(ran) == ['a', 'd']
+    assert sorted(skipped) == [('b', 'a'), ('c', 'b'), ('e', 'd')]
+    assert _names([groups[i] for i in sorted(scheduler.failed)]) == ['a', 'b', 'c', 'd', 'e']
+
+
+def test_scheduler_serializes_groups_sharing_a_lock():
+    groups = [_group(name, resource_locks=['gpu']) for name in 'abc']
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+    barrier = threading.Event()
+
+    def _run(group: RuntimeGroup) -> bool:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        barrier.wait(0.02)
+        with lock:
+            running -= 1
+        return True
+
+    ChainScheduler(groups, _run, max_parallel=3).run()
+    assert max_running == 1
+
+
+def test_scheduler_cancel_stops_starting_groups():
+    cancel_event = threading.Event()
+    ran: list[str] = []
+
+    def _run(group: RuntimeGroup) -> bool:
+        ran.append(group.host.script_display_name)
+        cancel_event.set()
+        return True
+
+    groups = [_group('a'), _group('b', ['a']), _group('c', ['b'])]
+    ChainScheduler(groups, _run, max_parallel=1, cancel_event=cancel_event).run()
+    assert ran == ['a']
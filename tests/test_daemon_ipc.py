@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import stat
+import time
+
+import pytest
+
+from script_chainer.services.daemon_ipc import DaemonClient, DaemonServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    def _handler(request: dict) -> dict:
+        if request.get('cmd') == 'echo':
+            return {'value': request.get('value')}
+        raise ValueError('unknown')
+
+    server = DaemonServer(_handler, str(tmp_path / 'daemon.json'), subscriber_max_pending=100)
+    server.start()
+    yield server
+    server.close()
+
+
+def _wait_subscribers(server: DaemonServer, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while len(server._subscribers) != count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(server._subscribers) == count
+
+
+def test_request(server, tmp_path):
+    client = DaemonClient(str(tmp_path / 'daemon.json'))
+    assert client.request('echo', value=1) == {'ok': True, 'value': 1}
+    assert client.request('other') == {'ok': False, 'error': 'unknown'}
+
+
+def test_events_are_delivered_in_order(server, tmp_path):
+    events = DaemonClient(str(tmp_path / 'daemon.json')).subscribe()
+    _wait_subscribers(server, 1)
+    for i in range(50):
+        server.broadcast({'event': 'message', 'i': i})
+    assert [next(events)['i'] for _ in range(50)] == list(range(50))
+    events.close()
+    _wait_subscribers(server, 0)
+
+
+def test_stalled_subscriber_does_not_block_broadcast(server, tmp_path):
+    client = DaemonClient(str(tmp_path / 'daemon.json'))
+    stalled = client.subscribe()
+    _wait_subscribers(server, 1)
+
+    start = time.monotonic()
+    for i in range(200000):
+        server.broadcast({'event': 'message', 'message': 'x' * 100, 'i': i})
+    assert time.monotonic() - start < 5
+    # 积压过多的订阅方被断开，新的订阅方不受影响
+    _wait_subscribers(server, 0)
+
+    events = client.subscribe()
+    _wait_subscribers(server, 1)
+    server.broadcast({'event': 'message', 'i': -1})
+    assert next(events)['i'] == -1
+    events.close()
+    stalled.close()
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='Windows 不使用 POSIX 权限位')
+def test_info_file_is_private(tmp_path):
+    info_file = tmp_path / 'daemon.json'
+    info_file.write_text('stale', encoding='utf-8')
+    info_file.chmod(0o644)
+    server = DaemonServer(lambda request: {}, str(info_file))
+    server.start()
+    try:
+        assert stat.S_IMODE(info_file.stat().st_mode) == 0o600
+        assert DaemonClient(str(info_file)).request('status') == {'ok': True}
+    finally:
+        server.close()
+    assert not info_file.exists()
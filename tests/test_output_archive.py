@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import gzip
+import threading
+import time
+
+from script_chainer.services.output_archive import (
+    OutputArchiveWriter,
+    iter_lines,
+    read_index,
+    tail_lines,
+)
+
+
+def _write(file_path: str, count: int, block_lines: int = 10) -> None:
+    writer = OutputArchiveWriter(file_path, block_lines=block_lines, block_seconds=3600)
+    for i in range(count):
+        writer.write_lines([f'line {i}'], timestamp=1000.0 + i)
+    writer.close()
+
+
+def test_index_and_plain_gzip(tmp_path):
+    file_path = str(tmp_path / 'run.log.gz')
+    _write(file_path, 25)
+
+    blocks = read_index(file_path)
+    assert [(i.first_time, i.first_line, i.line_count) for i in blocks] == [
+        (1000.0, 0, 10), (1010.0, 10, 10), (1020.0, 20, 5),
+    ]
+    assert blocks[0].offset == 0
+    assert blocks[0].offset < blocks[1].offset < blocks[2].offset
+
+    # 拼接的 gzip 成员仍可以整体解压
+    with gzip.open(file_path, 'rt', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert lines[0] == '1000.000\tline 0'
+    assert len(lines) == 25
+
+
+def test_tail_lines(tmp_path):
+    file_path = str(tmp_path / 'run.log.gz')
+    _write(file_path, 25)
+    assert [i.text for i in tail_lines(file_path, 3)] == ['line 22', 'line 23', 'line 24']
+    assert [i.text for i in tail_lines(file_path, 12)] == [f'line {i}' for i in range(13, 25)]
+    assert len(tail_lines(file_path, 100)) == 25
+    assert tail_lines(file_path, 0) == []
+
+
+def test_iter_lines_by_time(tmp_path):
+    file_path = str(tmp_path / 'run.log.gz')
+    _write(file_path, 25)
+    lines = list(iter_lines(file_path, start_time=1012, end_time=1014.5))
+    assert [(i.timestamp, i.text) for i in lines] == [
+        (1012.0, 'line 12'), (1013.0, 'line 13'), (1014.0, 'line 14'),
+    ]
+    assert len(list(iter_lines(file_path))) == 25
+
+
+def test_batch_split_across_blocks(tmp_path):
+    file_path = str(tmp_path / 'run.log.gz')
+    writer = OutputArchiveWriter(file_path, block_lines=4, block_seconds=3600)
+    writer.write_lines([f'line {i}' for i in range(10)], timestamp=1000.0)
+    writer.close()
+    assert [i.line_count for i in read_index(file_path)] == [4, 4, 2]
+    assert [i.text for i in tail_lines(file_path, 5)] == [f'line {i}' for i in range(5, 10)]
+
+
+def test_unindexed_last_block_is_readable(tmp_path):
+    # 进程被强制结束时最后一个块没有写入索引，但已压缩的内容可读
+    file_path = str(tmp_path / 'run.log.gz')
+    writer = OutputArchiveWriter(file_path, block_lines=10, block_seconds=3600)
+    writer.write_lines([f'line {i}' for i in range(15)], timestamp=1000.0)
+    writer.close()
+    # 只保留第一个块的索引和一行写了一半的索引
+    index_path = tmp_path / 'run.log.gz.idx'
+    index_path.write_text(index_path.read_text(encoding='utf-8').splitlines()[0] + '\n10', encoding='utf-8')
+
+    assert len(read_index(file_path)) == 1
+    assert [i.text for i in tail_lines(file_path, 6)] == [f'line {i}' for i in range(9, 15)]
+
+
+def test_idle_block_flushed_by_timer(tmp_path):
+    file_path = str(tmp_path / 'run.log.gz')
+    writer = OutputArchiveWriter(file_path, block_lines=1000, block_seconds=0.05)
+    try:
+        writer.write_lines(['only line'])
+        deadline = time.monotonic() + 5
+        while not read_index(file_path) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert [i.line_count for i in read_index(file_path)] == [1]
+        assert [i.text for i in tail_lines(file_path, 1)] == ['only line']
+    finally:
+        writer.close()
+
+
+def test_writes_after_close_are_ignored(tmp_path):
+    file_path = str(tmp_path / 'run.log.gz')
+    writer = OutputArchiveWriter(file_path, block_lines=10, block_seconds=3600)
+    writer.write_lines(['a'], timestamp=1000.0)
+    writer.close()
+    writer.write_lines(['b'], timestamp=1001.0)
+    writer.close()
+    assert [i.text for i in tail_lines(file_path, 10)] == ['a']
+
+
+def test_single_flush_thread_per_writer(tmp_path):
+    def _flush_threads() -> int:
+        return sum(1 for i in threading.enumerate() if i.name == 'output_archive_flush')
+
+    before = _flush_threads()
+    writer = OutputArchiveWriter(str(tmp_path / 'run.log.gz'), block_lines=10, block_seconds=3600)
+    for i in range(100):
+        writer.write_lines([f'line {j}' for j in range(10)], timestamp=1000.0 + i)
+    assert _flush_threads() == before + 1
+    writer.close()
+    deadline = time.monotonic() + 5
+    while _flush_threads() > before and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _flush_threads() == before
+    assert len(read_index(str(tmp_path / 'run.log.gz'))) == 100
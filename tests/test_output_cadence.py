@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+from script_chainer.services.output_cadence import (
+    ADAPTIVE_MIN_SAMPLES,
+    ADAPTIVE_MIN_TIMEOUT_SECONDS,
+    GapHistogram,
+    get_stall_timeout,
+)
+
+
+def test_bucket_boundaries():
+    assert GapHistogram.get_bucket(0) == 0
+    assert GapHistogram.get_bucket(GapHistogram.MIN_GAP * 0.99) == 0
+    assert GapHistogram.get_bucket(GapHistogram.MIN_GAP) == 1
+    assert GapHistogram.get_bucket(1e12) == GapHistogram.BUCKET_COUNT - 1
+    for gap in (0.15, 1, 7.5, 60, 600):
+        bucket = GapHistogram.get_bucket(gap)
+        assert GapHistogram.get_upper_bound(bucket - 1) <= gap < GapHistogram.get_upper_bound(bucket)
+
+
+def test_percentile():
+    histogram = GapHistogram()
+    assert histogram.percentile(50) is None
+    for _ in range(99):
+        histogram.add(0.05)
+    histogram.add(10)
+    assert histogram.total == 100
+    assert histogram.percentile(50) == pytest.approx(GapHistogram.MIN_GAP)
+    assert histogram.percentile(100) == GapHistogram.get_upper_bound(GapHistogram.get_bucket(10))
+    assert histogram.percentile(100) >= 10
+
+
+def test_merge_halves_when_too_large():
+    histogram = GapHistogram()
+    other = GapHistogram()
+    for _ in range(30):
+        other.add(1)
+    histogram.merge(other)
+    assert histogram.total == 30
+    histogram.merge(other, max_total=50)
+    assert histogram.total == 30
+    assert other.total == 30
+
+
+def test_json_round_trip():
+    histogram = GapHistogram()
+    histogram.add(0.5)
+    histogram.add(3)
+    restored = GapHistogram.from_json(histogram.to_json())
+    assert restored.counts == histogram.counts
+    assert GapHistogram.from_json('not json').total == 0
+    assert GapHistogram.from_json('{"a": 1}').total == 0
+    # 桶数量变化或计数不合法时仍得到固定长度的直方图
+    assert len(GapHistogram.from_json('[1, -2, 3]').counts) == GapHistogram.BUCKET_COUNT
+    assert GapHistogram.from_json('[1, -2, 3]').total == 4
+
+
+def _histogram(gap: float, count: int) -> GapHistogram:
+    histogram = GapHistogram()
+    for _ in range(count):
+        histogram.add(gap)
+    return histogram
+
+
+def test_stall_timeout_needs_enough_samples():
+    assert get_stall_timeout(_histogram(1, ADAPTIVE_MIN_SAMPLES - 1), 3, 600) is None
+    assert get_stall_timeout(_histogram(1, ADAPTIVE_MIN_SAMPLES), 3, 600) is not None
+
+
+def test_stall_timeout_bounds():
+    # 输出频繁时不低于下限
+    assert get_stall_timeout(_histogram(0.5, 200), 3, 600) == ADAPTIVE_MIN_TIMEOUT_SECONDS
+    # 不超过配置的超时时间
+    assert get_stall_timeout(_histogram(500, 200), 3, 600) == 600
+
+    histogram = _histogram(20, 200)
+    gap = histogram.percentile(99.5)
+    assert get_stall_timeout(histogram, 3, 3600) == pytest.approx(gap * 3, abs=1)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import io
+
+from script_chainer.services.output_pipeline import (
+    MAX_LINE_BYTES,
+    LineSplitter,
+    OutputPipeline,
+)
+
+
+def test_splits_lines_across_chunks():
+    splitter = LineSplitter('gbk')
+    assert splitter.feed(b'first') == []
+    assert splitter.feed(b' line\r\nsecond\nthi') == ['first line', 'second']
+    assert splitter.feed(b'rd\n\n') == ['third', '']
+    assert splitter.close() == []
+
+
+def test_close_returns_incomplete_line():
+    splitter = LineSplitter('gbk')
+    assert splitter.feed(b'a\nno newline') == ['a']
+    assert splitter.close() == ['no newline']
+    assert splitter.close() == []
+
+
+def test_utf8_character_split_between_chunks():
+    data = '中文输出\n'.encode()
+    splitter = LineSplitter('gbk')
+    assert splitter.feed(data[:4]) == []
+    assert splitter.feed(data[4:]) == ['中文输出']
+
+
+def test_falls_back_to_console_encoding_per_line():
+    # 同一批中 UTF-8 和 GBK 混合时逐行检测
+    data = '中文\n'.encode() + '中文\n'.encode('gbk')
+    assert LineSplitter('gbk').feed(data) == ['中文', '中文']
+
+
+def test_long_line_without_newline_is_forced_out():
+    splitter = LineSplitter('gbk')
+    assert splitter.feed(b'x' * (MAX_LINE_BYTES - 1)) == []
+    lines = splitter.feed(b'xx')
+    assert lines == ['x' * (MAX_LINE_BYTES + 1)]
+    assert splitter.close() == []
+
+
+def test_pipeline_delivers_all_lines_in_order():
+    count = 20000
+    data = ''.join(f'line {i}\n' for i in range(count)).encode() + b'tail'
+    received: list[str] = []
+    batches = 0
+
+    def _on_lines(lines: list[str]) -> None:
+        nonlocal batches
+        batches += 1
+        received.extend(lines)
+        if batches == 1:
+            raise RuntimeError('callback errors only drop the batch')
+
+    pipe = io.BufferedReader(io.BytesIO(data), buffer_size=4096)
+    pipeline = OutputPipeline(pipe, _on_lines, encoding='gbk', read_size=4096, max_pending_batches=2)
+    pipeline.start()
+    pipeline.join(timeout=10)
+    assert not pipeline.is_alive()
+    assert pipe.closed
+    assert received == [f'line {i}' for i in range(count)] + ['tail']
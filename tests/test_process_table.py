@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+
+from script_chainer.services.process_manager import ProcessInfo
+from script_chainer.services.process_table import ProcessEntry, ProcessTable
+
+
+def _make_table(entries: list[ProcessEntry]) -> ProcessTable:
+    """构造一个不会自动刷新的进程表，索引与 refresh 的建立方式一致。"""
+    table = ProcessTable(ttl=3600)
+    for entry in entries:
+        table._entries[entry.pid] = entry
+        if entry.name:
+            table._name_index.setdefault(entry.name, []).append(entry.pid)
+        if entry.ppid is not None and entry.ppid != entry.pid:
+            table._children_index.setdefault(entry.ppid, []).append(entry.pid)
+    table._refresh_time = time.monotonic()
+    return table
+
+
+def _sample_table() -> ProcessTable:
+    # 1 ─┬─ 10 launcher ─┬─ 100 game
+    #    │               └─ 101 helper ── 1000 game
+    #    └─ 20 game
+    return _make_table([
+        ProcessEntry(pid=1, name='init', ppid=0),
+        ProcessEntry(pid=10, name='launcher.exe', exe='/opt/launcher.exe', ppid=1),
+        ProcessEntry(pid=20, name='game.exe', ppid=1, cmdline=['game.exe', '--other']),
+        ProcessEntry(pid=100, name='game.exe', ppid=10, cmdline=['game.exe']),
+        ProcessEntry(pid=101, name='helper.exe', ppid=10),
+        ProcessEntry(pid=1000, name='game.exe', ppid=101),
+    ])
+
+
+def test_get_descendants_is_breadth_first():
+    table = _sample_table()
+    assert table.get_children(10) == [100, 101]
+    assert table.get_children(10, recursive=True) == [100, 101, 1000]
+    assert table.get_children(1, recursive=True) == [10, 20, 100, 101, 1000]
+    assert table.get_children(1000, recursive=True) == []
+
+
+def test_get_descendants_ignores_cycles():
+    # PID 复用时父子关系可能成环
+    table = _make_table([
+        ProcessEntry(pid=5, name='a', ppid=6),
+        ProcessEntry(pid=6, name='b', ppid=5),
+    ])
+    assert sorted(table.get_children(5, recursive=True)) == [5, 6]
+
+
+def test_find_by_name_and_pid():
+    table = _sample_table()
+    assert table.find(ProcessInfo(name='helper.exe')).pid == 101
+    assert table.find(ProcessInfo(pid=20)).name == 'game.exe'
+    assert table.find(ProcessInfo(pid=20, name='launcher.exe')) is None
+    assert table.find(ProcessInfo(name='missing.exe')) is None
+
+
+def test_find_matches_exe_and_cmdline():
+    table = _sample_table()
+    assert table.find(ProcessInfo(exe='/opt/launcher.exe')).pid == 10
+    assert table.find(ProcessInfo(name='game.exe', cmdline=['game.exe', '--other'])).pid == 20
+    # exe 未知的进程不匹配指定了 exe 的条件
+    assert table.find(ProcessInfo(name='game.exe', exe='/opt/game.exe')) is None
+
+
+def test_find_under_root_only_searches_descendants():
+    table = _sample_table()
+    assert table.find(ProcessInfo(name='game.exe'), root_pid=10).pid == 100
+    assert table.find(ProcessInfo(name='game.exe'), root_pid=101).pid == 1000
+    assert table.find(ProcessInfo(name='game.exe'), root_pid=1000) is None
+    assert table.find(ProcessInfo(name='launcher.exe'), root_pid=10) is None
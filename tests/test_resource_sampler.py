@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import threading
+
+from script_chainer.services.resource_sampler import ResourceSample, ResourceSampler
+
+
+def _samples(tick: int, pid_count: int) -> list[ResourceSample]:
+    return [
+        ResourceSample(
+            timestamp=float(tick), pid=tick * pid_count + i, role=2, cpu_percent=1.0,
+            rss_bytes=1024 * 1024, read_bytes=tick, write_bytes=tick, num_threads=1,
+        )
+        for i in range(pid_count)
+    ]
+
+
+def test_summary_while_accumulating():
+    # stop 等待超时后采样线程仍在累加，此时读取汇总不能因为字典变化而失败
+    sampler = ResourceSampler(pm=None, interval=1)
+    stop = threading.Event()
+
+    def accumulate() -> None:
+        tick = 0
+        while not stop.is_set():
+            # PID 循环复用，字典前几轮不断增大，之后大小保持不变
+            sampler._accumulate(_samples(tick % 100, 50))
+            tick += 1
+
+    thread = threading.Thread(target=accumulate)
+    thread.start()
+    try:
+        for _ in range(500):
+            summary = sampler.get_summary()
+            assert summary.sample_count >= 0
+    finally:
+        stop.set()
+        thread.join()
+
+    summary = sampler.get_summary()
+    assert summary.sample_count > 0
+    assert summary.avg_cpu_percent == 50
+    assert summary.peak_rss_mb == 50
+
+
+def test_summary_is_snapshot():
+    sampler = ResourceSampler(pm=None, interval=1)
+    sampler._accumulate(_samples(0, 2))
+    summary = sampler.get_summary()
+    sampler._accumulate(_samples(1, 3))
+    assert summary.sample_count == 1
+    assert summary.peak_rss_mb == 2
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from script_chainer.config.script_config import FailureClasses
+from script_chainer.services.retry_policy import RetryPolicy
+
+RUN_TIMEOUT = FailureClasses.RUN_TIMEOUT.value.value
+SCRIPT_FAILED = FailureClasses.SCRIPT_FAILED.value.value
+LAUNCH_FAILED = FailureClasses.LAUNCH_FAILED.value.value
+
+
+def test_should_retry_per_failure_class():
+    policy = RetryPolicy(max_retries={RUN_TIMEOUT: 2, SCRIPT_FAILED: 0, LAUNCH_FAILED: -1})
+    assert policy.should_retry(RUN_TIMEOUT, 0)
+    assert policy.should_retry(RUN_TIMEOUT, 1)
+    assert not policy.should_retry(RUN_TIMEOUT, 2)
+    assert not policy.should_retry(SCRIPT_FAILED, 0)
+    # 负数视为不重试，未列出的失败类型不重试
+    assert policy.get_max_retries(LAUNCH_FAILED) == 0
+    assert not policy.should_retry(LAUNCH_FAILED, 0)
+    assert not policy.should_retry('unknown', 0)
+
+
+def test_no_backoff_by_default():
+    policy = RetryPolicy()
+    assert policy.get_backoff_seconds(1) == 0
+    assert policy.get_backoff_seconds(5) == 0
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(backoff_seconds=10, backoff_max_seconds=60, jitter_ratio=0)
+    assert policy.get_backoff_seconds(0) == 0
+    assert [policy.get_backoff_seconds(i) for i in range(1, 6)] == [10, 20, 40, 60, 60]
+    # 很大的重试次数不会溢出
+    assert policy.get_backoff_seconds(10000) == 60
+
+
+def test_backoff_jitter_range():
+    policy = RetryPolicy(backoff_seconds=10, backoff_max_seconds=300, jitter_ratio=0.2)
+    rng = random.Random(0)
+    values = [policy.get_backoff_seconds(2, rng) for _ in range(1000)]
+    assert all(16 <= i <= 24 for i in values)
+    assert max(values) - min(values) > 4
+
+
+def test_backoff_jitter_is_reproducible():
+    policy = RetryPolicy(backoff_seconds=5, jitter_ratio=0.5)
+    assert policy.get_backoff_seconds(3, random.Random(42)) == pytest.approx(
+        policy.get_backoff_seconds(3, random.Random(42))
+    )
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from script_chainer.services.run_history import (
+    LEARNED_TIMEOUT_MIN_MARGIN_SECONDS,
+    DurationStats,
+    RunHistory,
+    ScriptOutcome,
+    percentile,
+)
+
+
+def test_percentile_single_value():
+    assert percentile([3.0], 0) == 3.0
+    assert percentile([3.0], 99) == 3.0
+
+
+def test_percentile_interpolates():
+    values = [10.0, 20.0, 30.0, 40.0, 50.0]
+    assert percentile(values, 0) == 10.0
+    assert percentile(values, 50) == 30.0
+    assert percentile(values, 100) == 50.0
+    assert percentile(values, 90) == pytest.approx(46.0)
+    assert percentile([0.0, 1.0], 25) == pytest.approx(0.25)
+
+
+def test_duration_stats():
+    assert DurationStats.from_durations([]) is None
+
+    stats = DurationStats.from_durations([30.0, 10.0, 20.0])
+    assert stats.count == 3
+    assert stats.mean == pytest.approx(20.0)
+    assert stats.p50 == pytest.approx(20.0)
+    assert stats.p90 == pytest.approx(28.0)
+    assert stats.p99 == pytest.approx(29.8)
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = RunHistory(str(tmp_path / 'history.db'), sample_limit=3)
+    yield history
+    history.close()
+
+
+def test_stats_use_recent_successful_runs(history):
+    now = time.time()
+    for i, duration in enumerate([100, 10, 20, 30]):
+        history.record('chain', 'key', now + i * 1000, now + i * 1000 + duration, ScriptOutcome.SUCCESS)
+    history.record('chain', 'key', now + 10, now + 1000, ScriptOutcome.FAILED)
+    history.record('chain', 'other', now, now + 5, ScriptOutcome.SUCCESS)
+
+    # 只统计最近 sample_limit 条成功记录
+    stats = history.get_duration_stats('key')
+    assert stats.count == 3
+    assert stats.p50 == pytest.approx(20)
+    assert stats.mean == pytest.approx(20)
+    assert history.get_duration_stats('missing') is None
+
+
+def test_per_attempt_stats(history):
+    now = time.time()
+    history.record('chain', 'key', now, now + 100, ScriptOutcome.SUCCESS, retries=1, attempt_start_time=now + 60)
+    assert history.get_duration_stats('key').p50 == pytest.approx(100)
+    assert history.get_duration_stats('key', per_attempt=True).p50 == pytest.approx(40)
+
+
+def test_learned_timeout(tmp_path):
+    history = RunHistory(str(tmp_path / 'history.db'))
+    try:
+        now = time.time()
+        for i in range(4):
+            history.record('chain', 'key', now + i, now + i + 60, ScriptOutcome.SUCCESS)
+        # 样本不足
+        assert history.get_learned_timeout('key', 3600) is None
+
+        history.record('chain', 'key', now + 10, now + 70, ScriptOutcome.SUCCESS)
+        assert history.get_learned_timeout('key', 3600) == 60 + LEARNED_TIMEOUT_MIN_MARGIN_SECONDS
+        # 不超过配置的超时时间
+        assert history.get_learned_timeout('key', 120) == 120
+    finally:
+        history.close()
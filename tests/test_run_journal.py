@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from script_chainer.services.run_journal import GroupOutcome, JournalEvent, RunJournal
+
+
+def _write_items(file_path: Path, items: list[dict]) -> None:
+    with open(file_path, 'a', encoding='utf-8') as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False) + '\n')
+
+
+def _run(run_id: str, chain: str, groups: dict[str, str], finish: str | None) -> list[dict]:
+    items = [{'run_id': run_id, 'chain': chain, 'event': JournalEvent.RUN_START}]
+    for group, outcome in groups.items():
+        items.append({'run_id': run_id, 'chain': chain, 'event': JournalEvent.GROUP_START, 'group': group})
+        items.append({
+            'run_id': run_id, 'chain': chain, 'event': JournalEvent.GROUP_FINISH,
+            'group': group, 'outcome': outcome,
+        })
+    if finish is not None:
+        items.append({'run_id': run_id, 'chain': chain, 'event': JournalEvent.RUN_FINISH, 'outcome': finish})
+    return items
+
+
+def test_record_and_resume(tmp_path):
+    journal = RunJournal(str(tmp_path))
+    run_id = RunJournal.new_run_id()
+    journal.record(run_id, 'chain', JournalEvent.RUN_START)
+    journal.record(run_id, 'chain', JournalEvent.GROUP_FINISH, 'a', GroupOutcome.SUCCESS)
+    journal.record(run_id, 'chain', JournalEvent.GROUP_FINISH, 'b', GroupOutcome.FAILED)
+    journal.record(run_id, 'other', JournalEvent.GROUP_FINISH, 'c', GroupOutcome.SUCCESS)
+
+    assert journal.find_interrupted_run('chain') == run_id
+    assert journal.get_completed_group_keys('chain', run_id) == {'a'}
+
+    journal.record(run_id, 'chain', JournalEvent.RUN_FINISH, outcome=GroupOutcome.SUCCESS)
+    assert journal.find_interrupted_run('chain') is None
+    assert journal.find_interrupted_run('missing') is None
+
+
+def test_cancelled_run_can_be_resumed(tmp_path):
+    journal = RunJournal(str(tmp_path))
+    _write_items(journal.get_file_path(), _run('r1', 'chain', {'a': GroupOutcome.SUCCESS}, GroupOutcome.CANCELLED))
+    assert journal.find_interrupted_run('chain') == 'r1'
+
+
+def test_resume_across_midnight(tmp_path):
+    journal = RunJournal(str(tmp_path), keep_days=100000)
+    # 前一天开始的运行在零点后被中断，记录分布在两个文件中
+    day1 = tmp_path / 'journal_20000101.jsonl'
+    day2 = tmp_path / 'journal_20000102.jsonl'
+    _write_items(day1, _run('r1', 'chain', {'a': GroupOutcome.SUCCESS}, None))
+    _write_items(day2, _run('r1', 'chain', {'b': GroupOutcome.SUCCESS}, None)[1:])
+
+    assert journal.find_interrupted_run('chain') == 'r1'
+    assert journal.get_completed_group_keys('chain', 'r1') == {'a', 'b'}
+
+
+def test_only_latest_run_is_resumed(tmp_path):
+    journal = RunJournal(str(tmp_path), keep_days=100000)
+    _write_items(tmp_path / 'journal_20000101.jsonl', _run('r1', 'chain', {'a': GroupOutcome.SUCCESS}, None))
+    _write_items(tmp_path / 'journal_20000102.jsonl', _run('r2', 'chain', {'b': GroupOutcome.SUCCESS}, None))
+    assert journal.find_interrupted_run('chain') == 'r2'
+    assert journal.get_completed_group_keys('chain', 'r2') == {'b'}
+
+    # 最近一次运行已正常结束时不恢复更早被中断的运行
+    _write_items(
+        tmp_path / 'journal_20000102.jsonl',
+        [{'run_id': 'r2', 'chain': 'chain', 'event': JournalEvent.RUN_FINISH, 'outcome': GroupOutcome.SUCCESS}],
+    )
+    assert journal.find_interrupted_run('chain') is None
+
+
+def test_resumed_run_accumulates_completed_groups(tmp_path):
+    journal = RunJournal(str(tmp_path))
+    file_path = journal.get_file_path()
+    _write_items(file_path, _run('r1', 'chain', {'a': GroupOutcome.SUCCESS}, GroupOutcome.CANCELLED))
+    # 恢复运行沿用同一个运行标识
+    _write_items(file_path, _run('r1', 'chain', {'b': GroupOutcome.SUCCESS}, None))
+    assert journal.find_interrupted_run('chain') == 'r1'
+    assert journal.get_completed_group_keys('chain', 'r1') == {'a', 'b'}
+
+
+def test_truncated_line_is_ignored(tmp_path):
+    journal = RunJournal(str(tmp_path))
+    file_path = journal.get_file_path()
+    _write_items(file_path, _run('r1', 'chain', {'a': GroupOutcome.SUCCESS}, None))
+    with open(file_path, 'a', encoding='utf-8') as f:
+        f.write('{"run_id": "r1", "chain": "chain", "event": "group_fin')
+    assert journal.get_completed_group_keys('chain', 'r1') == {'a'}
+
+
+def test_outdated_files_removed(tmp_path):
+    old_file = tmp_path / 'journal_20000101.jsonl'
+    _write_items(old_file, _run('r1', 'chain', {}, None))
+    journal = RunJournal(str(tmp_path), keep_days=7)
+    assert not old_file.exists()
+    assert journal.find_interrupted_run('chain') is None
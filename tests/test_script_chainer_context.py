@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from one_dragon.utils import os_utils
+from script_chainer.config.script_chain_record import ScriptChainRecord
+from script_chainer.config.script_config import ScriptChainConfig, ScriptConfig
+from script_chainer.context.script_chainer_context import ScriptChainerContext
+
+
+@pytest.fixture
+def ctx(tmp_path, monkeypatch) -> ScriptChainerContext:
+    # 项目配置从仓库中读取，之后的脚本链配置和完成记录写入临时目录
+    context = ScriptChainerContext()
+    monkeypatch.setattr(os_utils, 'get_work_dir', lambda: str(tmp_path))
+    return context
+
+
+def _record_done(chain_name: str) -> ScriptConfig:
+    script_config = ScriptConfig()
+    script_config.script_path = 'daily.bat'
+    ScriptChainRecord(chain_name).record_done(script_config)
+    return script_config
+
+
+def test_rename_keeps_record(ctx):
+    config = ScriptChainConfig(module_name='old')
+    config.save()
+    script_config = _record_done('old')
+
+    ctx.rename_script_chain_config(config, 'new')
+
+    assert not os.path.exists(os.path.join(ctx.script_chain_record_dir(), 'old.yml'))
+    assert ScriptChainRecord('new').is_done_today(script_config)
+
+
+def test_rename_drops_stale_record(ctx):
+    config = ScriptChainConfig(module_name='old')
+    config.save()
+    script_config = _record_done('new')
+
+    ctx.rename_script_chain_config(config, 'new')
+
+    assert not ScriptChainRecord('new').is_done_today(script_config)
+
+
+def test_remove_deletes_record(ctx):
+    config = ScriptChainConfig(module_name='old')
+    config.save()
+    script_config = _record_done('old')
+
+    ctx.remove_script_chain_config(config)
+
+    assert not os.path.exists(os.path.join(ctx.script_chain_config_dir(), 'old.yml'))
+    assert not ScriptChainRecord('old').is_done_today(script_config)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import threading
+
+from script_chainer.win_exe import script_runner
+from script_chainer.win_exe.script_runner import (
+    ChainRunSummary,
+    parse_chain_names,
+    run_chains,
+)
+
+
+def test_parse_chain_names():
+    assert parse_chain_names('01, 02,,03 ') == ['01', '02', '03']
+    assert parse_chain_names('') == []
+
+
+def test_parse_chain_names_removes_duplicates_in_order():
+    assert parse_chain_names('02,01,02, 01,03') == ['02', '01', '03']
+
+
+def test_run_chains_runs_each_chain_once(monkeypatch):
+    started: list[str] = []
+    lock = threading.Lock()
+
+    def _execute_chain(ctx, chain_name, debug_index=None, lock_registry=None, resume=False) -> ChainRunSummary:
+        with lock:
+            started.append(chain_name)
+        return ChainRunSummary(chain_name=chain_name)
+
+    monkeypatch.setattr(script_runner, 'setup_runner', lambda: None)
+    monkeypatch.setattr(script_runner, 'finish_runner', lambda ctx, shutdown_delay=0: None)
+    monkeypatch.setattr(script_runner, 'execute_chain', _execute_chain)
+
+    summaries = run_chains(['01', '01', '02', '01'], max_concurrent_chains=2)
+    assert sorted(started) == ['01', '02']
+    assert [i.chain_name for i in summaries] == ['01', '02']